@@ -0,0 +1,261 @@
+"""Micro-benchmarks for the generation and scoring hot paths
+
+    python -m benchmarks.hotpaths                       # run, compare to the baseline
+    python -m benchmarks.hotpaths --update-baseline     # run, save as the new baseline
+    python -m benchmarks.hotpaths --max-rows 10000000   # include the big history files
+    python -m benchmarks.hotpaths --max-melodies 100000 # and the biggest melody batches
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.session import EVERYTHING, run_session
+from benchmarks.startup import ROOT_DIRECTORY, compare_to_baseline
+from src.exercise import EXERCISE_CLASSES, SingTheIntervals
+from src.exercisespec import compile_definitions
+from src.guitarutilities import GuitarUtil
+from src.midiutilities import MidiUtil
+from src.pitchdetector import PitchDetector, midi_to_frequency
+from src.scoreboard import Scoreboard
+from src.scorehistory import ScoreHistory
+
+BASELINE_FILENAME = os.path.join(ROOT_DIRECTORY, 'benchmarks', 'hotpaths_baseline.json')
+DEFINITIONS_FILENAME = os.path.join(ROOT_DIRECTORY, 'data', 'exercises.json')
+
+# Every benchmark starts from the same random state.
+SEED = 1234
+
+# History sizes for the dataframe benchmarks.  Only those up to --max-rows are run.
+HISTORY_ROWS = [10**3, 10**4, 10**5, 10**6, 10**7]
+DEFAULT_MAX_ROWS = 10**5
+
+# Melodic dictation batch sizes (melodies), and melody lengths.  Only up to --max-melodies.
+MELODY_COUNTS = [10**3, 10**4, 10**5]
+MELODY_SIZES = [8, 32]
+DEFAULT_MAX_MELODIES = 10**4
+
+# Micro timings are noisy, so a regression has to be clearly slower.
+REGRESSION_TOLERANCE = 0.5
+REGRESSION_SLACK = 0.0001   # Seconds per call
+
+REPEAT = 5
+
+
+def time_call(function, number, repeat=REPEAT):
+    """Time number calls of function, repeat times.  Return the per call seconds."""
+
+    timings = []
+    for _ in range(repeat):
+        random.seed(SEED)
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {'seconds': min(timings), 'median': statistics.median(timings), 'number': number}
+
+
+def write_history(directory, rows):
+    """A ScoreHistory with rows records in its binary file"""
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    history = ScoreHistory(directory=directory)
+
+    rng = np.random.default_rng(SEED)
+    records = np.empty(rows, dtype=history.get_record_dtype())
+    keys = np.array([f"Exercise {index}:m{index % 7}".encode() for index in range(50)])
+    records['key'] = keys[rng.integers(0, len(keys), rows)]
+    records['score'] = rng.integers(1, 5, rows)
+    records['timestamp'] = 1.7e9 + np.arange(rows, dtype='<f8')
+    records.tofile(history.binary_history_filename)
+
+    return history
+
+
+def build_benchmarks(directory, max_rows=DEFAULT_MAX_ROWS, max_melodies=DEFAULT_MAX_MELODIES):
+    """The benchmarks.  Return {name: (function, calls per timing)}"""
+
+    random.seed(SEED)
+    benchmarks = {}
+
+    m_u = MidiUtil()
+    g_u = GuitarUtil()
+
+    benchmarks['MidiUtil.build_note_list'] = (
+        lambda: m_u.build_note_list(
+            40, 86, ['Ionian', 'Minor Pentatonic', 'Dominant Seventh'], 'G'), 200)
+
+    benchmarks['MidiUtil.list_of_midi_notes'] = (
+        lambda: [m_u.list_of_midi_notes(key, 30, 90) for key in m_u.note_names], 200)
+
+    benchmarks['GuitarUtil.get_fret_string_from_name'] = (
+        lambda: [g_u.get_fret_string_from_name(note_name) for note_name in m_u.note_array[40:87]],
+        200)
+
+    # Every registered exercise, building from one of its own trial set ranges
+    with open(DEFINITIONS_FILENAME, encoding='utf-8') as definitions_file:
+        specs = compile_definitions(definitions_file.read())
+
+    scoreboard = Scoreboard(directory=directory)
+    for spec in specs:
+        exercise = EXERCISE_CLASSES[spec.kind](None, scoreboard, spec)
+        exercise.adjust_interval_frequency()
+
+        key_center, intervalic_list = exercise.get_key_intervalic()
+        low_note, high_note = exercise.get_trial_set_range(key_center, intervalic_list)
+        legal_notes_lists = exercise.get_legal_notes(
+            low_note, high_note, intervalic_list, key_center)
+
+        benchmarks[f'Exercise.build_trial_set[{spec.name}]'] = (
+            lambda exercise=exercise, legal_notes_lists=legal_notes_lists:
+            exercise.build_trial_set(legal_notes_lists), 20)
+
+    # Melodic dictation in bulk.  The time per note should hold steady as they grow.
+    melodic = next(spec for spec in specs if spec.kind == 'MelodicDictation')
+    for trial_size in MELODY_SIZES:
+        for count in MELODY_COUNTS:
+            if count > max_melodies:
+                break
+            exercise = EXERCISE_CLASSES[melodic.kind](
+                None, scoreboard, melodic._replace(trials_count=count, trial_size=trial_size))
+
+            key_center, intervalic_list = exercise.get_key_intervalic()
+            low_note, high_note = exercise.get_trial_set_range(key_center, intervalic_list)
+            legal_notes_lists = exercise.get_legal_notes(
+                low_note, high_note, intervalic_list, key_center)
+
+            benchmarks[f'MelodicDictation.build_trial_set[{count} x {trial_size} notes]'] = (
+                lambda exercise=exercise, legal_notes_lists=legal_notes_lists:
+                exercise.build_trial_set(legal_notes_lists), max(1, 10**3 // count))
+
+    # Interval weights from a well used scoreboard
+    sing = next(EXERCISE_CLASSES[spec.kind](None, scoreboard, spec) for spec in specs
+                if EXERCISE_CLASSES[spec.kind] is SingTheIntervals)
+    for interval in sing.candidate_intervals:
+        for _ in range(30):
+            scoreboard.append_score(sing.name, interval, random.randint(1, 4))
+    benchmarks['SingTheIntervals.adjust_interval_frequency'] = (
+        sing.adjust_interval_frequency, 200)
+
+    # Scoring: a session's worth of scores, and the end of exercise summary
+    elements = list(m_u.intervals)
+
+    def append_scores():
+        for index in range(1000):
+            scoreboard.append_score(f"Exercise {index % 20}", elements[index % len(elements)],
+                                    index % 4 + 1)
+
+    benchmarks['Scoreboard.append_score'] = (append_scores, 5)
+
+    def output_scores():
+        with contextlib.redirect_stdout(io.StringIO()):
+            scoreboard.output_scores("Exercise 3", elements)
+
+    append_scores()
+    benchmarks['Scoreboard.output_scores'] = (output_scores, 50)
+
+    # Pitch tracking a second of singing, a block at a time (must stay well under 1s)
+    sample_rate = 44100
+    times = [index / sample_rate for index in range(sample_rate)]
+    sung = [math.sin(2 * math.pi * midi_to_frequency(60) * seconds) for seconds in times]
+
+    def detect_pitch():
+        detector = PitchDetector(sample_rate)
+        for start in range(0, sample_rate, 512):
+            detector.process_block(sung[start:start + 512])
+
+    benchmarks['PitchDetector.process_block[1s]'] = (detect_pitch, 2)
+
+    # The whole loop, menu to scoreboard, with no audio or keyboard
+    benchmarks['Application.run[every exercise, headless]'] = (
+        lambda: run_session(EVERYTHING, tempfile.mkdtemp(dir=directory)), 1)
+
+    # Reading the history back, at growing sizes
+    for rows in HISTORY_ROWS:
+        if rows > max_rows:
+            break
+        history = write_history(os.path.join(directory, str(rows)), rows)
+        benchmarks[f'ScoreHistory.get_dataframe[{rows}]'] = (
+            history.get_dataframe, max(1, 10**5 // rows))
+
+    return benchmarks
+
+
+def run_benchmarks(max_rows=DEFAULT_MAX_ROWS, name_filter='', repeat=REPEAT, scale=1.0,
+                   max_melodies=DEFAULT_MAX_MELODIES):
+    """Run the benchmarks.  Return {name: {'seconds', 'median', 'number'}}"""
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rows in HISTORY_ROWS:
+            os.makedirs(os.path.join(temp_dir, str(rows)))
+
+        for name, (function, number) in build_benchmarks(temp_dir, max_rows,
+                                                          max_melodies).items():
+            if name_filter in name:
+                results[name] = time_call(function, max(1, int(number * scale)), repeat)
+
+    return results
+
+
+def main():
+    """Run the benchmarks, non-zero exit if any regressed"""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="save these results as the new baseline")
+    parser.add_argument('--output', help="also write the results to this json file")
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help="largest score history to benchmark")
+    parser.add_argument('--max-melodies', type=int, default=DEFAULT_MAX_MELODIES,
+                        help="largest batch of melodies to benchmark")
+    parser.add_argument('--filter', default='', help="only benchmarks with this in the name")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.max_rows, args.filter, max_melodies=args.max_melodies)
+    report = {'python': platform.python_version(), 'seed': SEED, 'results': results}
+
+    for name, result in results.items():
+        print(f"{result['seconds'] * 1e3:10.4f} ms  {name}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.update_baseline:
+        with open(BASELINE_FILENAME, 'w', encoding='utf-8') as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+            baseline_file.write('\n')
+        print(f"Baseline saved to {BASELINE_FILENAME}")
+        return 0
+
+    try:
+        with open(BASELINE_FILENAME, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+    except FileNotFoundError:
+        baseline = {}
+
+    regressions = compare_to_baseline(
+        {name: result['seconds'] for name, result in results.items()},
+        {name: result['seconds'] for name, result in baseline.items()},
+        REGRESSION_TOLERANCE, REGRESSION_SLACK)
+    for name in regressions:
+        print(f"FAIL: {name} regressed: {results[name]['seconds'] * 1e3:.4f} ms "
+              f"(baseline {baseline[name]['seconds'] * 1e3:.4f} ms)")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""End-to-end session throughput -- the whole menu, exercise, player, scoreboard loop
+
+No audio and no keyboard:  notes go to a NullAudioBackend and every key press
+comes from a script, so whole sessions run at CPU speed.
+
+    python -m benchmarks.session
+"""
+
+import contextlib
+import io
+import itertools
+import random
+import sys
+import tempfile
+import time
+
+from main import build_application
+from src.audiobackend import NullAudioBackend
+from src.inputbackend import ScriptedInputBackend
+from src.keypresshelper import set_input_backend
+from src.player import Player
+from src.scorestore import ScoreStore
+
+# Start every trial set, continue past every prompt, and score everything a 3.
+ANSWER_KEYS = ["space", "3"]
+
+# Everything, in random order, then exit
+EVERYTHING = ["e", "x"]
+
+STUDENT_ID = 'headless'
+SEED = 1234
+
+
+def run_session(menu_selections, root_directory, keys=None):
+    """Run the application headless.  Return (audio backend, the student's scoreboard)"""
+
+    if keys is None:
+        keys = itertools.cycle(ANSWER_KEYS)
+
+    set_input_backend(ScriptedInputBackend(keys, menu_selections))
+    try:
+        audio = NullAudioBackend()
+        store = ScoreStore(root_directory=root_directory)
+        app = build_application(Player(audio), store, STUDENT_ID)
+
+        # Nobody's watching
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.run()
+
+        scoreboard = store.get_scoreboard(STUDENT_ID)
+        store.close()
+    finally:
+        set_input_backend(None)     # Back to the keyboard
+
+    return audio, scoreboard
+
+
+def main():
+    """Time a session of every exercise"""
+
+    random.seed(SEED)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        audio, scoreboard = run_session(EVERYTHING, temp_dir)
+        elapsed = time.perf_counter() - start
+
+    print(f"Every exercise: {elapsed:.3f}s, {len(audio.notes)} notes "
+          f"({len(audio.notes) / elapsed:.0f} notes/s), "
+          f"{len(scoreboard.persistant_scores)} scored elements")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
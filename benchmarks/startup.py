@@ -0,0 +1,263 @@
+"""Startup benchmark -- how long before the application can show its menu
+
+    python -m benchmarks.startup                    # measure, compare to the baseline
+    python -m benchmarks.startup --update-baseline  # measure, save as the new baseline
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Modules that only the analytics side of the application should ever import.
+ANALYTICS_MODULES = ['pandas', 'numpy']
+
+# Generous upper limit (seconds) for importing everything main.py needs.
+IMPORT_BUDGET = 2.0
+
+# Where main.py is, and where the baseline measurements are kept.
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILENAME = os.path.join(ROOT_DIRECTORY, 'benchmarks', 'startup_baseline.json')
+
+# A measurement regresses if it's this much slower than the baseline (fraction, and seconds).
+#  - the absolute slack keeps tiny timings from failing on noise alone
+REGRESSION_TOLERANCE = 0.25
+REGRESSION_SLACK = 0.05
+
+# Each measurement is the best of this many runs.
+RUN_COUNT = 3
+
+# What main.py prints when the menu is up and waiting
+MENU_PROMPT = "Your Selection:"
+
+
+def measure_import(module_name):
+    """Import a module in a fresh interpreter.  Return (seconds, [analytics modules loaded])"""
+
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module_name}\n"
+        "print(time.perf_counter() - start)\n"
+        f"print(','.join(m for m in {ANALYTICS_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                            text=True, check=True, cwd=ROOT_DIRECTORY)
+    elapsed, loaded = result.stdout.splitlines()[-2:]
+
+    return float(elapsed), [module for module in loaded.split(',') if module]
+
+
+def parse_importtime(text):
+    """Parse `python -X importtime` output.  Return {module: (self seconds, cumulative seconds)}"""
+
+    imports = {}
+    for line in text.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue    # The header line
+
+        module = fields[2].strip()
+        imports[module] = (int(fields[0]) / 1e6, int(fields[1]) / 1e6)
+
+    return imports
+
+
+def profile_imports(module_name):
+    """Per-module import cost of importing a module in a fresh interpreter"""
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                            capture_output=True, text=True, check=True, cwd=ROOT_DIRECTORY)
+
+    return parse_importtime(result.stderr)
+
+
+def get_session_script(keys, lines, null_audio=True):
+    """Python that runs the application as main.py builds it, with scripted input
+
+    null_audio swaps main.py's scamp session for a NullAudioBackend, so no sound font is
+    needed (and none of its startup is measured).
+    """
+
+    return (
+        "import sys\n"
+        f"sys.path.insert(0, {ROOT_DIRECTORY!r})\n"
+        "from main import build_application\n"
+        "from src.audiobackend import NullAudioBackend\n"
+        "from src.inputbackend import ScriptedInputBackend\n"
+        "from src.keypresshelper import set_input_backend\n"
+        "from src.player import Player\n"
+        "from src.scorestore import ScoreStore\n"
+        f"set_input_backend(ScriptedInputBackend({keys!r}, {lines!r}))\n"
+        + ("audio = NullAudioBackend()\n" if null_audio else "audio = None\n") +
+        "app = build_application(Player(audio), ScoreStore(), 'benchmark')\n"
+        "try:\n"
+        "    app.run()\n"
+        "except EOFError:\n"
+        "    pass    # The script ran out\n"
+    )
+
+
+def measure_time_to_menu(timeout=60, null_audio=False):
+    """Seconds from launching until the menu is waiting for a selection
+
+    With main.py's audio (a scamp session) unless null_audio.  Only the input is
+    scripted, so no terminal is needed.
+    """
+
+    # Run somewhere scratch, the application writes its scores to the working directory.
+    script = get_session_script([], ["x"], null_audio)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        with subprocess.Popen([sys.executable, "-u", "-c", script],
+                              cwd=temp_dir, text=True, stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE) as process:
+
+            # Wait for the prompt, a character at a time.
+            output = ""
+            while not output.endswith(MENU_PROMPT):
+                character = process.stdout.read(1)
+                if character == "" or time.perf_counter() - start > timeout:
+                    process.kill()
+                    error = process.stderr.read().strip().splitlines()
+                    raise RuntimeError("the menu never showed: " +
+                                       (error[-1] if error else "no output"))
+                output += character
+
+            elapsed = time.perf_counter() - start
+
+            # The scripted "x" leaves
+            process.communicate(timeout=timeout)
+
+    return elapsed
+
+
+def measure_time_to_first_note(timeout=60):
+    """Seconds from launching until the first note of exercise 0, with null audio"""
+
+    # The script ends after the first trial set
+    script = get_session_script(['space'], ['0']) + "print(audio.first_note_time)\n"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.time()
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                                text=True, cwd=temp_dir, timeout=timeout)
+
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        raise RuntimeError("headless session failed: " + (error[-1] if error else "no output"))
+
+    return float(result.stdout.splitlines()[-1]) - start
+
+
+def measure_startup():
+    """Take all the startup measurements.  Return {measurement: seconds or None}"""
+
+    # Helper Inner Functions
+    def best_of(measure):
+        try:
+            return min(measure() for _ in range(RUN_COUNT))
+        except RuntimeError as error:
+            print(f"SKIP: {error}")
+            return None     # Couldn't be measured here
+
+    return {
+        'import_main': best_of(lambda: measure_import("main")[0]),
+        'time_to_menu': best_of(measure_time_to_menu),
+        'time_to_menu_headless': best_of(lambda: measure_time_to_menu(null_audio=True)),
+        'time_to_first_note': best_of(measure_time_to_first_note)
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance=REGRESSION_TOLERANCE,
+                        slack=REGRESSION_SLACK):
+    """Names of the measurements that regressed past the tolerance"""
+
+    regressions = []
+    for name, seconds in results.items():
+        baseline_seconds = baseline.get(name)
+        if seconds is None or baseline_seconds is None:
+            continue    # Nothing to compare
+
+        if seconds > baseline_seconds * (1 + tolerance) + slack:
+            regressions.append(name)
+
+    return regressions
+
+
+def open_baseline(filename=BASELINE_FILENAME):
+    """The stored baseline, or an empty one"""
+
+    try:
+        with open(filename, 'r', encoding='utf-8') as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results, filename=BASELINE_FILENAME):
+    """Store results as the baseline"""
+
+    with open(filename, 'w', encoding='utf-8') as baseline_file:
+        json.dump({name: None if seconds is None else round(seconds, 4)
+                   for name, seconds in results.items()}, baseline_file, indent=2)
+        baseline_file.write('\n')
+
+
+def main():
+    """Run the benchmark, non-zero exit if startup is over budget or has regressed"""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="save these measurements as the new baseline")
+    parser.add_argument('--top', type=int, default=15,
+                        help="how many of the slowest imports to list")
+    args = parser.parse_args()
+
+    failed = False
+
+    # Where does the import time go?
+    imports = profile_imports("main")
+    print(f"Slowest imports (self / cumulative seconds) of {len(imports)}:")
+    for module, (self_seconds, cumulative_seconds) in sorted(
+            imports.items(), key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"  {self_seconds:8.4f} {cumulative_seconds:8.4f}  {module}")
+
+    loaded = [module for module in ANALYTICS_MODULES if module in imports]
+    if loaded:
+        print(f"FAIL: analytics modules imported at startup: {', '.join(loaded)}")
+        failed = True
+
+    results = measure_startup()
+    for name, seconds in results.items():
+        if seconds is not None:
+            print(f"{name}: {seconds:.3f}s")
+
+    if results['import_main'] is not None and results['import_main'] > IMPORT_BUDGET:
+        print(f"FAIL: import main over budget of {IMPORT_BUDGET:.1f}s")
+        failed = True
+
+    if args.update_baseline:
+        # Anything that couldn't be measured here keeps its old baseline.
+        baseline = open_baseline()
+        save_baseline({name: baseline.get(name) if seconds is None else seconds
+                       for name, seconds in results.items()})
+        print(f"Baseline saved to {BASELINE_FILENAME}")
+    else:
+        baseline = open_baseline()
+        for name in compare_to_baseline(results, baseline):
+            print(f"FAIL: {name} regressed: {results[name]:.3f}s "
+                  f"(baseline {baseline[name]:.3f}s)")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,36 @@
 """Main entry point into script"""
 
 import logging
+import os
+import sys
 
 from src.application import Application
-from src.exercise import OneString, OneOctaveEasy, OneOctaveMedium, OneOctaveHard
-from src.exercise import OnePositionEasy, OnePositionMedium, OnePositionHard
-from src.exercise import ChordTones, AudiationEasy, AudiationHard, JustTheIntervals
-from src.exercise import SingTheIntervalsEasy, SingTheIntervalsMedium, SingTheIntervalsHard
+from src.backgroundwriter import BackgroundWriter
+from src.exerciseregistry import ExerciseDescriptor, ExerciseRegistry
+from src.exercisespec import load_exercise_specs
+from src.feasibility import analyze_specs
 from src.player import Player
-from src.scoreboard import Scoreboard
+from src.scorestore import ScoreStore
+
+# The exercise definitions
+EXERCISES_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  'data', 'exercises.json')
+
+
+def build_application(player: Player, store: ScoreStore, student_id) -> Application:
+    """Everything the menu needs, with exercises registered"""
+
+    # Instantiate the application
+    registry = ExerciseRegistry(player, store.get_scoreboard(student_id))
+    app = Application(registry, store, student_id)
+
+    # Register the exercises
+    #  - compiled (and checked for unbuildable settings) once,
+    #    then loaded from the cache until the file changes
+    for spec in load_exercise_specs(EXERCISES_FILENAME, analyze_specs):
+        app.register_exercise(ExerciseDescriptor.from_spec(spec))
+
+    return app
 
 
 def main():
@@ -18,37 +40,36 @@ def main():
     logging.basicConfig(filename='eartrainer.log',
                         level=logging.DEBUG, filemode='w', force=True)
 
-    # Instantiate the application
-    app = Application()
+    # File writes happen off the UI thread
+    writer = BackgroundWriter()
 
-    # Make a player
-    player = Player()
+    # Score sung intervals by ear?  (main.py --listen [student])
+    arguments = sys.argv[1:]
+    pitch_scorer = None
+    if '--listen' in arguments:
+        arguments.remove('--listen')
 
-    # Create and open the scoreboard
-    scoreboard = Scoreboard()
-    scoreboard.open()
+        # Only loaded (with numpy) when asked for
+        # pylint: disable-next=import-outside-toplevel
+        from src.pitchdetector import MicrophoneSource, PitchScorer
+        pitch_scorer = PitchScorer(MicrophoneSource())
 
-    # Register the exercises
-    app.register_exercise(OneString(player, scoreboard))
-    app.register_exercise(OneOctaveEasy(player, scoreboard))
-    app.register_exercise(OneOctaveMedium(player, scoreboard))
-    app.register_exercise(OneOctaveHard(player, scoreboard))
-    app.register_exercise(OnePositionEasy(player, scoreboard))
-    app.register_exercise(OnePositionMedium(player, scoreboard))
-    app.register_exercise(OnePositionHard(player, scoreboard))
-    app.register_exercise(ChordTones(player, scoreboard))
-    app.register_exercise(AudiationEasy(player, scoreboard))
-    app.register_exercise(AudiationHard(player, scoreboard))
-    app.register_exercise(SingTheIntervalsEasy(player, scoreboard))
-    app.register_exercise(SingTheIntervalsMedium(player, scoreboard))
-    app.register_exercise(SingTheIntervalsHard(player, scoreboard))
-    app.register_exercise(JustTheIntervals(player, scoreboard))
+    # Who's practicing?
+    student_id = ScoreStore.DEFAULT_STUDENT
+    if len(arguments) > 0:
+        student_id = arguments[0]
 
-    # Doit
-    app.run()
+    # Open the student's scores, make a player and an application
+    store = ScoreStore(writer)
+    app = build_application(Player(pitch_scorer=pitch_scorer), store, student_id)
 
-    # Save scores
-    scoreboard.save()
+    # Doit
+    try:
+        app.run()
+    finally:
+        # Save scores (and the buffered history), however we left
+        store.close()
+        writer.close()
 
 
 if __name__ == "__main__":
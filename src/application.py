@@ -1,40 +1,64 @@
 """Application Menu"""
 
-import os
+from concurrent.futures import ThreadPoolExecutor
 import random
 import time
 
+from src.exerciseregistry import ExerciseDescriptor, ExerciseRegistry
+from src.keypresshelper import clear_screen, read_line
+from src.scheduler import PracticeScheduler
+from src.scorestore import ScoreStore
+from src.sessionplanner import PLAN_RESOLUTION, DurationEstimator, plan_session
+
 
 class Application:
     """Register exercises and operate the application menu"""
 
-    def __init__(self):
-        self.exercises = []
-        self.options = ["m", "r", "e", "x"]   # Our default options
+    MIXER_RUN_TIME = 1200  # 20 minutes, in seconds
+
+    def __init__(self, registry: ExerciseRegistry, store: ScoreStore = None,
+                 student_id=ScoreStore.DEFAULT_STUDENT):
+
+        # Exercises are only built when they're selected
+        self.registry = registry
+        self.options = ["m", "r", "e", "s", "x"]   # Our default options
+
+        # Per-student scores
+        self.store = store
+        self.student_id = student_id
 
-    def register_exercise(self, exercise):
+    def register_exercise(self, descriptor: ExerciseDescriptor):
         """Add a new exercise to the menu"""
 
-        self.exercises.append(exercise)
-        self.options.append(str(self.exercises.index(exercise)))
+        self.registry.register(descriptor)
+
+    def is_option(self, selection):
+        """Is this a legit menu selection"""
+
+        if selection in self.options:
+            return True
+
+        # Or an exercise number
+        return selection.isdigit() and int(selection) < len(self.registry)
 
     def show_menu(self):
         """Show the user options"""
 
-        os.system('clear')
+        clear_screen()
 
         print("--------------------------------------")
         print("Exercise Options")
         print("--------------------------------------")
 
-        for index, exercise in enumerate(self.exercises):
+        for index, descriptor in enumerate(self.registry.descriptors):
 
             # Iterate across all registered exercises.
-            print(f"{index} - {exercise}")
+            print(f"{index} - {descriptor}")
 
         print("m - Exercise mixer")
         print("r - Random single exercise")
         print("e - Everything (in random order)")
+        print(f"s - Switch student (current: {self.student_id})")
         print("x - Exit")
         print("\n")
 
@@ -43,32 +67,140 @@ class Application:
 
         # Make a list of mixable exercises.
         exercise_list = []
-        for exercise in self.exercises:
-            if exercise.is_mixable():
-                exercise_list.append(exercise)
+        for index in self.registry.get_mixable_indexes():
+            exercise_list.append(self.registry.get(index))
 
         if len(exercise_list) == 0:
             raise RuntimeError("No mixable exercises found.")
 
-        run_time = 1200  # 20 minutes, in seconds
-
-        start_time = time.time()
-        remain_time = run_time
-        while remain_time > 0:
-            random.choice(exercise_list).do_singleton(remain_time)
-            remain_time = run_time - (time.time() - start_time)
+        # Schedule them by spaced repetition.
+        exercises_by_name = {exercise.name: exercise for exercise in exercise_list}
+        scoreboard = exercise_list[0].sb
+        scheduler = PracticeScheduler()
+        scheduler.add_exercises(exercises_by_name.keys(), scoreboard)
+
+        # How long does each one take?  (Kept with the student's scores)
+        if self.store is None:
+            estimator = DurationEstimator()
+        else:
+            estimator = DurationEstimator(self.store.writer,
+                                          self.store.get_directory(self.student_id))
+        estimator.open()
+
+        # How many more times to play each exercise, to fill the session
+        plan = {}
+
+        # Helper Inner Functions
+        def get_estimate(exercise_name):
+            exercise = exercises_by_name[exercise_name]
+            return estimator.get_estimate(
+                exercise_name, exercise.exercise_duration / exercise.trials_sets_count)
+
+        def choose_next(time_left, current=None):
+            # Stick to the plan while the rest of it fits (to within the planner's resolution),
+            # else re-plan the time left with the latest estimates.
+            planned_time = sum(get_estimate(name) * count for name, count in plan.items())
+            if len(plan) == 0 or planned_time > time_left + PLAN_RESOLUTION:
+                plan.clear()
+                plan.update(plan_session(time_left, {name: get_estimate(name)
+                                                     for name in exercises_by_name}))
+            if len(plan) == 0:
+                return None     # Nothing fits in the time left
+
+            # Whatever planned exercise is due next
+            next_pair = scheduler.pop_next(plan.keys())
+            if next_pair is None and current is not None and current[0] in plan:
+                next_pair = current     # Only the one playing now is left
+            return next_pair
+
+        def use_plan(exercise_name):
+            # One less to go
+            plan[exercise_name] -= 1
+            if plan[exercise_name] == 0:
+                del plan[exercise_name]
+
+        run_time = Application.MIXER_RUN_TIME
+
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+
+            start_time = time.time()
+            upcoming = choose_next(run_time)
+            if upcoming is not None:
+                upcoming_package = prefetcher.submit(
+                    exercises_by_name[upcoming[0]].build_package, 1, upcoming[1])
+
+            while upcoming is not None:
+
+                exercise_name, element = upcoming
+                exercise = exercises_by_name[exercise_name]
+                package = upcoming_package.result()
+
+                # Did the last one run long?
+                remain_time = run_time - (time.time() - start_time)
+                if get_estimate(exercise_name) > remain_time:
+                    break
+                use_plan(exercise_name)
+
+                # Choose and build the next one (a trial set of its element) while this one plays.
+                #  - unless it's this one again:  building changes the exercise (its
+                #    interval weights) while it's being played.  That waits until after.
+                upcoming = choose_next(remain_time - get_estimate(exercise_name), upcoming)
+                prefetching = upcoming is not None and upcoming[0] != exercise_name
+                if prefetching:
+                    upcoming_package = prefetcher.submit(
+                        exercises_by_name[upcoming[0]].build_package, 1, upcoming[1])
+
+                singleton_start_time = time.time()
+                scores = exercise.play_package(package, remain_time)
+                estimator.record(exercise_name, time.time() - singleton_start_time)
+
+                if upcoming is not None and not prefetching:
+                    upcoming_package = prefetcher.submit(
+                        exercise.build_package, 1, upcoming[1])
+
+                # Then put it back, depending on how its trial sets just went.
+                #  - all of them, if the whole exercise was scheduled
+                element_scores = [score for label, score in scores
+                                  if element in (PracticeScheduler.EXERCISE_ELEMENT, label)]
+                score = None
+                if len(element_scores) > 0:
+                    score = sum(element_scores) / len(element_scores)
+                scheduler.reschedule(exercise_name, element, score)
+
+        estimator.save()
 
     def run_random(self):
         """Pick an exercise to run at random"""
 
-        exercise = random.choice(self.exercises)
+        exercise = self.registry.get(random.randrange(0, len(self.registry)))
         exercise.do_exercise()
 
     def run_all_random(self):
         """Do every exercise once, in a random order"""
 
-        for exercise in random.sample(self.exercises, len(self.exercises)):
-            exercise.do_exercise()
+        exercise_order = [self.registry.get(index) for index in
+                          random.sample(range(len(self.registry)), len(self.registry))]
+
+        # Build each exercise while the one before it plays.
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            upcoming_package = prefetcher.submit(exercise_order[0].build_package)
+            for index, exercise in enumerate(exercise_order):
+                package = upcoming_package.result()
+                if index + 1 < len(exercise_order):
+                    upcoming_package = prefetcher.submit(
+                        exercise_order[index + 1].build_package)
+
+                exercise.play_package(package, exercise.exercise_duration)
+
+    def switch_student(self, student_id):
+        """Point every exercise at another student's scoreboard"""
+
+        if self.store is None:
+            raise RuntimeError("No score store to switch students with.")
+
+        self.registry.set_scoreboard(self.store.get_scoreboard(student_id))
+
+        self.student_id = student_id
 
     def run(self):
         """Run our application"""
@@ -78,9 +210,9 @@ class Application:
                 self.show_menu()
 
                 # What's our choice?
-                selection = input("Your Selection: ")
+                selection = read_line("Your Selection: ")
 
-                if selection in self.options:
+                if self.is_option(selection):
                     break   # legit option selected
 
                 else:
@@ -94,7 +226,12 @@ class Application:
                 self.run_random()
             elif selection == "e":
                 self.run_all_random()
+            elif selection == "s":
+                try:
+                    self.switch_student(read_line("Student ID: "))
+                except (ValueError, RuntimeError) as error:
+                    print(error)
             elif selection == "x":
                 break
             else:
-                self.exercises[int(selection)].do_exercise()
+                self.registry.get(int(selection)).do_exercise()
@@ -0,0 +1,124 @@
+"""Where the Player's notes go"""
+
+import time
+
+from src.noteevents import get_events_end
+
+
+class ScampAudioBackend:
+    """Play notes through a scamp session"""
+
+    def __init__(self, instrument="Clarinet", tempo=120, drone_instrument="Strings"):
+
+        # scamp is slow to import, and only needed when there's real audio.
+        import scamp  # pylint: disable=import-outside-toplevel
+
+        self.scamp = scamp
+
+        # Create and configure the session and part.
+        self.session = scamp.Session(tempo=tempo)
+        self.part = self.session.new_part(instrument)
+
+        # The drone gets a part of its own, made the first time it's needed.
+        self.drone_instrument = drone_instrument
+        self.drone_part = None
+        self.drone_handle = None
+
+    def play_note(self, note, volume, duration):
+        """Play a note (blocks until it's done)"""
+
+        self.part.play_note(note, volume, duration)
+
+    def play_events(self, events):
+        """Play note events, each at its onset from now (blocks until the last one ends)"""
+
+        # Every onset is timed from the start on the session clock, so waits never drift,
+        # and notes are started rather than played, so they can overlap.
+        start = self.session.beat()
+        for onset, duration, velocity, pitch in events.tolist():
+            delay = start + onset - self.session.beat()
+            if delay > 0:
+                self.scamp.wait(delay)
+            self.part.play_note(pitch, velocity / 127, duration, blocking=False)
+
+        remaining = start + get_events_end(events) - self.session.beat()
+        if remaining > 0:
+            self.scamp.wait(remaining)
+
+    def wait(self, beats):
+        """Pause the music"""
+
+        self.scamp.wait(beats)
+
+    def start_drone(self, notes, volume):
+        """Sustain notes on the drone part until stop_drone (doesn't block)"""
+
+        if self.drone_part is None:
+            self.drone_part = self.session.new_part(self.drone_instrument)
+
+        # Started, not played:  it rings on through every note, wait and key prompt.
+        self.drone_handle = self.drone_part.start_chord(list(notes), volume)
+
+    def stop_drone(self):
+        """Release the drone"""
+
+        if self.drone_handle is not None:
+            self.drone_handle.end()
+            self.drone_handle = None
+
+    def close(self):
+        """Cleanup the session"""
+
+        self.stop_drone()
+        self.session.kill()
+
+
+class NullAudioBackend:
+    """Play nothing, and don't wait for it -- whole sessions run at CPU speed"""
+
+    def __init__(self):
+
+        # Everything that would have been played: (note, volume, duration)
+        self.notes = []
+
+        # When the first note would have been heard (time.time()), for startup timing
+        self.first_note_time = None
+
+        # Every drone started:  (notes, volume, index into notes when it started)
+        self.drones = []
+        self.drone_notes = ()   # What's sounding now
+
+    def play_note(self, note, volume, duration):
+        """Note it down"""
+
+        if self.first_note_time is None:
+            self.first_note_time = time.time()
+        self.notes.append((note, volume, duration))
+
+    def play_events(self, events):
+        """Note them all down, a column at a time"""
+
+        if len(events) == 0:
+            return
+
+        if self.first_note_time is None:
+            self.first_note_time = time.time()
+        self.notes.extend(zip(events['pitch'].tolist(), (events['velocity'] / 127).tolist(),
+                              events['duration'].tolist()))
+
+    def wait(self, beats):
+        """No waiting"""
+
+    def start_drone(self, notes, volume):
+        """Note it down"""
+
+        self.drones.append((tuple(notes), volume, len(self.notes)))
+        self.drone_notes = tuple(notes)
+
+    def stop_drone(self):
+        """Silence"""
+
+        self.drone_notes = ()
+
+    def close(self):
+        """Nothing to cleanup"""
@@ -0,0 +1,242 @@
+"""Batch grading -- score practice takes recorded away from the application
+
+A directory of WAV takes, with a takes.json manifest saying who recorded each one, for
+which exercise, and the seed the exercise was built from:
+
+    [{"file": "alice-0412.wav", "student": "alice",
+      "exercise": "Singing the Easy Intervals", "seed": 412}, ...]
+
+An optional "trial_sets" limits how many trial sets the take covers.  The seed rebuilds
+the exact notes the student was given (build_seeded_package).  Each take is pitch
+tracked in a worker process, the notes heard are lined up against the expected ones,
+and every trial set gets a 1-4 score.  The scores go into each student's scoreboard
+and score history in bulk.
+
+    python -m src.autograde takes/                          # every cpu
+    python -m src.autograde takes/ --root students --workers 4
+"""
+
+import argparse
+import concurrent.futures
+import difflib
+import json
+import logging
+import os
+import sys
+import time
+from typing import NamedTuple
+
+from src.exercise import build_seeded_package
+from src.exercisepackage import ExercisePackage, ExerciseType
+from src.exercisespec import load_exercise_specs
+from src.pitchdetector import PitchDetector, iter_wav_blocks, segment_notes
+from src.scoreboard import Scoreboard
+from src.scorestore import ScoreStore
+
+DEFINITIONS_FILENAME = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'exercises.json')
+
+MANIFEST_FILENAME = 'takes.json'
+
+# Fraction of a trial set's notes heard (at least) for a score of 4, 3, and 2.  Less is a 1.
+GRADE_LIMITS = [(4, 0.9), (3, 0.75), (2, 0.5)]
+
+
+class Take(NamedTuple):
+    """One recording, and what it was a recording of"""
+
+    filename: str
+    student: str
+    exercise: str
+    seed: int
+    trials_sets_count: int = None   # None for the exercise's own count
+
+
+class GradedTake(NamedTuple):
+    """The scores for a take"""
+
+    take: Take
+    scores: list            # (element, score) for each trial set
+    expected_count: int     # Notes the student should have sung or played
+    heard_count: int        # Notes the pitch tracking heard
+    matched_count: int      # Expected notes that were heard, in order
+    seconds: float          # Length of the recording
+
+
+def read_manifest(directory):
+    """The takes listed in a directory's manifest"""
+
+    with open(os.path.join(directory, MANIFEST_FILENAME), encoding='utf-8') as manifest_file:
+        entries = json.load(manifest_file)
+
+    takes = []
+    for entry in entries:
+        try:
+            takes.append(Take(os.path.join(directory, entry['file']), entry['student'],
+                              entry['exercise'], int(entry['seed']),
+                              entry.get('trial_sets')))
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"Bad manifest entry {entry}: {error!r}") from error
+
+    return takes
+
+
+def get_expected_notes(package: ExercisePackage):
+    """What the student should sing or play.  Return [(trial set index, midi note)]"""
+
+    expected = []
+    for index, trial_set in enumerate(package.trial_sets):
+        for trial in trial_set:
+            if package.get_exercise_type() == ExerciseType.INTERVAL:
+                expected.append((index, trial[1]))  # Only the answer is sung
+            elif package.get_exercise_type() == ExerciseType.RHYTHM:
+                expected.extend((index, note) for note in trial['pitch'].tolist())
+            else:
+                expected.extend((index, note) for note in trial)
+
+    return expected
+
+
+def get_element(label, definition):
+    """Scoreboard element for a trial set:  its label (the interval), else its definition"""
+
+    if len(label) > 0:
+        return label
+
+    # e.g. "String: A" for a One String trial set.  The delimiter can't be in the key.
+    return definition.splitlines()[0].replace(Scoreboard.SCORE_DELIMITER, '')
+
+
+def grade_fraction(fraction):
+    """Score (1-4) for the fraction of notes heard"""
+
+    for score, limit in GRADE_LIMITS:
+        if fraction >= limit:
+            return score
+
+    return 1
+
+
+def match_notes(expected_notes, heard_notes):
+    """Indices of the expected notes that were heard, in order
+
+    Pitch classes are compared, so octaves don't count against the student, and the
+    alignment rides out missed and extra notes.
+    """
+
+    matcher = difflib.SequenceMatcher(None, [note % 12 for note in expected_notes],
+                                      [note % 12 for note in heard_notes], autojunk=False)
+
+    return [block.a + offset for block in matcher.get_matching_blocks()
+            for offset in range(block.size)]
+
+
+def grade_take(take: Take, spec):
+    """Pitch track a take and score its trial sets (runs in a worker process)"""
+
+    package = build_seeded_package(spec, take.seed, take.trials_sets_count)
+    expected = get_expected_notes(package)
+
+    # Streamed, so a long take is never all in memory
+    blocks = iter_wav_blocks(take.filename)
+    detector = PitchDetector(next(blocks))
+    estimates = []
+    for block in blocks:
+        estimates.extend(detector.process_block(block))
+
+    # Onsets are wherever the pitch changes (or a gap of more than a hop and a half)
+    hop_seconds = detector.hop_size / detector.sample_rate
+    heard = [note for _, note in segment_notes(estimates, 1.5 * hop_seconds)]
+    matched = match_notes([note for _, note in expected], heard)
+
+    # Score each trial set by how much of it was heard
+    totals = [0] * len(package)
+    hits = [0] * len(package)
+    for index, _ in expected:
+        totals[index] += 1
+    for expected_index in matched:
+        hits[expected[expected_index][0]] += 1
+
+    scores = [(get_element(label, definition),
+               grade_fraction(hit / total if total > 0 else 0))
+              for label, definition, hit, total in zip(
+                  package.trial_set_label, package.trial_set_definitions, hits, totals)]
+
+    return GradedTake(take, scores, len(expected), len(heard), len(matched),
+                      detector.sample_count / detector.sample_rate)
+
+
+def grade_takes(takes, specs, workers=None):
+    """Grade the takes in parallel.  workers=0 grades them in this process."""
+
+    specs_by_name = {spec.name: spec for spec in specs}
+    for take in takes:
+        if take.exercise not in specs_by_name:
+            raise ValueError(f"Unknown exercise for {take.filename}: {take.exercise}")
+    take_specs = [specs_by_name[take.exercise] for take in takes]
+
+    if workers == 0:
+        return [grade_take(take, spec) for take, spec in zip(takes, take_specs)]
+
+    # One take per task, they're long enough already.
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(grade_take, takes, take_specs))
+
+
+def record_grades(graded_takes, store: ScoreStore):
+    """Write the scores to each student's scoreboard and score history"""
+
+    # A student at a time, so the store never has to swap them out.
+    for graded in sorted(graded_takes, key=lambda graded: graded.take.student):
+        scoreboard = store.get_scoreboard(graded.take.student)
+        for element, score in graded.scores:
+            scoreboard.append_score(graded.take.exercise, element, score)
+
+        # One history entry per take, as if the exercise had been run in the application
+        elements = dict.fromkeys(element for element, _ in graded.scores)
+        scoreboard.history.append_to_history({
+            key: scoreboard.get_raw_element_score(key)
+            for key in (scoreboard.get_test_prefix(graded.take.exercise, element)
+                        for element in elements)})
+
+
+def main():
+    """Grade a directory of takes"""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directory', help=f"the takes, and their {MANIFEST_FILENAME}")
+    parser.add_argument('--definitions', default=DEFINITIONS_FILENAME)
+    parser.add_argument('--root', default=ScoreStore.ROOT_DIRECTORY,
+                        help="where the student score directories are")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="pool size (default: every cpu, 0: no pool)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s", force=True)
+
+    takes = read_manifest(args.directory)
+
+    start = time.perf_counter()
+    graded_takes = grade_takes(takes, load_exercise_specs(args.definitions), args.workers)
+    elapsed = time.perf_counter() - start
+
+    store = ScoreStore(root_directory=args.root)
+    record_grades(graded_takes, store)
+    store.close()
+
+    for graded in graded_takes:
+        scores = [score for _, score in graded.scores]
+        logging.info("%s: %s, %d of %d notes heard, average score %.2f",
+                     os.path.basename(graded.take.filename), graded.take.student,
+                     graded.matched_count, graded.expected_count,
+                     sum(scores) / len(scores) if len(scores) > 0 else 0)
+
+    audio_seconds = sum(graded.seconds for graded in graded_takes)
+    logging.info("Graded %d takes, %.0fs of audio, in %.1fs (%.0fx real time)",
+                 len(graded_takes), audio_seconds, elapsed, audio_seconds / max(elapsed, 1e-9))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
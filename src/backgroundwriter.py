@@ -0,0 +1,63 @@
+"""Thread for getting file writes off of the UI thread"""
+
+import logging
+import queue
+import threading
+
+
+class BackgroundWriter:
+    """Run submitted writes, in order, on a dedicated thread"""
+
+    # Max writes waiting.  Once full, submit() blocks until the thread catches up.
+    QUEUE_SIZE = 32
+
+    def __init__(self) -> None:
+
+        self.write_queue = queue.Queue(maxsize=BackgroundWriter.QUEUE_SIZE)
+        self.closed = False
+
+        # Daemon so a crash on the UI thread can't hang the exit; close() does the drain.
+        self.thread = threading.Thread(
+            target=self.run, name="BackgroundWriter", daemon=True)
+        self.thread.start()
+
+    def submit(self, write_function, *args):
+        """Queue write_function(*args) to run on the writer thread"""
+
+        if self.closed:
+            raise RuntimeError("BackgroundWriter is closed.")
+
+        self.write_queue.put((write_function, args))
+
+    def run(self):
+        """Writer thread main loop"""
+
+        while True:
+            job = self.write_queue.get()
+            try:
+                if job is None:
+                    return      # Closed
+
+                write_function, args = job
+                try:
+                    write_function(*args)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    # Keep going, one bad write shouldn't lose the rest.
+                    logging.exception("Background write failed")
+            finally:
+                self.write_queue.task_done()
+
+    def drain(self):
+        """Wait until every submitted write has finished"""
+
+        self.write_queue.join()
+
+    def close(self):
+        """Finish all submitted writes and stop the thread"""
+
+        if self.closed:
+            return
+
+        self.closed = True
+        self.write_queue.put(None)
+        self.thread.join()
@@ -1,68 +1,120 @@
 """All of the exercises, version 2"""
 
 from abc import ABC, abstractmethod
+import bisect
+import functools
 import itertools
 import random
 
-from src.midiutilities import MidiUtil
+from src.midiutilities import MidiUtil, MAX_MIDI_VALUE
 from src.guitarutilities import GuitarUtil
 from src.player import Player
-from src.exercisepackage import ExercisePackage, ExerciseType, PauseDuration
+from src.exercisepackage import DroneType, ExercisePackage
+from src.exercisespec import ExerciseSpec, build_exercise_package
 from src.scoreboard import Scoreboard
 from src.keypresshelper import any_key_press
+from src.noteevents import build_note_events
+from src.weightedsampler import WeightedSampler
+
+# Drones are voiced up from the tonic in the octave below middle C, over its octave below.
+DRONE_ROOT_NOTE = 48
+
+
+class TransitionGraph:
+    """Which legal notes can follow each one, so trials are built without redrawing
+
+    The notes are sorted, so those within max_interval of a note are a run of them, and
+    so are those within trial_range of a trial's highest and lowest notes.  The next note
+    is a single draw from where the two runs overlap:  the same odds as drawing from all
+    the legal notes until one fits, but never a wasted draw, however long the trial.
+    """
+
+    def __init__(self, legal_notes, max_interval, trial_range):
+
+        self.notes = sorted(set(legal_notes))
+
+        # Index of the first note at or above each midi value (and one past the top)
+        self.first_index = [bisect.bisect_left(self.notes, value)
+                            for value in range(MAX_MIDI_VALUE + 2)]
+
+        # The edges:  for each note, the (start, end) indexes of the notes that can follow it
+        self.successors = [(self.get_first_index(note - max_interval),
+                            self.get_first_index(note + max_interval + 1))
+                           for note in self.notes]
+
+        # Where the run within trial_range starts when a note is the highest so far,
+        # and where it ends when a note is the lowest.
+        self.range_starts = [self.get_first_index(note - trial_range) for note in self.notes]
+        self.range_ends = [self.get_first_index(note + trial_range + 1) for note in self.notes]
+
+    def get_first_index(self, value):
+        """Index of the first note at or above value (any value, in range or not)"""
+
+        return self.first_index[min(max(value, 0), MAX_MIDI_VALUE + 1)]
+
+
+@functools.lru_cache(maxsize=1024)
+def get_transition_graph(legal_notes: tuple, max_interval, trial_range) -> TransitionGraph:
+    """The graph for a legal notes list, built the first time it's needed"""
+
+    return TransitionGraph(legal_notes, max_interval, trial_range)
 
 
 class Exercise(ABC):
     """Parent Class for Exercises"""
 
-    def __init__(self, player: Player, scoreboard: Scoreboard, name, e_p: ExercisePackage,
-                 mixable: bool, exercise_duration, trials_sets_count, trials_count, trial_size,
-                 max_interval, trial_range, key_centers, intervalics,
-                 trial_varied_intervalics) -> None:
+    def __init__(self, player: Player, scoreboard: Scoreboard, spec: ExerciseSpec) -> None:
 
         # The classes we'll need
         self.m_u = MidiUtil()
         self.g_u = GuitarUtil()
-        self.e_p = e_p
+        self.e_p = build_exercise_package(spec)
         self.player = player
         self.sb = scoreboard
 
-        # The configuration data
-        self.name = name
+        # The configuration data, compiled from the exercise definitions file
+        self.spec = spec
+        self.name = spec.name
 
         # Should this exercise be included when we do the exercise mixer.
-        self.mixable = mixable
+        self.mixable = spec.mixable
 
         # Values for
         #   - Exercise duration (in seconds)
         #   - size of each trial, trials in a trial set, and trial sets.
 
-        self.exercise_duration = exercise_duration
+        self.exercise_duration = spec.exercise_duration
 
         # Maz number of different sets/definitions
-        self.trials_sets_count = trials_sets_count
+        self.trials_sets_count = spec.trials_sets_count
         # Number of trials under single definition
-        self.trials_count = trials_count
-        self.trial_size = trial_size                # Number of notes per trial
+        self.trials_count = spec.trials_count
+        self.trial_size = spec.trial_size           # Number of notes per trial
 
         # Need something here to determine what the legal notes for the exercise will be.
         # Trial set range, key/mode, chord tones, etc.
-        self.key_centers = key_centers
-        self.intervalics = intervalics
-        self.trial_varied_intervalics = trial_varied_intervalics
+        self.key_centers = list(spec.key_centers)
+        self.intervalics = list(spec.intervalics)
+        self.trial_varied_intervalics = spec.trial_varied_intervalics
+
+        # What (if anything) sustains under the trials
+        self.drone = spec.drone
 
         # A place for the last note of the previous trial.  Set to -1 in most cases.
-        self.remember_note_of_previous_trial_set = False
+        self.remember_note_of_previous_trial_set = spec.remember_note_of_previous_trial_set
 
         # Need something here to determine note limitations within a single trial.
-        self.max_interval = max_interval
-        self.trial_range = trial_range
+        self.max_interval = spec.max_interval
+        self.trial_range = spec.trial_range
 
         # Some settings for interval singing exercises
-        self.practice_intervals = []
-        self.candidate_intervals = []
+        self.interval_sampler = WeightedSampler()
+        self.candidate_intervals = list(spec.candidate_intervals)
         self.practice_interval_current = ''
 
+        # The element the next trial set practices, when it's been chosen for us
+        self.practice_interval_focus = None
+
         # What are the midi note values for our low estring
         #  - turns out this is useful in most exercises
         self.low_estring_low_note = self.m_u.index(
@@ -75,168 +127,232 @@ class Exercise(ABC):
     def __str__(self):
         return self.name
 
+    def set_scoreboard(self, scoreboard: Scoreboard):
+        """Keep score on a different scoreboard (i.e. another student's)"""
+
+        self.sb = scoreboard
+
     def get_remember_note_of_previous_trial_set(self):
         """Has the last note of the previous set been saved?"""
 
         return self.remember_note_of_previous_trial_set
 
+    def get_legal_notes(self, low_note, high_note, intervalic_list, key_center):
+        """The legal notes between low and high note, one list per intervalic"""
+
+        # Narrow ranges can start mid pattern, which the tables don't capture.
+        #  - anything an octave or wider is just a slice of the precomputed table.
+        if high_note - low_note < 11:
+            return self.m_u.build_note_list(low_note, high_note, intervalic_list, key_center)
+
+        legal_notes_lists = []
+        for intervalic in intervalic_list:
+            notes = self.spec.get_legal_notes(key_center, intervalic)
+            legal_notes_lists.append(list(notes[bisect.bisect_left(notes, low_note):
+                                                bisect.bisect_right(notes, high_note)]))
+
+        return legal_notes_lists
+
     @abstractmethod
+    def get_trial_set_ranges(self, key_center, intervalic):
+        """Every (low note, high note) a trial set could use -- abstract method"""
+
     def get_trial_set_range(self, key_center, intervalic):
-        """Define the Trial Set Range -- abstract method"""
+        """Define the Trial Set Range"""
+
+        # Any of the possible ranges.
+        #  - they're enumerated, so the feasibility analyzer can check every one.
+        return random.choice(self.get_trial_set_ranges(key_center, intervalic))
 
     @abstractmethod
     def build_trial_definition(self, low_note, key_center, intervalic_list):
         """Define Trial Definition -- abstract method"""
 
+    def build_drone_notes(self, key_center, intervalic_list):
+        """The notes to sustain under a trial set:  the tonic, or the tonic chord"""
+
+        if self.drone == DroneType.NONE:
+            return ()
+
+        root = DRONE_ROOT_NOTE + self.m_u.note_names.index(key_center)
+        if self.drone == DroneType.TONIC:
+            return (root - 12, root)
+
+        # The first chord on the tonic (triads first) that fits every intervalic in play
+        chords = [chord for chord in self.m_u.chords_for_mode(intervalic_list[0], key_center)
+                  if all(chord in self.m_u.chords_for_mode(intervalic, key_center)
+                         for intervalic in intervalic_list[1:])]
+        if len(chords) == 0:
+            return (root - 12, root)    # Nothing fits, the tonic will have to do
+
+        chord_mask = self.m_u.get_pitch_class_mask(chords[0], key_center)
+        return (root - 12, *self.m_u.notes_in_mask(root, root + 11, chord_mask))
+
     def adjust_interval_frequency(self):
         """Nothing for most exercises"""
 
+    def output_interval_frequency(self):
+        """Nothing for most exercises"""
+
+    def update_interval_frequency(self, interval):
+        """Nothing for most exercises"""
+
     def build_trial_set(self, legal_notes_list):
         """Build out the individual trials for the set"""
 
         # Our return list
         trial_set = []
 
-        # Our cycling iterator for legal notes.
-        legal_notes_cycle = itertools.cycle(legal_notes_list)
-        legal_notes = next(legal_notes_cycle)
+        # Our cycling iterator for the legal notes' transition graphs.
+        graph_cycle = itertools.cycle([
+            get_transition_graph(tuple(legal_notes), self.max_interval, self.trial_range)
+            for legal_notes in legal_notes_list])
 
         # Someplace to hold the note from a previous trial, if we're doing that.
         last_note_previous_trial = -1
-        first_trial = True
+        remember_note = self.get_remember_note_of_previous_trial_set()
 
         # Iterate through all the trials we are building
-        for _ in range(self.trials_count):
-
-            # Temp list for the trial
-            trial = []
-
-            # Some placeholders to help us test note selection legality
-            note = -1
-            last_note = last_note_previous_trial
-            high_note = -1
-            low_note = 1000
-            first_note_in_set = True
-
-            for _ in range(self.trial_size):
-
-                legit_note = False
-                while not legit_note:
-
-                    # Pick a note
-                    note = random.choice(legal_notes)
-
-                    # Was it legit?
-                    if first_note_in_set:
-                        if self.get_remember_note_of_previous_trial_set():
-                            if not (first_trial) and abs(note-last_note) > self.max_interval:
-                                # The interval between this note and
-                                # the last note of the previous trial is too large
-                                continue
-                        first_note_in_set = False
-                        legit_note = True
-                    elif abs(note-last_note) > self.max_interval:
-                        # The interval between notes is too large
-                        continue
-                    elif abs(note-high_note) > self.trial_range:
-                        # Too far below highest note
-                        continue
-                    elif abs(note-low_note) > self.trial_range:
-                        # Too far below lowest note
-                        continue
-                    else:
-                        legit_note = True
-
-                # Add it to the trial
+        for trial_index in range(self.trials_count):
+
+            # Change the legal notes for each trial
+            graph = next(graph_cycle)
+            notes = graph.notes
+
+            # The first note can be any of them, unless it has to follow on from the last
+            # trial.  Should that be out of reach of every note, start over.
+            start, end = 0, len(notes)
+            if remember_note and trial_index > 0:
+                start = graph.get_first_index(last_note_previous_trial - self.max_interval)
+                end = graph.get_first_index(last_note_previous_trial + self.max_interval + 1)
+                if start >= end:
+                    start, end = 0, len(notes)
+
+            # Pick it
+            index = random.randrange(start, end)
+            trial = [notes[index]]
+
+            # The run of notes within trial_range of the highest and lowest so far.
+            #  - it only moves when there's a new highest or lowest note.
+            high_note = low_note = notes[index]
+            range_start = graph.range_starts[index]
+            range_end = graph.range_ends[index]
+
+            for _ in range(self.trial_size - 1):
+
+                # Within max_interval of the last note, and in that run.  Never empty, the
+                # last note itself always qualifies.
+                start, end = graph.successors[index]
+                if start < range_start:
+                    start = range_start
+                if end > range_end:
+                    end = range_end
+
+                # Pick a note, and add it to the trial
+                index = random.randrange(start, end)
+                note = notes[index]
                 trial.append(note)
 
-                # Remember this note
-                last_note = note
-
-                # Is this the highest note in the set?
+                # Is this the highest or lowest note in the trial?
                 if note > high_note:
                     high_note = note
-
-                # Is this the lowest note in the set?
-                if note < low_note:
+                    range_start = graph.range_starts[index]
+                elif note < low_note:
                     low_note = note
+                    range_end = graph.range_ends[index]
 
-            # Save the trial.
+            # Save the trial, and remember its last note for the next one.
             trial_set.append(trial)
-
-            # No longer the first trial
-            first_trial = False
-
-            # Change the legal notes for the next trial
-            legal_notes = next(legal_notes_cycle)
-
-            # Should we remember the last note of this trial_set for the next one.
-            if self.get_remember_note_of_previous_trial_set():
-                last_note_previous_trial = last_note
+            last_note_previous_trial = trial[-1]
 
         return trial_set
 
-    def do_exercise(self):
-        """Run the  exercise"""
+    def build_package(self, trials_sets_count=None, element=None) -> ExercisePackage:
+        """Build the trial sets for a run of the exercise
 
-        # Let us know what the exercise is.
-        self.output_exercise_title()
+        element, if given, is what the first trial set practices (i.e. the scheduler's pick).
+        Exercises that don't practice individual elements ignore it.
+        """
+
+        if trials_sets_count is None:
+            trials_sets_count = self.trials_sets_count
 
         # Adjust frequency of intervals (if necessary for specific exercise)
         self.adjust_interval_frequency()
 
+        # A new package every time, so one can be built while another plays.
+        package = self.e_p.new_package()
+        package.set_test_name(self.name)
+
         # Iterate across the trial_sets
-        self.e_p.reset()
-        self.e_p.set_test_name(self.name)
-        for trial_set in range(0, self.trials_sets_count):
+        self.practice_interval_focus = element
+        for _ in range(0, trials_sets_count):
+            package.append_trial_set(*self.build_trial_set_parts())
+        self.practice_interval_focus = None
+
+        return package
 
-            # Get the key_center and intervalic list.
-            #   - Needed to identify the range when positionally determined.
-            key_center, intervalic_list = self.get_key_intervalic()
+    def build_trial_set_parts(self):
+        """A trial set, its definition, label and drone notes"""
 
-            # Get the trial set range
-            low_note, high_note = self.get_trial_set_range(
-                key_center, intervalic_list)
+        # Get the key_center and intervalic list.
+        #   - Needed to identify the range when positionally determined.
+        key_center, intervalic_list = self.get_key_intervalic()
 
-            # Now the legal notes in that trial set range.
-            legal_notes_lists = self.m_u.build_note_list(
-                low_note, high_note, intervalic_list, key_center)
+        # Get the trial set range
+        low_note, high_note = self.get_trial_set_range(
+            key_center, intervalic_list)
 
-            # Build the trial set and definition, based on the above.
-            trial_set = self.build_trial_set(legal_notes_lists)
-            trial_definition = self.build_trial_definition(
-                low_note, key_center, intervalic_list)
+        # Now the legal notes in that trial set range.
+        legal_notes_lists = self.get_legal_notes(
+            low_note, high_note, intervalic_list, key_center)
 
-            # Add it to the player trial sets, definitions, and label
-            self.e_p.append_trial_set(
-                trial_set, trial_definition, self.practice_interval_current)
+        # Build the trial set and definition, based on the above.
+        trial_set = self.build_trial_set(legal_notes_lists)
+        trial_definition = self.build_trial_definition(
+            low_note, key_center, intervalic_list)
+
+        return trial_set, trial_definition, self.practice_interval_current, \
+            self.build_drone_notes(key_center, intervalic_list)
+
+    def redraw_trial_set(self, package: ExercisePackage, index):
+        """Nothing for most exercises, their trial sets don't depend on the scores"""
+
+    def play_package(self, package: ExercisePackage, duration):
+        """Play a built package.  Returns the (label, score) of each trial set scored."""
+
+        # Helper Inner Functions
+        def record_score(label, score):
+            # Re-weight as the scores come in, and draw the next set with the new weights.
+            scores.append((label, score))
+            self.update_interval_frequency(label)
+            self.redraw_trial_set(package, package.get_next_index())
+
+        # Let us know what the exercise is.
+        self.output_exercise_title()
+        self.output_interval_frequency()
 
         # Let's Play
-        self.player.play(self.e_p, self.sb, self.exercise_duration)
+        scores = []
+        self.player.play(package, self.sb, duration, record_score)
 
         # If we're keeping score, let's save and print it out.
-        if self.e_p.get_scoring_enabled():
+        if package.get_scoring_enabled():
             self.sb.save()
             self.sb.output_scores(self.name, self.candidate_intervals)
             any_key_press("Press Any Key")
 
-    def do_singleton(self, duration):
-        """Do a single trial set of the exercise"""
+        return scores
 
-        # Save old values
-        old_exercise_duration = self.exercise_duration
-        old_trials_sets_count = self.trials_sets_count
+    def do_exercise(self):
+        """Run the  exercise"""
 
-        # Set singleton values
-        self.exercise_duration = duration
-        self.trials_sets_count = 1
+        self.play_package(self.build_package(), self.exercise_duration)
 
-        # Run the singleton
-        self.do_exercise()
+    def do_singleton(self, duration):
+        """Do a single trial set of the exercise"""
 
-        # Reset
-        self.exercise_duration = old_exercise_duration
-        self.trials_sets_count = old_trials_sets_count
+        self.play_package(self.build_package(1), duration)
 
     def output_exercise_title(self):
         """Visual for exercise"""
@@ -280,53 +396,27 @@ class Exercise(ABC):
 class OneString(Exercise):
     """Play single random notes on a single string"""
 
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "One String Exercise"
-        mixable = True
-        exercise_duration = 300     # 5 Minutes
-        trials_sets_count = 10
-        trials_count = 50
-        trial_size = 1
-        max_interval = 22  # The whole string
-        trial_range = 22   # The whole string
-        key_centers = ['C', 'F', 'G', 'A', 'E', 'B']
-        intervalics = ['Ionian', "Major Pentatonic", "Minor Pentatonic", 'Major', 'Minor',
-                       'Major Seventh', 'Dominant Seventh', 'Minor Seventh', 'Dorian', 'Lydian',
-                       'Mixolydian', 'Super Locrian']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.MEDIUM,           # post trial pause
-            PauseDuration.NOT_APPLICABLE,   # mid interval pause
-            PauseDuration.NOT_APPLICABLE,   # trial repeat & duration
-            False                           # mid trial prompt enabled
-        )
-
-        # Pass these to the parent class
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size, max_interval, trial_range,
-                         key_centers, intervalics, trial_varied_intervalics)
+    def get_trial_set_ranges(self, key_center, intervalic):
+        """One range for each string"""
 
-    def get_trial_set_range(self, key_center, intervalic):
-        """Define the Trial Set Range"""
+        ranges = []
 
-        # Pick the string for the trial set.
-        #  - String numbering is backwards (low E string is 0, high e is 5)
-        guitar_string = random.randrange(0, 6)
+        # String numbering is backwards (low E string is 0, high e is 5)
+        for guitar_string in range(0, 6):
 
-        # Determine the Trial Set Range.
-        #  - the midi note values for the high and low notes on the chosen string.
-        b_e_string_corrector = 0
-        if guitar_string > 3:   # did we pick the b or e string?
-            b_e_string_corrector = 1
-        low_note = self.low_estring_low_note + \
-            (guitar_string * 5) - b_e_string_corrector
-        high_note = self.low_estring_high_note + \
-            (guitar_string * 5) - b_e_string_corrector
+            # Determine the Trial Set Range.
+            #  - the midi note values for the high and low notes on the string.
+            b_e_string_corrector = 0
+            if guitar_string > 3:   # is it the b or e string?
+                b_e_string_corrector = 1
+            low_note = self.low_estring_low_note + \
+                (guitar_string * 5) - b_e_string_corrector
+            high_note = self.low_estring_high_note + \
+                (guitar_string * 5) - b_e_string_corrector
 
-        return low_note, high_note
+            ranges.append((low_note, high_note))
+
+        return ranges
 
     def build_trial_definition(self, low_note, key_center, intervalic_list):
         """Build the definition string for the trial set"""
@@ -349,24 +439,20 @@ class OneString(Exercise):
         return definition
 
 
-class OneOctaveBase(Exercise):
-    """Base class for one octave exercises."""
+class OneOctave(Exercise):
+    """Play random notes, within a single octave"""
 
-    def get_trial_set_range(self, key_center, intervalic):
-        """Chose a specific octave for testing"""
+    def get_trial_set_ranges(self, key_center, intervalic):
+        """An octave up from each legal note"""
 
         # Find all the legal notes for the lowest note in our range
         #  - lowest note in the range can't be be within an octave of the highest note
-        legal_low_notes = self.m_u.build_note_list(
+        legal_low_notes = self.get_legal_notes(
             self.low_estring_low_note, self.high_estring_high_note - 12, intervalic, key_center)
 
-        # Pick one of them
-        #   Legal_low_notes is now a list of lists, but there should only be
-        #   one list in this exercise.
-        low_note = random.choice(legal_low_notes[0])
-        high_note = low_note + 12   # one octave higher
-
-        return low_note, high_note
+        # Legal_low_notes is a list of lists, but there should only be
+        # one list in this exercise.
+        return [(low_note, low_note + 12) for low_note in legal_low_notes[0]]
 
     def build_trial_definition(self, low_note, key_center, intervalic_list):
         """Build our definition string for the chosen trial set"""
@@ -392,113 +478,16 @@ class OneOctaveBase(Exercise):
         return definition
 
 
-class OneOctaveEasy(OneOctaveBase):
-    """Play random notes, within a single octave"""
-
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Single Octave Exercise (Simple)"
-        mixable = True
-        exercise_duration = 300     # 5 minutes, in seconds
-        trials_sets_count = 20
-        trials_count = 50
-        trial_size = 1
-        max_interval = 12   # 1 octave
-        trial_range = 12    # 1 octave
-
-        key_centers = ['C', 'G', 'F', 'A', 'B', 'D', 'E']
-        intervalics = ['Major', 'Minor', 'Major Seventh', 'Dominant Seventh',
-                       'Minor Seventh', 'Major Pentatonic', 'Minor Pentatonic']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.SHORT,            # post trial pause
-            PauseDuration.NOT_APPLICABLE,   # interval pause
-            PauseDuration.NOT_APPLICABLE,   # trial repeat & duration
-            False                           # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-
-class OneOctaveMedium(OneOctaveBase):
-    """Play random notes, within a single octave"""
-
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Single Octave Exercise (On-Level)"
-        mixable = True
-        exercise_duration = 600     # 10 minutes, in seconds
-        trials_sets_count = 20
-        trials_count = 50
-        trial_size = 1
-        max_interval = 12   # 1 octave
-        trial_range = 12    # 1 octave
-
-        key_centers = ['C', 'G', 'F', 'A', 'B', 'D', 'E']
-        intervalics = ['Ionian', 'Aeolian', 'Dorian', 'Mixolydian']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.MEDIUM,
-            PauseDuration.NOT_APPLICABLE,   # mid interval pause
-            PauseDuration.NOT_APPLICABLE,   # trial repeat & duration
-            False                           # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-
-class OneOctaveHard(OneOctaveBase):
-    """Play random notes, within a single octave"""
-
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Single Octave Exercise (Advanced)"
-        mixable = False
-        exercise_duration = 600     # 10 minutes, in seconds
-        trials_sets_count = 20
-        trials_count = 50
-        trial_size = 1
-        max_interval = 12   # 1 octave
-        trial_range = 12    # 1 octave
-
-        key_centers = ['C', 'G', 'F', 'A', 'B', 'D', 'E']
-        intervalics = ['Super Locrian', 'Lydian Dominant']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.LONG,
-            PauseDuration.NOT_APPLICABLE,   # mid interval pause
-            PauseDuration.NOT_APPLICABLE,    # trial repeat & duration
-            False                           # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-
 class OnePositionBase(Exercise):
     """A base class for single position exercises"""
 
-    def get_trial_set_range(self, key_center, intervalic):
-        """Determine the position we'll be playing in and the range of pitches available"""
+    def get_trial_set_ranges(self, key_center, intervalic):
+        """The positions we could play in and the range of pitches available in each"""
 
         # Find the legal notes on the low estring for the key_center and intervalic
         #  - midi note values, natch
         #  - lowest note in the range cannot be above the 19th fret
-        legal_low_notes_list = self.m_u.build_note_list(
+        legal_low_notes_list = self.get_legal_notes(
             self.low_estring_low_note, self.low_estring_high_note - 3, intervalic, key_center)
 
         # First, we need a single list.
@@ -508,16 +497,13 @@ class OnePositionBase(Exercise):
                 legal_low_notes.append(note)
 
         # Now remove the dupicates
-        legal_low_notes_sans_dupes = list(set(legal_low_notes))
+        legal_low_notes_sans_dupes = sorted(set(legal_low_notes))
 
-        # Pick one of them
-        low_note = random.choice(legal_low_notes_sans_dupes)
-        high_note = low_note + 27  # up 2 octaves and a minor 3rd
+        # Up 2 octaves and a minor 3rd from each of them
+        return [(low_note, low_note + 27) for low_note in legal_low_notes_sans_dupes]
 
-        return low_note, high_note
 
-
-class OnePositionEMH(OnePositionBase):
+class OnePosition(OnePositionBase):
     """Play random notes, but in a specific position"""
 
     def build_trial_definition(self, low_note, key_center, intervalic_list):
@@ -538,135 +524,9 @@ class OnePositionEMH(OnePositionBase):
         return definition
 
 
-class OnePositionEasy(OnePositionEMH):
-    """Easy single position exercise"""
-
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Single Position Exercise (Simple)"
-        mixable = True
-        exercise_duration = 600     # 10 minutes, in seconds
-        trials_sets_count = 10
-        trials_count = 10
-        trial_size = 3
-        max_interval = 11  # 1 octave (-1)
-        trial_range = 19   # 1 octave + perfect 5th
-
-        key_centers = ['C', 'F', 'G', 'A', 'B', 'D']
-        intervalics = ['Major', 'Minor', 'Major Seventh', 'Minor Seventh',
-                       'Dominant Seventh', 'Major Pentatonic', 'Minor Pentatonic']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.MEDIUM,
-            PauseDuration.NOT_APPLICABLE,    # mid interval pause
-            PauseDuration.MEDIUM,           # trial repeat & duration
-            False                           # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-
-class OnePositionMedium(OnePositionEMH):
-    """Medium single position exercise"""
-
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Single Position Exercise (On-Level)"
-        mixable = True
-        exercise_duration = 600     # 10 minutes, in seconds
-        trials_sets_count = 10
-        trials_count = 10
-        trial_size = 5
-        max_interval = 11  # 1 octave (-1)
-        trial_range = 19   # 1 octave + perfect 5th
-
-        key_centers = ['C', 'F', 'G', 'A', 'B', 'D']
-        intervalics = ['Ionian', 'Aeolian', 'Mixolydian', 'Dorian']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.MEDIUM,
-            PauseDuration.NOT_APPLICABLE,   # mid interval pause
-            PauseDuration.MEDIUM,           # trial repeat & duration
-            True                            # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-
-class OnePositionHard(OnePositionEMH):
-    """Hard single position exercise"""
-
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Single Position Exercise (Advanced)"
-        mixable = False
-        exercise_duration = 600     # 10 minutes, in seconds
-        trials_sets_count = 10
-        trials_count = 10
-        trial_size = 5
-        max_interval = 11  # 1 octave (-1)
-        trial_range = 19   # 1 octave + perfect 5th
-
-        key_centers = ['C', 'F', 'G', 'A', 'B', 'D']
-        intervalics = ['Melodic Minor', 'Harmonic Minor',
-                       'Super Locrian', 'Lydian Dominant']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.MEDIUM,
-            PauseDuration.NOT_APPLICABLE,   # mid interval pause
-            PauseDuration.MEDIUM,           # trial repeat & duration
-            True                            # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-
 class ChordTones(OnePositionBase):
     """Play random notes, with each trial choosing from chord tones"""
 
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Chord Tones Exercise"
-        mixable = True
-        exercise_duration = 600     # 10 minutes, in seconds
-        trials_sets_count = 10
-        trials_count = 10
-        trial_size = 5
-        max_interval = 12   # 1 octave
-        trial_range = 12    # 1 octave
-
-        key_centers = ['C', 'A', 'E', 'B', 'G']
-        intervalics = ["ii7", "V7", "IMaj7"]
-        trial_varied_intervalics = True
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.MEDIUM,
-            PauseDuration.NOT_APPLICABLE,    # mid interval pause
-            PauseDuration.MEDIUM,            # trial repeat & duration
-            True                             # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
     def build_trial_definition(self, low_note, key_center, intervalic_list):
         """Build the definition string for the trial set"""
 
@@ -685,7 +545,7 @@ class ChordTones(OnePositionBase):
         return definition
 
 
-class AudiationBase(OnePositionBase):
+class Audiation(OnePositionBase):
     """Straight up chromatics"""
 
     def build_trial_definition(self, low_note, key_center, intervalic_list):
@@ -702,125 +562,24 @@ class AudiationBase(OnePositionBase):
 
         return definition
 
-    def get_trial_set_range(self, key_center, intervalic):
-        """Define the Trial Set Range"""
+    def get_trial_set_ranges(self, key_center, intervalic):
+        """Define the Trial Set Ranges"""
 
         # Notes from the first 12 frets.
-        estring_fret_start = random.randrange(0, 9)
-        low_note = self.low_estring_low_note + estring_fret_start
-        # Range is 2 octaves + minor 3rd
-        high_note = low_note + 27
-
-        return low_note, high_note
-
-
-class AudiationEasy(AudiationBase):
-    """Chromatics only."""
-
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Chromatic Audiation Exercise (Easy)"
-        mixable = False
-        exercise_duration = 300     # 10 minutes, in seconds
-        trials_sets_count = 10
-        trials_count = 10
-        trial_size = 4
-        max_interval = 12   # 1 octave
-        trial_range = 12    # 1 octave
-
-        key_centers = ['C']
-        intervalics = ['Chromatic']
-        trial_varied_intervalics = True
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.MEDIUM,
-            PauseDuration.NOT_APPLICABLE,    # mid interval pause
-            PauseDuration.NOT_APPLICABLE,    # trial repeat & duration
-            True                             # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-
-class AudiationHard(AudiationBase):
-    """Chromatics only."""
-
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions (from parent)
-        name = "Chromatic Audiation Exercise (Hard)"
-        mixable = False
-        exercise_duration = 300     # 10 minutes, in seconds
-        trials_sets_count = 10
-        trials_count = 10
-        trial_size = 5
-        max_interval = 12   # 1 octave
-        trial_range = 12    # 1 octave
-
-        key_centers = ['C']
-        intervalics = ['Chromatic']
-        trial_varied_intervalics = True
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.MEDIUM,
-            PauseDuration.NOT_APPLICABLE,   # mid interval pause
-            PauseDuration.NOT_APPLICABLE,   # trial repeat & duration
-            False                           # mid trial prompt enabled
-        )
-
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
+        #  - range is 2 octaves + minor 3rd
+        return [(self.low_estring_low_note + estring_fret_start,
+                 self.low_estring_low_note + estring_fret_start + 27)
+                for estring_fret_start in range(0, 9)]
 
 
 class JustTheIntervals(Exercise):
     """Play single notes, one after the other, an octave or less apart"""
 
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions
-        name = "Full Neck Sub-Octave Intervals"
-        mixable = False
-        exercise_duration = 300     # 10 minutes, in seconds
-        trials_sets_count = 1
-        trials_count = 100
-        trial_size = 1
-        max_interval = 12   # 1 octave
-        trial_range = 46    # Full Neck
-
-        key_centers = ['C']
-        intervalics = ['Chromatic']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.SERIES,
-            PauseDuration.LONG,
-            PauseDuration.NOT_APPLICABLE,   # mid interval pause
-            PauseDuration.NOT_APPLICABLE,   # trial repeat & duration
-            False                           # mid trial prompt enabled
-        )
-
-        # Pass these to the parent class
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-        # Remember across trial_sets
-        self.remember_note_of_previous_trial_set = True
-
-    def get_trial_set_range(self, key_center, intervalic):
+    def get_trial_set_ranges(self, key_center, intervalic):
         """Define the Trial Set Range"""
 
         # All the notes
-        low_note = self.low_estring_low_note
-        high_note = self.high_estring_high_note
-
-        return low_note, high_note
+        return [(self.low_estring_low_note, self.high_estring_high_note)]
 
     def build_trial_definition(self, low_note, key_center, intervalic_list):
         """Build the definition string for the trial set"""
@@ -834,40 +593,42 @@ class SingTheIntervals(Exercise):
     def adjust_interval_frequency(self):
         """Use scoreboard to adjust the frequency of the intervals under examination"""
 
-        # Clear the existing list
-        self.practice_intervals.clear()
+        # Start over with the current candidates
+        self.interval_sampler = WeightedSampler()
+        for interval in self.candidate_intervals:
+            self.update_interval_frequency(interval)
+
+    def output_interval_frequency(self):
+        """Show how often each interval is practiced"""
 
-        score_dictionary = {}
         for interval in self.candidate_intervals:
-            prefix = self.sb.get_test_prefix(self.name, interval)
-            score_dictionary[interval] = self.sb.get_adjusted_element_score(
-                prefix)
+            interval_freq = round(100*self.interval_sampler.get_probability(interval))
+            print(f"{interval} : {interval_freq}")
 
-        min_score = min(score_dictionary.values())
-        max_score = max(score_dictionary.values())
+    def update_interval_frequency(self, interval):
+        """Re-weight a single interval from its latest score"""
 
-        # The numerator needs +1 in case min == max
-        score_numer = max_score - min_score + 1
+        # Practice frequency is inversely proportional to the adjusted score.
+        prefix = self.sb.get_test_prefix(self.name, interval)
+        self.interval_sampler.set_weight(
+            interval, 1 / self.sb.get_adjusted_element_score(prefix))
 
-        score_recips = {}
-        for interval in self.candidate_intervals:
-            score_recips[interval] = score_numer / score_dictionary[interval]
+    def redraw_trial_set(self, package: ExercisePackage, index):
+        """Draw an unplayed set's interval again, from the weights as they are now"""
 
-        recips_sum = sum(score_recips.values())
-        for interval in self.candidate_intervals:
-            interval_freq = round(100*score_recips[interval]/recips_sum)
-            print(f"{interval} : {interval_freq}")
-            for _ in range(0, interval_freq):
-                self.practice_intervals.append(interval)
+        if index >= len(package):
+            return      # They've all been played
 
-    def get_trial_set_range(self, key_center, intervalic):
+        # No dupes of the set before it
+        self.practice_interval_current = package.trial_set_label[index - 1] if index > 0 else ''
+        package.replace_trial_set(index, *self.build_trial_set_parts())
+
+    def get_trial_set_ranges(self, key_center, intervalic):
         """Define the Trial Set Range"""
 
         # Notes from the first 12 frets.
-        low_note = self.low_estring_low_note
-        high_note = self.m_u.index(self.g_u.get_full_note_name(1, 12))
-
-        return low_note, high_note
+        return [(self.low_estring_low_note,
+                 self.m_u.index(self.g_u.get_full_note_name(1, 12)))]
 
     def build_trial_definition(self, low_note, key_center, intervalic_list):
         """Build the definition string for the trial set"""
@@ -884,10 +645,12 @@ class SingTheIntervals(Exercise):
         # Our list of legal starting notes
         legal_notes = []
 
-        # Choose the interval
-        current_interval = self.practice_interval_current
-        while self.practice_interval_current == current_interval:  # no dupes
-            current_interval = random.choice(self.practice_intervals)
+        # Choose the interval (unless it's been chosen for us), no dupes
+        current_interval = self.practice_interval_focus
+        self.practice_interval_focus = None
+        if current_interval not in self.interval_sampler:
+            current_interval = self.interval_sampler.sample(
+                exclude=self.practice_interval_current)
 
         self.practice_interval_current = current_interval
         interval = self.m_u.get_semitone_count_for_interval(current_interval)
@@ -928,135 +691,61 @@ class SingTheIntervals(Exercise):
         return trial_set
 
 
-class SingTheIntervalsEasy(SingTheIntervals):
-    """Each set is practice for singling a specific interval above/below a random base note"""
+class RhythmicDictation(OneOctave):
+    """Melodies within an octave, each with its own rhythm, to be played back"""
 
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions
-        name = "Singing the Easy Intervals"
-        mixable = False
-        exercise_duration = 300     # 5 minutes, in seconds
-        trials_sets_count = 50
-        trials_count = 2
-        # Noted here for documentation purposes, but not functional in this exercise.
-        # (It's hard coded elsewhere to be 2 notes: the start note and the note 1 interval away.)
-        trial_size = 2
-        max_interval = 12   # 1 octave
-        trial_range = 46    # Full Neck
-
-        key_centers = ['C']
-        intervalics = ['Chromatic']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.INTERVAL,
-            PauseDuration.SHORT,
-            PauseDuration.SHORT,
-            PauseDuration.SHORT,           # Interval pause
-            False,                          # mid trial prompt enabled
-            True                            # keep score
-        )
-
-        # Pass these to the parent class
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-        self.candidate_intervals = ['m2', '-m2',
-                                    'M2', '-M2',
-                                    'm3',
-                                    'M3', '-M3',
-                                    'P4', '-P4'
-                                    ]
-        self.practice_intervals = []
-        self.practice_interval_current = ''
+    def build_trial_set(self, legal_notes_list):
+        """The trials' notes, as usual, but as note events with a rhythm"""
 
+        return [build_note_events(trial, self.spec.rhythm_cells)
+                for trial in super().build_trial_set(legal_notes_list)]
 
-class SingTheIntervalsMedium(SingTheIntervals):
-    """Each set is practice for singling a specific interval above/below a random base note"""
+    def build_trial_definition(self, low_note, key_center, intervalic_list):
+        """Build our definition string for the chosen trial set"""
 
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions
-        name = "Singing the Medium Intervals"
-        mixable = False
-        exercise_duration = 600     # 10 minutes, in seconds
-        trials_sets_count = 50
-        trials_count = 3
-        # Noted here for documentation purposes, but not functional in this exercise.
-        # (It's hard coded elsewhere to be 2 notes: the start note and the note 1 interval away.)
-        trial_size = 2
-        max_interval = 12   # 1 octave
-        trial_range = 46    # Full Neck
-
-        key_centers = ['C']
-        intervalics = ['Chromatic']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.INTERVAL,
-            PauseDuration.MEDIUM,
-            PauseDuration.MEDIUM,
-            PauseDuration.SHORT,           # trial repeat & duration
-            False,                          # mid trial prompt not enabled
-            True                            # keep score
-        )
-
-        # Pass these to the parent class
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-        self.candidate_intervals = ['-m3',
-                                    'P5', '-P5',
-                                    'M6', '-M6',
-                                    'm7'
-                                    ]
-        self.practice_intervals = []
-        self.practice_interval_current = ''
+        definition = super().build_trial_definition(low_note, key_center, intervalic_list)
+        definition += "\nRhythms: " + ", ".join(self.spec.rhythm_cells)
 
+        return definition
 
-class SingTheIntervalsHard(SingTheIntervals):
-    """Each set is practice for singling a specific interval above/below a random base note"""
 
-    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
-
-        # Definitions
-        name = "Singing the Hard Intervals"
-        mixable = False
-        exercise_duration = 600     # 10 minutes, in seconds
-        trials_sets_count = 20
-        trials_count = 5
-        # Noted here for documentation purposes, but not functional in this exercise.
-        # (It's hard coded elsewhere to be 2 notes: the start note and the note 1 interval away.)
-        trial_size = 2
-        max_interval = 12   # 1 octave
-        trial_range = 46    # Full Neck
-
-        key_centers = ['C']
-        intervalics = ['Chromatic']
-        trial_varied_intervalics = False
-        e_p = ExercisePackage(
-            ExerciseType.INTERVAL,
-            PauseDuration.MEDIUM,
-            PauseDuration.MEDIUM,
-            PauseDuration.MEDIUM,           # trial repeat & duration
-            True,                           # mid trial prompt enabled
-            True                            # keep score
-        )
-
-        # Pass these to the parent class
-        super().__init__(player, scoreboard, name, e_p, mixable, exercise_duration,
-                         trials_sets_count, trials_count, trial_size,
-                         max_interval, trial_range, key_centers,
-                         intervalics, trial_varied_intervalics)
-
-        self.candidate_intervals = [
-            'm6', '-m6',
-            '-m7',
-            'M7', '-M7',
-            'Aug4', '-Aug4'
-        ]
-        self.practice_intervals = []
-        self.practice_interval_current = ''
+class MelodicDictation(OnePosition):
+    """Long melodies in a single position, to be heard and played back"""
+
+    def build_trial_definition(self, low_note, key_center, intervalic_list):
+        """Build the definition string for the trial set"""
+
+        definition = f"Melody: {self.trial_size} notes\n"
+        definition += super().build_trial_definition(low_note, key_center, intervalic_list)
+
+        return definition
+
+
+# The class for each kind of exercise in the definitions file
+EXERCISE_CLASSES = {
+    'OneString': OneString,
+    'OneOctave': OneOctave,
+    'OnePosition': OnePosition,
+    'ChordTones': ChordTones,
+    'Audiation': Audiation,
+    'JustTheIntervals': JustTheIntervals,
+    'SingTheIntervals': SingTheIntervals,
+    'RhythmicDictation': RhythmicDictation,
+    'MelodicDictation': MelodicDictation
+}
+
+
+def build_seeded_package(spec: ExerciseSpec, seed, trials_sets_count=None) -> ExercisePackage:
+    """The package a seed always builds, i.e. for takes recorded away from the application
+
+    Built on a fresh scoreboard, so interval weights start out even.  The random module's
+    state is put back afterwards.
+    """
+
+    state = random.getstate()
+    try:
+        random.seed(seed)
+        exercise = EXERCISE_CLASSES[spec.kind](None, Scoreboard(), spec)
+        return exercise.build_package(trials_sets_count)
+    finally:
+        random.setstate(state)
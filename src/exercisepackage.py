@@ -8,6 +8,7 @@ class ExerciseType(Enum):
 
     SERIES = 1
     INTERVAL = 2
+    RHYTHM = 3      # A series, but every note has its own onset, duration and velocity
 
     @classmethod
     def validate(cls, test_value):
@@ -33,6 +34,21 @@ class PauseDuration(float, Enum):
             raise IndexError
 
 
+class DroneType(Enum):
+    """Enumerated types for what sustains under the trials"""
+
+    NONE = 0
+    TONIC = 1
+    CHORD = 2
+
+    @classmethod
+    def validate(cls, test_value):
+        """Is this value one of the enumerated options"""
+
+        if not test_value in cls:
+            raise IndexError
+
+
 class ExercisePackage:
     """Container for exercise content needed by the player"""
 
@@ -42,7 +58,8 @@ class ExercisePackage:
                  interval_pause: PauseDuration,
                  trial_repeat_pause: PauseDuration,
                  mid_trial_prompt_enabled: bool,
-                 scoring_enabled: bool = False) -> None:
+                 scoring_enabled: bool = False,
+                 drone: DroneType = DroneType.NONE) -> None:
 
         # Exercise Type
         ExerciseType.validate(exercise_type)
@@ -59,7 +76,7 @@ class ExercisePackage:
         if (exercise_type == ExerciseType.INTERVAL
                 and interval_pause == PauseDuration.NOT_APPLICABLE):
             raise ValueError
-        elif (exercise_type == ExerciseType.SERIES
+        elif (exercise_type in (ExerciseType.SERIES, ExerciseType.RHYTHM)
                 and interval_pause != PauseDuration.NOT_APPLICABLE):
             raise ValueError
         self.interval_pause = interval_pause
@@ -77,6 +94,10 @@ class ExercisePackage:
         # Are we keeping score
         self.scoring_enabled = scoring_enabled
 
+        # Is there a drone under the trials
+        DroneType.validate(drone)
+        self.drone = drone
+
         # The name of the test this package is representing
         self.trial_test_name = ""
 
@@ -84,10 +105,18 @@ class ExercisePackage:
         self.trial_sets = []
         self.trial_set_definitions = []
         self.trial_set_label = []
+        self.trial_set_drone_notes = []
 
         # For iteration
         self.index = 0
 
+    def new_package(self):
+        """A new, empty package with the same settings"""
+
+        return ExercisePackage(self.exercise_type, self.post_trial_pause, self.interval_pause,
+                               self.trial_repeat_pause, self.mid_trial_prompt_enabled,
+                               self.scoring_enabled, self.drone)
+
     def reset(self):
         """Clear everything so we can build a new package"""
 
@@ -98,6 +127,7 @@ class ExercisePackage:
         self.trial_sets.clear()
         self.trial_set_definitions.clear()
         self.trial_set_label.clear()
+        self.trial_set_drone_notes.clear()
 
     def __iter__(self):
 
@@ -130,12 +160,31 @@ class ExercisePackage:
 
         return self.trial_test_name
 
-    def append_trial_set(self, trial_set, trial_definition, trial_label):
+    def append_trial_set(self, trial_set, trial_definition, trial_label, drone_notes=()):
         """Incoming set"""
 
         self.trial_sets.append(trial_set)
         self.trial_set_definitions.append(trial_definition)
         self.trial_set_label.append(trial_label)
+        self.trial_set_drone_notes.append(tuple(drone_notes))
+
+    def replace_trial_set(self, index, trial_set, trial_definition, trial_label, drone_notes=()):
+        """Swap in a new set for one that hasn't been played yet"""
+
+        self.trial_sets[index] = trial_set
+        self.trial_set_definitions[index] = trial_definition
+        self.trial_set_label[index] = trial_label
+        self.trial_set_drone_notes[index] = tuple(drone_notes)
+
+    def get_next_index(self):
+        """Index of the next set to be played"""
+
+        return self.index
+
+    def get_drone_notes(self, index):
+        """Notes to sustain under a trial set (none for no drone)"""
+
+        return self.trial_set_drone_notes[index]
 
     def get_exercise_type(self):
         """Get the exercise type"""
@@ -167,6 +216,11 @@ class ExercisePackage:
 
         return self.mid_trial_prompt_enabled
 
+    def get_drone(self):
+        """Get for the drone type"""
+
+        return self.drone
+
     def get_scoring_enabled(self):
         """Get for scoring functionality"""
 
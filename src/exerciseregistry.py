@@ -0,0 +1,81 @@
+"""Registry of exercises, built only when they're needed"""
+
+from src.exercise import EXERCISE_CLASSES
+from src.exercisespec import ExerciseSpec
+from src.player import Player
+from src.scoreboard import Scoreboard
+
+
+class ExerciseDescriptor:
+    """What the menu needs to know about an exercise, without building it"""
+
+    def __init__(self, name, mixable: bool, factory) -> None:
+
+        self.name = name
+        self.mixable = mixable
+
+        # Called as factory(player, scoreboard) to build the exercise
+        self.factory = factory
+
+    @classmethod
+    def from_spec(cls, spec: ExerciseSpec):
+        """Describe an exercise compiled from the definitions file"""
+
+        # Helper Inner Functions
+        def factory(player, scoreboard):
+            return EXERCISE_CLASSES[spec.kind](player, scoreboard, spec)
+
+        return cls(spec.name, spec.mixable, factory)
+
+    def __str__(self):
+        return self.name
+
+
+class ExerciseRegistry:
+    """Exercise descriptors, and the exercises built from them so far"""
+
+    def __init__(self, player: Player, scoreboard: Scoreboard) -> None:
+
+        self.player = player
+        self.scoreboard = scoreboard
+
+        self.descriptors = []
+        self.exercises = {}     # Built exercises, keyed by descriptor index
+
+    def __len__(self):
+        """Number of registered exercises"""
+
+        return len(self.descriptors)
+
+    def register(self, descriptor: ExerciseDescriptor):
+        """Add an exercise.  Returns its index."""
+
+        self.descriptors.append(descriptor)
+        return len(self.descriptors) - 1
+
+    def get_descriptor(self, index) -> ExerciseDescriptor:
+        """Descriptor of a registered exercise"""
+
+        return self.descriptors[index]
+
+    def get_mixable_indexes(self):
+        """Indexes of the exercises that go in the mixer"""
+
+        return [index for index, descriptor in enumerate(self.descriptors)
+                if descriptor.mixable]
+
+    def get(self, index):
+        """The exercise at index, built the first time it's asked for"""
+
+        if index not in self.exercises:
+            self.exercises[index] = self.descriptors[index].factory(
+                self.player, self.scoreboard)
+
+        return self.exercises[index]
+
+    def set_scoreboard(self, scoreboard: Scoreboard):
+        """Keep score on another scoreboard, built exercises included"""
+
+        self.scoreboard = scoreboard
+        for exercise in self.exercises.values():
+            exercise.set_scoreboard(scoreboard)
@@ -0,0 +1,259 @@
+"""Exercise definitions, loaded from data files and compiled into specs"""
+
+import hashlib
+import json
+import os
+import pickle
+from typing import NamedTuple
+
+from src.exercisepackage import DroneType, ExercisePackage, ExerciseType, PauseDuration
+from src.midiutilities import MidiUtil, MAX_MIDI_VALUE
+from src.noteevents import RHYTHM_CELLS
+from src.scoreboard import Scoreboard
+from src.scorehistory import ScoreHistory
+
+# The kinds of exercise a definition can be.  Each is an Exercise subclass of the same name.
+EXERCISE_KINDS = ('OneString', 'OneOctave', 'OnePosition', 'ChordTones', 'Audiation',
+                  'JustTheIntervals', 'SingTheIntervals', 'RhythmicDictation',
+                  'MelodicDictation')
+
+# The kinds whose trials are note events, played with the RHYTHM exercise type
+RHYTHMIC_KINDS = ('RhythmicDictation',)
+
+# Melodic dictation is for melodies, not a handful of notes (and not a whole tune).
+MELODY_TRIAL_SIZES = range(8, 33)
+
+# Bump whenever ExerciseSpec or the compile step changes, so old caches are ignored.
+SPEC_VERSION = 4
+
+# Compiled specs are cached in this directory, next to the definitions file.
+CACHE_DIRECTORY = '.exercise_cache'
+
+# Definition fields and their types.  Those with a default are optional.
+REQUIRED_FIELDS = {
+    'kind': str,
+    'name': str,
+    'mixable': bool,
+    'exercise_duration': int,
+    'trials_sets_count': int,
+    'trials_count': int,
+    'trial_size': int,
+    'max_interval': int,
+    'trial_range': int,
+    'key_centers': list,
+    'intervalics': list,
+    'trial_varied_intervalics': bool,
+    'exercise_type': str,
+    'post_trial_pause': str,
+    'interval_pause': str,
+    'trial_repeat_pause': str,
+    'mid_trial_prompt_enabled': bool
+}
+OPTIONAL_FIELDS = {
+    'scoring_enabled': (bool, False),
+    'candidate_intervals': (list, []),
+    'remember_note_of_previous_trial_set': (bool, False),
+    'drone': (str, 'NONE'),
+    'rhythm_cells': (list, [])      # Names from noteevents.RHYTHM_CELLS.  Empty for all.
+}
+
+
+class ExerciseSpec(NamedTuple):
+    """Everything needed to build an exercise, validated and precomputed"""
+
+    kind: str
+    name: str
+    mixable: bool
+    exercise_duration: int          # Seconds
+    trials_sets_count: int
+    trials_count: int
+    trial_size: int
+    max_interval: int
+    trial_range: int
+    key_centers: tuple
+    intervalics: tuple
+    trial_varied_intervalics: bool
+    exercise_type: ExerciseType
+    post_trial_pause: PauseDuration
+    interval_pause: PauseDuration
+    trial_repeat_pause: PauseDuration
+    mid_trial_prompt_enabled: bool
+    scoring_enabled: bool
+    candidate_intervals: tuple
+    remember_note_of_previous_trial_set: bool
+    drone: DroneType
+    rhythm_cells: tuple             # What rhythmic kinds build from (every cell, unless named)
+
+    # Every legal midi note for each key center and intervalic, across the whole midi range.
+    #  - legal_notes[key center index][intervalic index]
+    legal_notes: tuple
+
+    def get_legal_notes(self, key_center, intervalic):
+        """All the legal midi notes for the key center and intervalic"""
+
+        return self.legal_notes[self.key_centers.index(key_center)][
+            self.intervalics.index(intervalic)]
+
+
+def validate_definition(definition: dict, m_u: MidiUtil):
+    """Raise ValueError if the exercise definition isn't usable"""
+
+    name = definition.get('name', '<unnamed>')
+
+    for field, field_type in REQUIRED_FIELDS.items():
+        if field not in definition:
+            raise ValueError(f"{name}: missing '{field}'")
+    for field, value in definition.items():
+        if field in REQUIRED_FIELDS:
+            field_type = REQUIRED_FIELDS[field]
+        elif field in OPTIONAL_FIELDS:
+            field_type = OPTIONAL_FIELDS[field][0]
+        else:
+            raise ValueError(f"{name}: unknown field '{field}'")
+
+        # bool is an int, but we don't want True for a count.
+        if not isinstance(value, field_type) or \
+                (field_type is int and isinstance(value, bool)):
+            raise ValueError(f"{name}: '{field}' should be {field_type.__name__}")
+
+    if definition['kind'] not in EXERCISE_KINDS:
+        raise ValueError(f"{name}: unknown kind '{definition['kind']}'")
+
+    for field in ['exercise_duration', 'trials_sets_count', 'trials_count', 'trial_size',
+                  'max_interval', 'trial_range']:
+        if definition[field] < 1:
+            raise ValueError(f"{name}: '{field}' must be at least 1")
+
+    if definition['kind'] == 'MelodicDictation' and \
+            definition['trial_size'] not in MELODY_TRIAL_SIZES:
+        raise ValueError(f"{name}: melodies are {MELODY_TRIAL_SIZES.start} to "
+                         f"{MELODY_TRIAL_SIZES.stop - 1} notes")
+
+    if len(definition['key_centers']) == 0 or len(definition['intervalics']) == 0:
+        raise ValueError(f"{name}: needs key centers and intervalics")
+    for key_center in definition['key_centers']:
+        if key_center not in m_u.note_names:
+            raise ValueError(f"{name}: unknown key center '{key_center}'")
+    for intervalic in definition['intervalics']:
+        if intervalic not in m_u.interval_pattern:
+            raise ValueError(f"{name}: unknown intervalic '{intervalic}'")
+    if definition['kind'] == 'SingTheIntervals' and \
+            len(definition.get('candidate_intervals', [])) < 2:
+        raise ValueError(f"{name}: needs at least 2 candidate intervals")
+    for interval in definition.get('candidate_intervals', []):
+        if interval not in m_u.intervals:
+            raise ValueError(f"{name}: unknown interval '{interval}'")
+    for cell_name in definition.get('rhythm_cells', []):
+        if cell_name not in RHYTHM_CELLS:
+            raise ValueError(f"{name}: unknown rhythm cell '{cell_name}'")
+
+    # Score keys (name:element) have to fit in a history record.
+    for element in definition.get('candidate_intervals', []) or ['']:
+        score_key = definition['name'] + Scoreboard.SCORE_DELIMITER + element
+        if len(score_key.encode('utf-8')) > ScoreHistory.KEY_WIDTH:
+            raise ValueError(f"{name}: name too long for the score history ('{score_key}')")
+
+    if (definition['kind'] in RHYTHMIC_KINDS) != (definition['exercise_type'] == 'RHYTHM'):
+        raise ValueError(f"{name}: rhythmic kinds, and only them, use the RHYTHM type")
+
+    # The package does its own checking of the type/pause combinations.
+    try:
+        build_exercise_package(definition)
+    except (KeyError, IndexError, ValueError) as error:
+        raise ValueError(f"{name}: bad exercise type, pause or drone settings") from error
+
+
+def build_exercise_package(definition) -> ExercisePackage:
+    """Build the exercise package a definition (or spec) describes"""
+
+    if isinstance(definition, ExerciseSpec):
+        definition = definition._asdict()
+
+    def get_enum(enum_class, value):
+        return value if isinstance(value, enum_class) else enum_class[value]
+
+    return ExercisePackage(
+        get_enum(ExerciseType, definition['exercise_type']),
+        get_enum(PauseDuration, definition['post_trial_pause']),
+        get_enum(PauseDuration, definition['interval_pause']),
+        get_enum(PauseDuration, definition['trial_repeat_pause']),
+        definition['mid_trial_prompt_enabled'],
+        definition.get('scoring_enabled', False),
+        get_enum(DroneType, definition.get('drone', 'NONE')))
+
+
+def compile_definition(definition: dict, m_u: MidiUtil) -> ExerciseSpec:
+    """Validate a definition and compile it to a spec"""
+
+    validate_definition(definition, m_u)
+
+    fields = dict(definition)
+    for field, (_, default) in OPTIONAL_FIELDS.items():
+        fields.setdefault(field, default)
+
+    fields['key_centers'] = tuple(fields['key_centers'])
+    fields['intervalics'] = tuple(fields['intervalics'])
+    fields['candidate_intervals'] = tuple(fields['candidate_intervals'])
+    fields['exercise_type'] = ExerciseType[fields['exercise_type']]
+    for field in ['post_trial_pause', 'interval_pause', 'trial_repeat_pause']:
+        fields[field] = PauseDuration[fields[field]]
+    fields['drone'] = DroneType[fields['drone']]
+    fields['rhythm_cells'] = tuple(fields['rhythm_cells']) or tuple(RHYTHM_CELLS)
+
+    fields['legal_notes'] = tuple(
+        tuple(tuple(m_u.notes_in_mask(0, MAX_MIDI_VALUE,
+                                      m_u.get_pitch_class_mask(intervalic, key_center)))
+              for intervalic in fields['intervalics'])
+        for key_center in fields['key_centers'])
+
+    return ExerciseSpec(**fields)
+
+
+def compile_definitions(definitions_text) -> list:
+    """Compile the text of a definitions file into specs"""
+
+    m_u = MidiUtil()
+    definitions = json.loads(definitions_text)
+
+    specs = [compile_definition(definition, m_u) for definition in definitions]
+
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("Exercise names must be unique.")
+
+    return specs
+
+
+def load_exercise_specs(filename, check=None) -> list:
+    """Get the compiled specs for a definitions file, compiling only if it has changed
+
+    check, if given, is called with the specs whenever they're freshly compiled
+    (e.g. feasibility.analyze_specs, so new definitions get looked over once).
+    """
+
+    with open(filename, 'rb') as definitions_file:
+        definitions_text = definitions_file.read()
+
+    # Cached by content, so any edit to the file means a recompile.
+    digest = hashlib.sha256(definitions_text).hexdigest()
+    cache_directory = os.path.join(os.path.dirname(filename), CACHE_DIRECTORY)
+    cache_filename = os.path.join(cache_directory, f"{digest}.v{SPEC_VERSION}.pickle")
+
+    try:
+        with open(cache_filename, 'rb') as cache_file:
+            return pickle.load(cache_file)
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass    # Not cached (or an unreadable cache), compile it.
+
+    specs = compile_definitions(definitions_text)
+    if check is not None:
+        check(specs)
+
+    # Write then rename, so a half written cache is never read.
+    os.makedirs(cache_directory, exist_ok=True)
+    temp_filename = cache_filename + '.tmp'
+    with open(temp_filename, 'wb') as cache_file:
+        pickle.dump(specs, cache_file)
+    os.replace(temp_filename, cache_filename)
+
+    return specs
@@ -0,0 +1,179 @@
+"""Feasibility analysis -- can an exercise's settings actually produce legal trials?"""
+
+import functools
+import json
+import logging
+import sys
+from typing import NamedTuple
+
+from src.exercise import EXERCISE_CLASSES, SingTheIntervals
+from src.exercisespec import ExerciseSpec, load_exercise_specs
+
+# Fewer legal trials than this and a trial set is mostly the same few trials over and over.
+SPARSE_TRIAL_COUNT = 3
+
+
+class ConfigurationCount(NamedTuple):
+    """How many legal trials one trial set configuration has"""
+
+    exercise: str
+    key_center: str
+    intervalics: tuple
+    low_note: int
+    high_note: int
+
+    # One count for each legal notes list the trials cycle through.
+    #  - for interval singing, the starting notes for each candidate interval instead.
+    trial_counts: tuple
+
+    # Is there a list of legal notes here that no trial set could be built from?
+    empty: bool
+
+    # Only a handful of legal trials (fewer than SPARSE_TRIAL_COUNT)
+    sparse: bool
+
+
+@functools.lru_cache(maxsize=None)
+def count_shape(offsets, trial_size, max_interval, trial_range):
+    """Count trials over notes described by their offsets from the lowest one"""
+
+    # Helper Inner Functions
+    def count_walks(window):
+        # Trials that stay in the window, stepping no more than max_interval each note
+        ways = [1] * len(window)
+        for _ in range(trial_size - 1):
+            ways = [sum(ways[index] for index, note in enumerate(window)
+                        if abs(note - target) <= max_interval)
+                    for target in window]
+        return sum(ways)
+
+    # Count the trials by their lowest note.
+    #  - all the trials within trial_range of it, less those that never touch it
+    total = 0
+    for index, low_note in enumerate(offsets):
+        window = [note for note in offsets[index:] if note - low_note <= trial_range]
+        total += count_walks(window) - count_walks(window[1:])
+
+    return total
+
+
+def count_trials(legal_notes, trial_size, max_interval, trial_range):
+    """Number of different trials Exercise.build_trial_set could pick from the legal notes"""
+
+    notes = sorted(set(legal_notes))
+    if len(notes) == 0:
+        return 0
+
+    # Only the shape matters, so transpositions share the work.
+    offsets = tuple(note - notes[0] for note in notes)
+    return count_shape(offsets, trial_size, max_interval, trial_range)
+
+
+def count_starting_notes(exercise, legal_notes, interval_name):
+    """Starting notes SingTheIntervals.build_trial_set could pick for an interval"""
+
+    interval = exercise.m_u.get_semitone_count_for_interval(interval_name)
+
+    # Same purge as the exercise, so the interval stays on the fretboard
+    if interval > 0:
+        top_note = max(legal_notes) - interval
+        return [note for note in legal_notes if note <= top_note]
+
+    bottom_note = min(legal_notes) - interval
+    return [note for note in legal_notes if note >= bottom_note]
+
+
+def analyze_spec(spec: ExerciseSpec):
+    """Count the legal trials for every configuration an exercise can build"""
+
+    # Nothing is played or scored, so no player or scoreboard is needed.
+    exercise = EXERCISE_CLASSES[spec.kind](None, None, spec)
+
+    # Every key center and intervalic list get_key_intervalic could choose
+    if spec.trial_varied_intervalics:
+        intervalic_lists = [list(spec.intervalics)]
+    else:
+        intervalic_lists = [[intervalic] for intervalic in spec.intervalics]
+
+    counts = []
+    for key_center in spec.key_centers:
+        for intervalic_list in intervalic_lists:
+            for low_note, high_note in exercise.get_trial_set_ranges(
+                    key_center, intervalic_list):
+
+                legal_notes_lists = exercise.get_legal_notes(
+                    low_note, high_note, intervalic_list, key_center)
+
+                if isinstance(exercise, SingTheIntervals):
+                    # Consecutive trials can't repeat a pitch class, and consecutive sets
+                    # can't repeat an interval, so one of either won't do.
+                    starting_notes = [count_starting_notes(exercise, legal_notes_lists[0],
+                                                           interval)
+                                      for interval in spec.candidate_intervals]
+                    trial_counts = tuple(len(notes) for notes in starting_notes)
+                    empty = len(starting_notes) < 2 or \
+                        any(len({note % 12 for note in notes}) < 2 for notes in starting_notes)
+                else:
+                    trial_counts = tuple(
+                        count_trials(legal_notes, spec.trial_size,
+                                     spec.max_interval, spec.trial_range)
+                        for legal_notes in legal_notes_lists)
+                    empty = min(trial_counts, default=0) == 0
+
+                counts.append(ConfigurationCount(
+                    spec.name, key_center, tuple(intervalic_list), low_note, high_note,
+                    trial_counts, empty, min(trial_counts, default=0) < SPARSE_TRIAL_COUNT))
+
+    return counts
+
+
+def analyze_specs(specs):
+    """Analyze all the specs, logging any configuration that is empty or near empty"""
+
+    counts = []
+    for spec in specs:
+        spec_counts = analyze_spec(spec)
+
+        empty = [count for count in spec_counts if count.empty]
+        sparse = [count for count in spec_counts if count.sparse and not count.empty]
+        if len(empty) > 0:
+            logging.warning("%s: %d of %d configurations can't build a trial set, e.g. %s",
+                            spec.name, len(empty), len(spec_counts), empty[0])
+        if len(sparse) > 0:
+            logging.warning("%s: %d of %d configurations have fewer than %d legal trials, "
+                            "e.g. %s", spec.name, len(sparse), len(spec_counts),
+                            SPARSE_TRIAL_COUNT, sparse[0])
+
+        counts.extend(spec_counts)
+
+    return counts
+
+
+def export_counts(counts, filename):
+    """Save the counts, so generation cost can be checked before new exercises go out"""
+
+    with open(filename, 'w', encoding='utf-8') as counts_file:
+        json.dump([count._asdict() for count in counts], counts_file, indent=1)
+
+
+def main():
+    """Analyze a definitions file: feasibility.py definitions.json [counts.json]"""
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s", force=True)
+
+    counts = analyze_specs(load_exercise_specs(sys.argv[1]))
+    if len(sys.argv) > 2:
+        export_counts(counts, sys.argv[2])
+
+    for name in dict.fromkeys(count.exercise for count in counts):
+        exercise_counts = [count for count in counts if count.exercise == name]
+        fewest = min(min(count.trial_counts, default=0) for count in exercise_counts)
+        logging.info("%s: %d configurations, fewest legal trials %d",
+                     name, len(exercise_counts), fewest)
+
+    # Non-zero exit if anything can't be built
+    return 1 if any(count.empty for count in counts) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
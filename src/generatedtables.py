@@ -0,0 +1,247 @@
+"""Lookup tables -- GENERATED by src/generatetables.py, do not edit by hand"""
+
+# Literal tuples, so importing is just loading the compiled module.
+
+NOTE_ARRAY = ('C-1', 'C#-1', 'D-1', 'D#-1', 'E-1', 'F-1', 'F#-1', 'G-1', 'G#-1', 'A-1', 'A#-1', 'B-1', 'C0',
+ 'C#0', 'D0', 'D#0', 'E0', 'F0', 'F#0', 'G0', 'G#0', 'A0', 'A#0', 'B0', 'C1', 'C#1', 'D1',
+ 'D#1', 'E1', 'F1', 'F#1', 'G1', 'G#1', 'A1', 'A#1', 'B1', 'C2', 'C#2', 'D2', 'D#2', 'E2', 'F2',
+ 'F#2', 'G2', 'G#2', 'A2', 'A#2', 'B2', 'C3', 'C#3', 'D3', 'D#3', 'E3', 'F3', 'F#3', 'G3',
+ 'G#3', 'A3', 'A#3', 'B3', 'C4', 'C#4', 'D4', 'D#4', 'E4', 'F4', 'F#4', 'G4', 'G#4', 'A4',
+ 'A#4', 'B4', 'C5', 'C#5', 'D5', 'D#5', 'E5', 'F5', 'F#5', 'G5', 'G#5', 'A5', 'A#5', 'B5', 'C6',
+ 'C#6', 'D6', 'D#6', 'E6', 'F6', 'F#6', 'G6', 'G#6', 'A6', 'A#6', 'B6', 'C7', 'C#7', 'D7',
+ 'D#7', 'E7', 'F7', 'F#7', 'G7', 'G#7', 'A7', 'A#7', 'B7', 'C8', 'C#8', 'D8', 'D#8', 'E8', 'F8',
+ 'F#8', 'G8', 'G#8', 'A8', 'A#8', 'B8', 'C9', 'C#9', 'D9', 'D#9', 'E9', 'F9', 'F#9', 'G9')
+
+NOTE_INDEX = {'C-1': 0,
+ 'C#-1': 1,
+ 'D-1': 2,
+ 'D#-1': 3,
+ 'E-1': 4,
+ 'F-1': 5,
+ 'F#-1': 6,
+ 'G-1': 7,
+ 'G#-1': 8,
+ 'A-1': 9,
+ 'A#-1': 10,
+ 'B-1': 11,
+ 'C0': 12,
+ 'C#0': 13,
+ 'D0': 14,
+ 'D#0': 15,
+ 'E0': 16,
+ 'F0': 17,
+ 'F#0': 18,
+ 'G0': 19,
+ 'G#0': 20,
+ 'A0': 21,
+ 'A#0': 22,
+ 'B0': 23,
+ 'C1': 24,
+ 'C#1': 25,
+ 'D1': 26,
+ 'D#1': 27,
+ 'E1': 28,
+ 'F1': 29,
+ 'F#1': 30,
+ 'G1': 31,
+ 'G#1': 32,
+ 'A1': 33,
+ 'A#1': 34,
+ 'B1': 35,
+ 'C2': 36,
+ 'C#2': 37,
+ 'D2': 38,
+ 'D#2': 39,
+ 'E2': 40,
+ 'F2': 41,
+ 'F#2': 42,
+ 'G2': 43,
+ 'G#2': 44,
+ 'A2': 45,
+ 'A#2': 46,
+ 'B2': 47,
+ 'C3': 48,
+ 'C#3': 49,
+ 'D3': 50,
+ 'D#3': 51,
+ 'E3': 52,
+ 'F3': 53,
+ 'F#3': 54,
+ 'G3': 55,
+ 'G#3': 56,
+ 'A3': 57,
+ 'A#3': 58,
+ 'B3': 59,
+ 'C4': 60,
+ 'C#4': 61,
+ 'D4': 62,
+ 'D#4': 63,
+ 'E4': 64,
+ 'F4': 65,
+ 'F#4': 66,
+ 'G4': 67,
+ 'G#4': 68,
+ 'A4': 69,
+ 'A#4': 70,
+ 'B4': 71,
+ 'C5': 72,
+ 'C#5': 73,
+ 'D5': 74,
+ 'D#5': 75,
+ 'E5': 76,
+ 'F5': 77,
+ 'F#5': 78,
+ 'G5': 79,
+ 'G#5': 80,
+ 'A5': 81,
+ 'A#5': 82,
+ 'B5': 83,
+ 'C6': 84,
+ 'C#6': 85,
+ 'D6': 86,
+ 'D#6': 87,
+ 'E6': 88,
+ 'F6': 89,
+ 'F#6': 90,
+ 'G6': 91,
+ 'G#6': 92,
+ 'A6': 93,
+ 'A#6': 94,
+ 'B6': 95,
+ 'C7': 96,
+ 'C#7': 97,
+ 'D7': 98,
+ 'D#7': 99,
+ 'E7': 100,
+ 'F7': 101,
+ 'F#7': 102,
+ 'G7': 103,
+ 'G#7': 104,
+ 'A7': 105,
+ 'A#7': 106,
+ 'B7': 107,
+ 'C8': 108,
+ 'C#8': 109,
+ 'D8': 110,
+ 'D#8': 111,
+ 'E8': 112,
+ 'F8': 113,
+ 'F#8': 114,
+ 'G8': 115,
+ 'G#8': 116,
+ 'A8': 117,
+ 'A#8': 118,
+ 'B8': 119,
+ 'C9': 120,
+ 'C#9': 121,
+ 'D9': 122,
+ 'D#9': 123,
+ 'E9': 124,
+ 'F9': 125,
+ 'F#9': 126,
+ 'G9': 127}
+
+GUITAR_FULL_NOTES = (('E4', 'F4', 'F#4', 'G4', 'G#4', 'A4', 'A#4', 'B4', 'C5', 'C#5', 'D5', 'D#5', 'E5', 'F5',
+  'F#5', 'G5', 'G#5', 'A5', 'A#5', 'B5', 'C6', 'C#6', 'D6'),
+ ('B3', 'C4', 'C#4', 'D4', 'D#4', 'E4', 'F4', 'F#4', 'G4', 'G#4', 'A4', 'A#4', 'B4', 'C5',
+  'C#5', 'D5', 'D#5', 'E5', 'F5', 'F#5', 'G5', 'G#5', 'A5'),
+ ('G3', 'G#3', 'A3', 'A#3', 'B3', 'C4', 'C#4', 'D4', 'D#4', 'E4', 'F4', 'F#4', 'G4', 'G#4',
+  'A4', 'A#4', 'B4', 'C5', 'C#5', 'D5', 'D#5', 'E5', 'F5'),
+ ('D3', 'D#3', 'E3', 'F3', 'F#3', 'G3', 'G#3', 'A3', 'A#3', 'B3', 'C4', 'C#4', 'D4', 'D#4',
+  'E4', 'F4', 'F#4', 'G4', 'G#4', 'A4', 'A#4', 'B4', 'C5'),
+ ('A2', 'A#2', 'B2', 'C3', 'C#3', 'D3', 'D#3', 'E3', 'F3', 'F#3', 'G3', 'G#3', 'A3', 'A#3',
+  'B3', 'C4', 'C#4', 'D4', 'D#4', 'E4', 'F4', 'F#4', 'G4'),
+ ('E2', 'F2', 'F#2', 'G2', 'G#2', 'A2', 'A#2', 'B2', 'C3', 'C#3', 'D3', 'D#3', 'E3', 'F3',
+  'F#3', 'G3', 'G#3', 'A3', 'A#3', 'B3', 'C4', 'C#4', 'D4'))
+
+GUITAR_NOTES = (('E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B', 'C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#',
+  'A', 'A#', 'B', 'C', 'C#', 'D'),
+ ('B', 'C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B', 'C', 'C#', 'D', 'D#',
+  'E', 'F', 'F#', 'G', 'G#', 'A'),
+ ('G', 'G#', 'A', 'A#', 'B', 'C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B',
+  'C', 'C#', 'D', 'D#', 'E', 'F'),
+ ('D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B', 'C', 'C#', 'D', 'D#', 'E', 'F', 'F#',
+  'G', 'G#', 'A', 'A#', 'B', 'C'),
+ ('A', 'A#', 'B', 'C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B', 'C', 'C#',
+  'D', 'D#', 'E', 'F', 'F#', 'G'),
+ ('E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B', 'C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#',
+  'A', 'A#', 'B', 'C', 'C#', 'D'))
+
+FRETBOARD_INDEX = {'E4': ((0, 0), (1, 5), (2, 9), (3, 14), (4, 19)),
+ 'F4': ((0, 1), (1, 6), (2, 10), (3, 15), (4, 20)),
+ 'F#4': ((0, 2), (1, 7), (2, 11), (3, 16), (4, 21)),
+ 'G4': ((0, 3), (1, 8), (2, 12), (3, 17), (4, 22)),
+ 'G#4': ((0, 4), (1, 9), (2, 13), (3, 18)),
+ 'A4': ((0, 5), (1, 10), (2, 14), (3, 19)),
+ 'A#4': ((0, 6), (1, 11), (2, 15), (3, 20)),
+ 'B4': ((0, 7), (1, 12), (2, 16), (3, 21)),
+ 'C5': ((0, 8), (1, 13), (2, 17), (3, 22)),
+ 'C#5': ((0, 9), (1, 14), (2, 18)),
+ 'D5': ((0, 10), (1, 15), (2, 19)),
+ 'D#5': ((0, 11), (1, 16), (2, 20)),
+ 'E5': ((0, 12), (1, 17), (2, 21)),
+ 'F5': ((0, 13), (1, 18), (2, 22)),
+ 'F#5': ((0, 14), (1, 19)),
+ 'G5': ((0, 15), (1, 20)),
+ 'G#5': ((0, 16), (1, 21)),
+ 'A5': ((0, 17), (1, 22)),
+ 'A#5': ((0, 18),),
+ 'B5': ((0, 19),),
+ 'C6': ((0, 20),),
+ 'C#6': ((0, 21),),
+ 'D6': ((0, 22),),
+ 'B3': ((1, 0), (2, 4), (3, 9), (4, 14), (5, 19)),
+ 'C4': ((1, 1), (2, 5), (3, 10), (4, 15), (5, 20)),
+ 'C#4': ((1, 2), (2, 6), (3, 11), (4, 16), (5, 21)),
+ 'D4': ((1, 3), (2, 7), (3, 12), (4, 17), (5, 22)),
+ 'D#4': ((1, 4), (2, 8), (3, 13), (4, 18)),
+ 'G3': ((2, 0), (3, 5), (4, 10), (5, 15)),
+ 'G#3': ((2, 1), (3, 6), (4, 11), (5, 16)),
+ 'A3': ((2, 2), (3, 7), (4, 12), (5, 17)),
+ 'A#3': ((2, 3), (3, 8), (4, 13), (5, 18)),
+ 'D3': ((3, 0), (4, 5), (5, 10)),
+ 'D#3': ((3, 1), (4, 6), (5, 11)),
+ 'E3': ((3, 2), (4, 7), (5, 12)),
+ 'F3': ((3, 3), (4, 8), (5, 13)),
+ 'F#3': ((3, 4), (4, 9), (5, 14)),
+ 'A2': ((4, 0), (5, 5)),
+ 'A#2': ((4, 1), (5, 6)),
+ 'B2': ((4, 2), (5, 7)),
+ 'C3': ((4, 3), (5, 8)),
+ 'C#3': ((4, 4), (5, 9)),
+ 'E2': ((5, 0),),
+ 'F2': ((5, 1),),
+ 'F#2': ((5, 2),),
+ 'G2': ((5, 3),),
+ 'G#2': ((5, 4),)}
+
+PITCH_CLASS_MASKS = {'Chromatic': (4095, 4095, 4095, 4095, 4095, 4095, 4095, 4095, 4095, 4095, 4095, 4095),
+ 'Ionian': (2741, 1387, 2774, 1453, 2906, 1717, 3434, 2773, 1451, 2902, 1709, 3418),
+ 'Dorian': (1709, 3418, 2741, 1387, 2774, 1453, 2906, 1717, 3434, 2773, 1451, 2902),
+ 'Lydian': (2773, 1451, 2902, 1709, 3418, 2741, 1387, 2774, 1453, 2906, 1717, 3434),
+ 'Mixolydian': (1717, 3434, 2773, 1451, 2902, 1709, 3418, 2741, 1387, 2774, 1453, 2906),
+ 'Aeolian': (1453, 2906, 1717, 3434, 2773, 1451, 2902, 1709, 3418, 2741, 1387, 2774),
+ 'Minor Pentatonic': (1193, 2386, 677, 1354, 2708, 1321, 2642, 1189, 2378, 661, 1322, 2644),
+ 'Major Pentatonic': (661, 1322, 2644, 1193, 2386, 677, 1354, 2708, 1321, 2642, 1189, 2378),
+ 'Blues Scale': (1257, 2514, 933, 1866, 3732, 3369, 2643, 1191, 2382, 669, 1338, 2676),
+ 'Melodic Minor': (2733, 1371, 2742, 1389, 2778, 1461, 2922, 1749, 3498, 2901, 1707, 3414),
+ 'Harmonic Minor': (2477, 859, 1718, 3436, 2777, 1459, 2918, 1741, 3482, 2869, 1643, 3286),
+ 'Super Locrian': (1371, 2742, 1389, 2778, 1461, 2922, 1749, 3498, 2901, 1707, 3414, 2733),
+ 'Lydian Dominant': (1749, 3498, 2901, 1707, 3414, 2733, 1371, 2742, 1389, 2778, 1461, 2922),
+ 'Half-Whole Diminished': (1755, 3510, 2925, 1755, 3510, 2925, 1755, 3510, 2925, 1755, 3510,
+                           2925),
+ 'Major': (145, 290, 580, 1160, 2320, 545, 1090, 2180, 265, 530, 1060, 2120),
+ 'Minor': (137, 274, 548, 1096, 2192, 289, 578, 1156, 2312, 529, 1058, 2116),
+ 'Major Seventh': (2193, 291, 582, 1164, 2328, 561, 1122, 2244, 393, 786, 1572, 3144),
+ 'Dominant Seventh': (1169, 2338, 581, 1162, 2324, 553, 1106, 2212, 329, 658, 1316, 2632),
+ 'Minor Seventh': (1161, 2322, 549, 1098, 2196, 297, 594, 1188, 2376, 657, 1314, 2628),
+ 'Half Diminished': (1097, 2194, 293, 586, 1172, 2344, 593, 1186, 2372, 649, 1298, 2596),
+ 'Fully Diminished': (585, 1170, 2340, 585, 1170, 2340, 585, 1170, 2340, 585, 1170, 2340),
+ 'I7': (1169, 2338, 581, 1162, 2324, 553, 1106, 2212, 329, 658, 1316, 2632),
+ 'IMaj7': (2193, 291, 582, 1164, 2328, 561, 1122, 2244, 393, 786, 1572, 3144),
+ 'ii7': (549, 1098, 2196, 297, 594, 1188, 2376, 657, 1314, 2628, 1161, 2322),
+ 'IV7': (553, 1106, 2212, 329, 658, 1316, 2632, 1169, 2338, 581, 1162, 2324),
+ 'V7': (2212, 329, 658, 1316, 2632, 1169, 2338, 581, 1162, 2324, 553, 1106),
+ 'biii°7': (585, 1170, 2340, 585, 1170, 2340, 585, 1170, 2340, 585, 1170, 2340),
+ 'V°7': (1170, 2340, 585, 1170, 2340, 585, 1170, 2340, 585, 1170, 2340, 585),
+ 'vii°7': (2340, 585, 1170, 2340, 585, 1170, 2340, 585, 1170, 2340, 585, 1170)}
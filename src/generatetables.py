@@ -0,0 +1,61 @@
+"""Build step -- write the note and fretboard lookup tables out as src/generatedtables.py
+
+Run it after changing any of the builders or interval patterns:
+
+    python -m src.generatetables
+"""
+
+import os
+import pprint
+
+from src.guitarutilities import build_fretboard_index, build_guitar_notes
+from src.midiutilities import MidiUtil, build_note_array, build_pitch_class_masks
+
+GENERATED_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  'generatedtables.py')
+
+HEADER = '''"""Lookup tables -- GENERATED by src/generatetables.py, do not edit by hand"""
+
+# Literal tuples, so importing is just loading the compiled module.
+'''
+
+
+def build_tables() -> dict:
+    """All the tables, built the slow way"""
+
+    m_u = MidiUtil()
+
+    note_array = build_note_array(m_u.note_names)
+    guitar_full_notes, guitar_notes = build_guitar_notes()
+
+    return {
+        'NOTE_ARRAY': tuple(note_array),
+        'NOTE_INDEX': {note_name: midi_note for midi_note, note_name in enumerate(note_array)},
+        'GUITAR_FULL_NOTES': tuple(tuple(notes) for notes in guitar_full_notes),
+        'GUITAR_NOTES': tuple(tuple(notes) for notes in guitar_notes),
+        'FRETBOARD_INDEX': {note_name: tuple(places) for note_name, places
+                            in build_fretboard_index(guitar_full_notes).items()},
+        'PITCH_CLASS_MASKS': build_pitch_class_masks(m_u.interval_pattern)
+    }
+
+
+def render_tables(tables) -> str:
+    """The source of the generated module"""
+
+    source = HEADER
+    for name, table in tables.items():
+        literal = pprint.pformat(table, width=96, compact=True, sort_dicts=False)
+        source += f"\n{name} = {literal}\n"
+
+    return source
+
+
+def main():
+    """Regenerate the tables module"""
+
+    with open(GENERATED_FILENAME, 'w', encoding='utf-8') as generated_file:
+        generated_file.write(render_tables(build_tables()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,81 @@
 """Guitar Conversion Stuff"""
 
+from src import generatedtables
 
-class GuitarUtil:
 
-    """Covert stuff as relates to the guitar"""
+def build_guitar_notes():
+    """Full note names (WITH octave) and note names (NO octave) for each string and fret"""
 
-    def __init__(self):
+    guitar_full_notes = []
+    guitar_notes = []
 
-        # Define string names
-        self.guitar_strings = ["E", "B", "G", "D", "A", "E"]
+    note_names = ["C", "C#", "D", "D#", "E",
+                  "F", "F#", "G", "G#", "A", "A#", "B"]
 
-        # A list of lists of each full note (INCLUDING OCTAVE) name for each guitar string.
-        # Index: 0 - High E; 5 - Low E.
-        self.guitar_full_notes = []
-        self.guitar_notes = []  # Same as above, but just the names -- NO OCTAVE IDENTIFICATION
+    # The starting octave for each string.
+    string_octaves = [4, 3, 3, 3, 2, 2]
+
+    # The starting note for string in the note_names list
+    # The index values in note_names list.
+    string_note_cycle_start = [4, 11, 7, 2, 9, 4]
+
+    for guitar_string in range(0, 6):
+
+        octave = string_octaves[guitar_string]
+        note_name_offset = string_note_cycle_start[guitar_string]
+
+        full_string_notes = []
+        string_notes = []
+
+        for fret in range(0, 23):   # 23 so that we define the 22 fret.
 
-        note_names = ["C", "C#", "D", "D#", "E",
-                      "F", "F#", "G", "G#", "A", "A#", "B"]
+            # Get the right index for the string/fret pair
+            note_name_index = (fret + note_name_offset) % len(note_names)
 
-        # The starting octave for each string.
-        string_octaves = [4, 3, 3, 3, 2, 2]
+            if note_name_index == 0:
+                # We're on C, next octave
+                octave += 1
 
-        # The starting note for string in the note_names list
-        # The index values in note_names list.
-        string_note_cycle_start = [4, 11, 7, 2, 9, 4]
+            full_note_name = note_names[note_name_index] + str(octave)
 
-        for guitar_string in range(0, 6):
+            full_string_notes.append(full_note_name)
+            string_notes.append(note_names[note_name_index])
 
-            octave = string_octaves[guitar_string]
-            note_name_offset = string_note_cycle_start[guitar_string]
+        guitar_full_notes.append(full_string_notes)
+        guitar_notes.append(string_notes)
 
-            full_string_notes = []
-            string_notes = []
+    return guitar_full_notes, guitar_notes
 
-            for fret in range(0, 23):   # 23 so that we define the 22 fret.
 
-                # Get the right index for the string/fret pair
-                note_name_index = (fret + note_name_offset) % len(note_names)
+def build_fretboard_index(guitar_full_notes):
+    """Every (string index, fret) a full note name is played at, keyed by the name"""
 
-                if note_name_index == 0:
-                    # We're on C, next octave
-                    octave += 1
+    fretboard_index = {}
+    for idx, guitar_string_notes in enumerate(guitar_full_notes):
+        for fret, full_note_name in enumerate(guitar_string_notes):
+            fretboard_index.setdefault(full_note_name, []).append((idx, fret))
 
-                full_note_name = note_names[note_name_index] + str(octave)
+    return fretboard_index
 
-                full_string_notes.append(full_note_name)
-                string_notes.append(note_names[note_name_index])
 
-            self.guitar_full_notes.append(full_string_notes)
-            self.guitar_notes.append(string_notes)
+class GuitarUtil:
+
+    """Covert stuff as relates to the guitar"""
+
+    def __init__(self):
+
+        # Define string names
+        self.guitar_strings = ["E", "B", "G", "D", "A", "E"]
+
+        # A list of lists of each full note (INCLUDING OCTAVE) name for each guitar string.
+        # Index: 0 - High E; 5 - Low E.
+        #  - generated ahead of time (see build_guitar_notes)
+        self.guitar_full_notes = generatedtables.GUITAR_FULL_NOTES
+        # Same as above, but just the names -- NO OCTAVE IDENTIFICATION
+        self.guitar_notes = generatedtables.GUITAR_NOTES
+
+        # Where each full note name is on the fretboard
+        self.fretboard_index = generatedtables.FRETBOARD_INDEX
 
     def get_string_from_number(self, number):
         """Get name for string number"""
@@ -128,17 +155,13 @@ class GuitarUtil:
         # The list we're going to populate [Fret, String]
         fret_string = []
 
-        for idx, guitar_string_notes in enumerate(self.guitar_full_notes):
+        # Everywhere the note is on the fretboard (low string index first)
+        for idx, fret in self.fretboard_index.get(full_note_name, ()):
 
             # Remember low string has a high index and vice versa
             if high_string_limit <= idx <= low_string_limit:
-                try:
-                    # Find the note on the string and if it's there add it to the return list
-                    fret = guitar_string_notes.index(full_note_name)
-                    if low_fret_range <= fret <= high_fret_range:
-                        fret_string.append(
-                            [fret, self.get_string_from_number(idx+1)])
-                except ValueError:
-                    pass    # This is fine.
+                if low_fret_range <= fret <= high_fret_range:
+                    fret_string.append(
+                        [fret, self.get_string_from_number(idx+1)])
 
         return fret_string
@@ -0,0 +1,227 @@
+"""Where key presses and typed lines come from"""
+
+import os
+import sys
+
+# Key names for the bytes a terminal sends, matching the keyboard module's names
+TERMINAL_KEY_NAMES = {
+    ' ': 'space',
+    '\r': 'enter',
+    '\n': 'enter',
+    '\t': 'tab',
+    '\x7f': 'backspace',
+    '\x1b': 'esc',
+    '\x1b[A': 'up',
+    '\x1b[B': 'down',
+    '\x1b[C': 'right',
+    '\x1b[D': 'left'
+}
+
+# Clear the screen and home the cursor (ANSI)
+CLEAR_SCREEN_SEQUENCE = '\x1b[2J\x1b[H'
+
+
+def decode_terminal_keys(data: bytes) -> list:
+    """Split bytes read from a terminal into key names"""
+
+    text = data.decode('utf-8', errors='replace')
+
+    keys = []
+    index = 0
+    while index < len(text):
+
+        # Escape sequences (arrows, function keys) run to their final letter or ~
+        if text.startswith('\x1b[', index) or text.startswith('\x1bO', index):
+            end = index + 2
+            while end < len(text) and not (text[end].isalpha() or text[end] == '~'):
+                end += 1
+            sequence = text[index:end + 1]
+            index = end + 1
+        else:
+            sequence = text[index]
+            index += 1
+
+        keys.append(TERMINAL_KEY_NAMES.get(sequence, sequence))
+
+    return keys
+
+
+class TerminalInputBackend:
+    """Key presses read straight from the controlling terminal
+
+    No global hooks and no root:  while waiting for a key the terminal is put in
+    cbreak mode (unbuffered, no echo, signals still work) and a selector wakes us as
+    soon as there is something to read.  Typed lines are read as normal.
+    """
+
+    # Most bytes a single key press sends (escape sequences included)
+    READ_SIZE = 64
+
+    def __init__(self, fd=None):
+
+        # POSIX only.  Elsewhere the ImportError sends us back to the keyboard module.
+        import selectors  # pylint: disable=import-outside-toplevel
+        import termios  # pylint: disable=import-outside-toplevel
+
+        self.termios = termios
+
+        # The controlling terminal, even if stdin has been redirected
+        self.owns_fd = fd is None
+        if fd is None:
+            fd = os.open('/dev/tty', os.O_RDONLY | os.O_NOCTTY)
+        self.fd = fd
+
+        try:
+            # Fails (termios.error) if this isn't a terminal at all.
+            self.cooked_attributes = termios.tcgetattr(self.fd)
+            os.set_blocking(self.fd, False)
+
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.fd, selectors.EVENT_READ)
+        except (termios.error, OSError) as error:
+            self.close()
+            raise OSError(f"Not a terminal: {error}") from error
+
+    def set_cbreak(self):
+        """Unbuffered, unechoed input.  Unlike full raw mode, output and ^C still work."""
+
+        attributes = self.termios.tcgetattr(self.fd)
+        attributes[3] &= ~(self.termios.ICANON | self.termios.ECHO)    # lflag
+        attributes[6][self.termios.VMIN] = 1
+        attributes[6][self.termios.VTIME] = 0
+        self.termios.tcsetattr(self.fd, self.termios.TCSANOW, attributes)
+
+    def restore(self):
+        """Back to line at a time input"""
+
+        self.termios.tcsetattr(self.fd, self.termios.TCSANOW, self.cooked_attributes)
+
+    def read_key(self, options):
+        """Wait until one of the option keys is hit.  Return it."""
+
+        self.set_cbreak()
+        try:
+            # Like the keyboard module, only presses from now on count.
+            self.termios.tcflush(self.fd, self.termios.TCIFLUSH)
+
+            while True:
+                self.selector.select()
+                try:
+                    data = os.read(self.fd, TerminalInputBackend.READ_SIZE)
+                except BlockingIOError:
+                    continue    # Woken up, but someone else got there first
+
+                for key_press in decode_terminal_keys(data):
+                    if key_press in options:
+                        return key_press
+        finally:
+            self.restore()
+
+    def wait_for_space(self):
+        """Wait for the space bar"""
+
+        self.read_key(["space"])
+
+    def read_line(self, prompt):
+        """Read a typed line"""
+
+        return input(prompt)
+
+    def clear_screen(self):
+        """Clear the terminal, without starting a process to do it"""
+
+        sys.stdout.write(CLEAR_SCREEN_SEQUENCE)
+        sys.stdout.flush()
+
+    def close(self):
+        """Let go of the terminal"""
+
+        if hasattr(self, 'selector'):
+            self.selector.close()
+        if self.owns_fd:
+            os.close(self.fd)
+
+
+class KeyboardInputBackend:
+    """The real keyboard, through the keyboard module's global hooks (needs root on Linux)"""
+
+    def __init__(self):
+
+        # Only imported when we're actually reading a keyboard.
+        import keyboard  # pylint: disable=import-outside-toplevel
+
+        self.keyboard = keyboard
+
+    def read_key(self, options):
+        """Wait until one of the option keys is hit.  Return it."""
+
+        while True:
+            key_press = self.keyboard.read_key(True)
+            if key_press in options:
+                return key_press
+
+    def wait_for_space(self):
+        """Wait for the space bar"""
+
+        self.keyboard.wait('space')
+
+    def read_line(self, prompt):
+        """Read a typed line"""
+
+        return input(prompt)
+
+    def clear_screen(self):
+        """Clear the terminal"""
+
+        os.system('clear')
+
+
+class ScriptedInputBackend:
+    """Key presses and typed lines from scripts, for running sessions without anyone there
+
+    keys feeds read_key and wait_for_space, lines feeds read_line (menu choices).
+    Either can be any iterable, e.g. itertools.cycle(["space", "3"]) to start every
+    trial set and score everything a 3.  Running out raises EOFError, just as input()
+    does at the end of a file.
+    """
+
+    def __init__(self, keys=(), lines=()):
+
+        self.keys = iter(keys)
+        self.lines = iter(lines)
+
+    def read_key(self, options):
+        """The next scripted key that's one of the options"""
+
+        # Like the keyboard, keys that aren't options are ignored.
+        for key_press in self.keys:
+            if key_press in options:
+                return key_press
+
+        raise EOFError("Key script finished")
+
+    def wait_for_space(self):
+        """Skip ahead to the next scripted space"""
+
+        self.read_key(["space"])
+
+    def read_line(self, prompt):
+        """The next scripted line"""
+
+        print(prompt)
+        for line in self.lines:
+            return line
+
+        raise EOFError("Line script finished")
+
+    def clear_screen(self):
+        """No screen to clear"""
+
+
+def open_input_backend():
+    """The best way to read the real keyboard here.  The terminal, else the keyboard module."""
+
+    try:
+        return TerminalInputBackend()
+    except (ImportError, OSError):
+        return KeyboardInputBackend()   # Windows, or no terminal to read
@@ -1,21 +1,49 @@
 """Key press helper functions"""
-import keyboard
+
+from src.inputbackend import open_input_backend
+
+# Where input comes from.  The real keyboard, unless set_input_backend says otherwise.
+_input_backend = None
+
+
+def get_input_backend():
+    """The input backend in use"""
+
+    global _input_backend  # pylint: disable=global-statement
+    if _input_backend is None:
+        _input_backend = open_input_backend()
+
+    return _input_backend
+
+
+def set_input_backend(backend):
+    """Take input from somewhere else (i.e. a ScriptedInputBackend)"""
+
+    global _input_backend  # pylint: disable=global-statement
+    _input_backend = backend
 
 
 def key_press_message(message, options):
     """Print a message and wait until specific key is hit"""
 
     print(message)
-    while True:
-        key_press = keyboard.read_key(True)
-        # print(f"Key pressed: {key_press}")
-        for option in options:
-            if option == key_press:
-                return key_press
+    return get_input_backend().read_key(options)
 
 
 def any_key_press(message):
     """Accept any keypress"""
 
     print(message)
-    keyboard.wait('space')
+    get_input_backend().wait_for_space()
+
+
+def read_line(prompt):
+    """Read a typed line (i.e. a menu selection)"""
+
+    return get_input_backend().read_line(prompt)
+
+
+def clear_screen():
+    """Clear the screen"""
+
+    get_input_backend().clear_screen()
@@ -0,0 +1,338 @@
+"""Standard MIDI File export -- exercise sessions, without playing them live
+
+The Player plays the package as usual, but into a MidiAudioBackend, so the notes, the
+pauses and the repeats land in the file with exactly the timing the application uses.
+Events are streamed to disk as they're played; the track length is patched in at the end.
+
+    python -m src.midiexport "Singing the Easy Intervals" --seeds 1000 --directory sessions
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import itertools
+import os
+import re
+import struct
+import sys
+
+from src.exercise import build_seeded_package
+from src.exercisespec import load_exercise_specs
+from src.inputbackend import ScriptedInputBackend
+from src.keypresshelper import set_input_backend
+from src.noteevents import get_events_end
+from src.player import Player
+from src.scoreboard import Scoreboard
+
+DEFINITIONS_FILENAME = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'exercises.json')
+
+TICKS_PER_BEAT = 480
+TEMPO = 120                 # Same as the scamp session
+PROGRAM = 71                # General MIDI clarinet (zero based), the scamp instrument
+DRONE_PROGRAM = 48          # General MIDI string ensemble, on a channel of its own
+DRONE_CHANNEL = 1
+
+# Nobody's there to press keys:  start every trial set, continue past every prompt,
+# and answer any score prompt (the scores go nowhere).
+EXPORT_KEYS = ["space", "3"]
+
+# Seconds.  Long enough that the Player never runs out of time part way through.
+EXPORT_DURATION = 10**9
+
+
+def encode_variable_length(value):
+    """MIDI variable length quantity"""
+
+    data = [value & 0x7F]
+    value >>= 7
+    while value > 0:
+        data.append(0x80 | (value & 0x7F))
+        value >>= 7
+
+    return bytes(reversed(data))
+
+
+def decode_variable_length(data, position):
+    """Read a variable length quantity.  Return (value, next position)"""
+
+    value = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, position
+
+
+class MidiFileWriter:
+    """Write a format 0 Standard MIDI File, an event at a time
+
+    Events must come in time order (in beats).  Nothing is held in memory, the track's
+    length is unknown until the end, so close() seeks back and fills it in.
+    """
+
+    def __init__(self, filename, tempo=TEMPO, ticks_per_beat=TICKS_PER_BEAT):
+
+        self.ticks_per_beat = ticks_per_beat
+        self.file = open(filename, 'wb')  # pylint: disable=consider-using-with
+
+        # Header, then a track with its length to be patched in
+        self.file.write(b'MThd' + struct.pack('>IHHH', 6, 0, 1, ticks_per_beat))
+        self.file.write(b'MTrk')
+        self.length_position = self.file.tell()
+        self.file.write(struct.pack('>I', 0))
+
+        self.track_length = 0
+        self.last_tick = 0
+
+        # A tempo, so the beats are the same length as in the application
+        self.write_event(0, b'\xff\x51\x03' + struct.pack('>I', 60_000_000 // tempo)[1:])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_event(self, beats, event: bytes):
+        """Write an event at beats from the start"""
+
+        # Rounded from the absolute time, so rounding never accumulates.
+        tick = round(beats * self.ticks_per_beat)
+        if tick < self.last_tick:
+            raise ValueError(f"Event out of order at beat {beats}")
+
+        data = encode_variable_length(tick - self.last_tick) + event
+        self.file.write(data)
+        self.track_length += len(data)
+        self.last_tick = tick
+
+    def write_text(self, beats, text, meta_type=0x01):
+        """A text meta event (0x03 is the track name)"""
+
+        encoded = text.encode('utf-8')
+        self.write_event(beats, bytes([0xFF, meta_type]) +
+                         encode_variable_length(len(encoded)) + encoded)
+
+    def write_program(self, beats, program, channel=0):
+        """Choose the instrument"""
+
+        self.write_event(beats, bytes([0xC0 | channel, program]))
+
+    def write_note_on(self, beats, note, velocity, channel=0):
+        """Start a note"""
+
+        self.write_event(beats, bytes([0x90 | channel, note, velocity]))
+
+    def write_note_off(self, beats, note, channel=0):
+        """End a note"""
+
+        self.write_event(beats, bytes([0x80 | channel, note, 0x40]))
+
+    def write_note(self, beats, note, velocity, duration, channel=0):
+        """A note on, and its note off duration beats later"""
+
+        self.write_note_on(beats, note, velocity, channel)
+        self.write_note_off(beats + duration, note, channel)
+
+    def close(self):
+        """End the track, and patch in its length"""
+
+        if self.file.closed:
+            return
+
+        self.write_event(self.last_tick / self.ticks_per_beat, b'\xff\x2f\x00')
+        self.file.seek(self.length_position)
+        self.file.write(struct.pack('>I', self.track_length))
+        self.file.close()
+
+
+class MidiAudioBackend:
+    """Play notes into a MidiFileWriter instead of out loud"""
+
+    def __init__(self, writer: MidiFileWriter):
+
+        self.writer = writer
+
+        # Where we are, in beats
+        self.beats = 0.0
+
+        # The drone notes sounding, and has its channel been given an instrument yet
+        self.drone_notes = ()
+        self.drone_program_written = False
+
+    def get_velocity(self, volume):
+        """MIDI velocity for a scamp style 0-1 volume"""
+
+        return max(1, min(127, round(volume * 127)))
+
+    def play_note(self, note, volume, duration):
+        """Write a note (it takes duration beats, just as when played)"""
+
+        self.writer.write_note(self.beats, note, self.get_velocity(volume), duration)
+        self.beats += duration
+
+    def play_events(self, events):
+        """Write note events at their onsets from now, then move on past the last one"""
+
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        # Notes can overlap, so the ons and offs are merged into time order.  In ticks, so
+        # an off and an on that round together come off first (a repeated pitch survives).
+        ticks_per_beat = self.writer.ticks_per_beat
+        ticks = np.round((self.beats + np.concatenate([
+            events['onset'], events['onset'] + events['duration']]).astype(float)) *
+            ticks_per_beat)
+        is_on = np.concatenate([np.ones(len(events), bool), np.zeros(len(events), bool)])
+        pitches = np.concatenate([events['pitch'], events['pitch']])
+        velocities = np.concatenate([events['velocity'], events['velocity']])
+
+        order = np.lexsort((is_on, ticks))
+        for tick, note_on, pitch, velocity in zip(ticks[order].tolist(), is_on[order].tolist(),
+                                                  pitches[order].tolist(),
+                                                  velocities[order].tolist()):
+            if note_on:
+                self.writer.write_note_on(tick / ticks_per_beat, pitch, max(1, velocity))
+            else:
+                self.writer.write_note_off(tick / ticks_per_beat, pitch)
+
+        self.beats += get_events_end(events)
+
+    def start_drone(self, notes, volume):
+        """Start the drone notes on their own channel, held until stop_drone"""
+
+        if not self.drone_program_written:
+            self.writer.write_program(self.beats, DRONE_PROGRAM, DRONE_CHANNEL)
+            self.drone_program_written = True
+
+        self.drone_notes = tuple(notes)
+        for note in self.drone_notes:
+            self.writer.write_note_on(self.beats, note, self.get_velocity(volume), DRONE_CHANNEL)
+
+    def stop_drone(self):
+        """Release the drone notes"""
+
+        for note in self.drone_notes:
+            self.writer.write_note_off(self.beats, note, DRONE_CHANNEL)
+        self.drone_notes = ()
+
+    def wait(self, beats):
+        """Time passes"""
+
+        self.beats += beats
+
+    def close(self):
+        """The writer belongs to whoever made it"""
+
+
+def get_export_filename(spec, seed):
+    """e.g. singing-the-easy-intervals-0042.mid"""
+
+    slug = re.sub(r'[^a-z0-9]+', '-', spec.name.lower()).strip('-')
+    return f"{slug}-{seed:04d}.mid"
+
+
+def export_package(package, filename):
+    """Write a built package as a Standard MIDI File"""
+
+    with MidiFileWriter(filename) as writer:
+        writer.write_text(0, package.get_test_name(), meta_type=0x03)
+        writer.write_program(0, PROGRAM)
+
+        # Played by a real Player, so the timing is the application's.
+        set_input_backend(ScriptedInputBackend(itertools.cycle(EXPORT_KEYS)))
+        try:
+            player = Player(MidiAudioBackend(writer))
+            with contextlib.redirect_stdout(io.StringIO()):
+                player.play(package, Scoreboard(), EXPORT_DURATION)
+        finally:
+            set_input_backend(None)     # Back to the keyboard
+
+
+def export_seed(spec, seed, directory):
+    """Build the seed's package and export it.  Return the filename."""
+
+    filename = os.path.join(directory, get_export_filename(spec, seed))
+    export_package(build_seeded_package(spec, seed), filename)
+
+    return filename
+
+
+def export_seeds(spec, seeds, directory, workers=None):
+    """Export a package for every seed, in parallel.  workers=0 exports in this process."""
+
+    os.makedirs(directory, exist_ok=True)
+    seeds = list(seeds)
+
+    if workers == 0:
+        return [export_seed(spec, seed, directory) for seed in seeds]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(export_seed, itertools.repeat(spec), seeds,
+                                 itertools.repeat(directory), chunksize=16))
+
+
+def read_midi_file(filename):
+    """Read back a format 0 file.  Return (ticks per beat, [(tick, event bytes)])"""
+
+    with open(filename, 'rb') as midi_file:
+        data = midi_file.read()
+
+    if data[:4] != b'MThd' or data[14:18] != b'MTrk':
+        raise ValueError(f"Not a format 0 MIDI file: {filename}")
+    ticks_per_beat = struct.unpack('>H', data[12:14])[0]
+    track_length = struct.unpack('>I', data[18:22])[0]
+    if 22 + track_length != len(data):
+        raise ValueError(f"Track length doesn't match the file: {filename}")
+
+    events = []
+    tick = 0
+    position = 22
+    while position < len(data):
+        delta, position = decode_variable_length(data, position)
+        tick += delta
+
+        start = position
+        if data[position] == 0xFF:          # Meta event
+            length, position = decode_variable_length(data, position + 2)
+            position += length
+        elif data[position] & 0xF0 in (0xC0, 0xD0):
+            position += 2
+        else:
+            position += 3
+        events.append((tick, data[start:position]))
+
+    return ticks_per_beat, events
+
+
+def main():
+    """Export a batch of sessions for an exercise"""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('exercise', help="exercise name, as in the definitions")
+    parser.add_argument('--definitions', default=DEFINITIONS_FILENAME)
+    parser.add_argument('--seeds', type=int, default=1, help="how many sessions")
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--directory', default='.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help="pool size (default: every cpu, 0: no pool)")
+    args = parser.parse_args()
+
+    specs = {spec.name: spec for spec in load_exercise_specs(args.definitions)}
+    if args.exercise not in specs:
+        print(f"Unknown exercise: {args.exercise}.  One of: {', '.join(specs)}")
+        return 1
+
+    filenames = export_seeds(specs[args.exercise],
+                             range(args.first_seed, args.first_seed + args.seeds),
+                             args.directory, args.workers)
+    total_size = sum(os.path.getsize(filename) for filename in filenames)
+    print(f"Exported {len(filenames)} sessions to {args.directory} ({total_size} bytes)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,82 @@
 '''Midi Conversion Stuff'''
 
+from src import generatedtables
+
 MAX_MIDI_VALUE = 127
 
+# Pitch class sets are 12 bit masks: bit n is set if pitch class n (C = 0) is in the set.
+ALL_PITCH_CLASSES = 0xFFF
+
+
+def pattern_to_mask(intervals) -> int:
+    '''Pitch class mask of an interval pattern, built on C'''
+
+    # Same rules as build_from_intervals:  a leading 0 means the tonic is in the pattern.
+    exclude_tonic = intervals[0] != 0
+
+    mask = 0 if exclude_tonic else 1
+    pitch_class = 0
+    for interval in intervals:
+        pitch_class = (pitch_class + interval) % 12
+        if not (exclude_tonic and pitch_class == 0):
+            mask |= 1 << pitch_class
+
+    return mask
+
+
+def transpose_mask(mask: int, semitones: int) -> int:
+    '''Transpose a pitch class mask (rotate the 12 bits)'''
+
+    semitones %= 12
+    return ((mask << semitones) | (mask >> (12 - semitones))) & ALL_PITCH_CLASSES
+
+
+def mask_to_pitch_classes(mask: int) -> list:
+    '''The pitch classes (0-11) in a mask'''
+
+    return [pitch_class for pitch_class in range(12) if mask >> pitch_class & 1]
+
+
+def build_note_array(note_names) -> list:
+    '''True note names for every midi note value (index is the midi note value)'''
+
+    note_array = []
+    midi_note = 0
+    octave = -1
+    while midi_note <= MAX_MIDI_VALUE:
+        for note_name in note_names:
+            if midi_note <= MAX_MIDI_VALUE:
+                true_note_name = note_name + str(octave)
+                note_array.append(true_note_name)
+                midi_note += 1
+
+        octave += 1
+
+    return note_array
+
+
+def build_pitch_class_masks(interval_pattern) -> dict:
+    '''Every pattern as a pitch class mask, in all 12 keys'''
+
+    pitch_class_masks = {}
+    for pattern, intervals in interval_pattern.items():
+        mask = pattern_to_mask(intervals)
+        pitch_class_masks[pattern] = tuple(transpose_mask(mask, key) for key in range(12))
+
+    return pitch_class_masks
+
 
 class MidiUtil:
 
     '''Get midi note values'''
 
     def __init__(self):
-        note_names = ['C', 'C#', 'D', 'D#', 'E',
-                      'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        midi_note = 0
-        octave = -1
-        # List containing true note names. Index is midi note value for that note.
-        self.note_array = []
+        self.note_names = ['C', 'C#', 'D', 'D#', 'E',
+                           'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+        # True note names. Index is midi note value for that note.
+        #  - generated ahead of time (see build_note_array)
+        self.note_array = generatedtables.NOTE_ARRAY
 
         self.interval_pattern = {
             'Chromatic': [0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
@@ -80,6 +143,10 @@ class MidiUtil:
             'Minor Seventh': [3, 4, 3, 2]
         }
 
+        # The chords chords_for_mode looks for
+        self.chord_types = ['Major', 'Minor', 'Major Seventh', 'Dominant Seventh',
+                            'Minor Seventh', 'Half Diminished', 'Fully Diminished']
+
         self.mode_root_chord_type = {
             'Ionian': 'Major',
             'Dorian': 'Minor Seventh',
@@ -90,15 +157,10 @@ class MidiUtil:
             'Blues Scale': 'Dominant Seventh'
         }
 
-        # Build the midi note_array
-        while midi_note <= MAX_MIDI_VALUE:
-            for note_name in note_names:
-                if midi_note <= MAX_MIDI_VALUE:
-                    true_note_name = note_name + str(octave)
-                    self.note_array.append(true_note_name)
-                    midi_note += 1
-
-            octave += 1
+        # Every pattern as a pitch class mask, in all 12 keys.
+        #  - pitch_class_masks[pattern][pitch class of the key]
+        #  - generated ahead of time (see build_pitch_class_masks)
+        self.pitch_class_masks = generatedtables.PITCH_CLASS_MASKS
 
     def __getitem__(self, index):
         '''Return the true note name.  Index to request is the midi note value.'''
@@ -108,6 +170,30 @@ class MidiUtil:
         '''Return the correct chord type for mode in question.'''
         return self.mode_root_chord_type[mode]
 
+    def get_pitch_class_mask(self, pattern, key='C') -> int:
+        '''The pitch class mask of a scale or chord in a key (a SANS-octave name string)'''
+
+        return self.pitch_class_masks[pattern][self.note_names.index(key)]
+
+    def is_in_pattern(self, note: int, pattern, key='C') -> bool:
+        '''Is the midi note part of the scale or chord in that key?'''
+
+        return bool(self.get_pitch_class_mask(pattern, key) >> (note % 12) & 1)
+
+    def notes_in_mask(self, low_note, high_note, mask: int) -> list:
+        '''All the midi notes from low to high note (inclusive) whose pitch class is in the mask'''
+
+        return [note for note in range(low_note, high_note + 1) if mask >> (note % 12) & 1]
+
+    def chords_for_mode(self, mode, key='C') -> list:
+        '''The chord types, rooted on the tonic, whose notes are all in the mode'''
+
+        mode_mask = self.get_pitch_class_mask(mode, key)
+
+        # Subset test: nothing in the chord that's missing from the mode
+        return [chord for chord in self.chord_types
+                if self.get_pitch_class_mask(chord, key) & ~mode_mask == 0]
+
     def get_semitone_count_for_interval(self, interval):
         '''Return the # of semitones from the interval name'''
         return self.intervals[interval]
@@ -221,7 +307,11 @@ class MidiUtil:
         '''Implement list index function'''
 
         # Return the midi note value of the full note name.
-        return self.note_array.index(note_name)
+        #  - a ValueError for unknown names, just like list.index
+        try:
+            return generatedtables.NOTE_INDEX[note_name]
+        except KeyError:
+            raise ValueError(f"{note_name} is not a note") from None
 
     def list_of_midi_notes(self, note_name, low_range=-1, high_range=128):
         '''Return a list of midi note values for a give note name'''
@@ -0,0 +1,88 @@
+"""Note events -- trials with a rhythm of their own
+
+A rhythmic trial is a numpy structured array, one 10 byte record per note:  its onset and
+duration in beats from the start of the trial, its MIDI velocity and its MIDI pitch.
+Whole trials are built, played and written a column at a time, not a note at a time.
+"""
+
+import random
+
+# One record per note.  Beats are float32, plenty for a trial's worth of sixteenths.
+NOTE_EVENT_FIELDS = [('onset', '<f4'), ('duration', '<f4'), ('velocity', 'u1'), ('pitch', 'u1')]
+
+# Rhythm cells:  (length in beats, ((onset, duration), ...)).  Rests are just the gaps.
+RHYTHM_CELLS = {
+    'quarter': (1, ((0, 1),)),
+    'half': (2, ((0, 2),)),
+    'eighths': (1, ((0, 0.5), (0.5, 0.5))),
+    'dotted': (1, ((0, 0.75), (0.75, 0.25))),
+    'sixteenths': (1, ((0, 0.25), (0.25, 0.25), (0.5, 0.25), (0.75, 0.25))),
+    'triplet': (1, ((0, 1 / 3), (1 / 3, 1 / 3), (2 / 3, 1 / 3))),
+    'syncopation': (2, ((0, 0.5), (0.5, 1), (1.5, 0.5))),
+    'offbeat': (1, ((0.5, 0.5),))
+}
+
+# Velocities:  the first note of the trial, notes on the beat, and everything else
+ACCENT_VELOCITY = 112
+BEAT_VELOCITY = 96
+OFFBEAT_VELOCITY = 80
+
+
+def new_note_events(count):
+    """An empty (zeroed) array of count note events"""
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    return np.zeros(count, dtype=NOTE_EVENT_FIELDS)
+
+
+def build_rhythm(cell_names, note_count):
+    """Onsets and durations (beats) for note_count notes, from randomly chosen cells"""
+
+    onsets = []
+    durations = []
+    start = 0
+    while len(onsets) < note_count:
+        length, notes = RHYTHM_CELLS[random.choice(cell_names)]
+        for onset, duration in notes:
+            onsets.append(start + onset)
+            durations.append(duration)
+        start += length
+
+    # The last cell may be cut short.
+    return onsets[:note_count], durations[:note_count]
+
+
+def build_note_events(pitches, cell_names):
+    """Note events playing the pitches, in a rhythm built from the named cells"""
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    events = new_note_events(len(pitches))
+    events['onset'], events['duration'] = build_rhythm(cell_names, len(pitches))
+    events['pitch'] = pitches
+
+    # Accent the downbeat, lean on the beats
+    events['velocity'] = np.where(events['onset'] % 1 == 0, BEAT_VELOCITY, OFFBEAT_VELOCITY)
+    if len(events) > 0 and events['onset'][0] == 0:
+        events['velocity'][0] = ACCENT_VELOCITY
+
+    return events
+
+
+def get_events_end(events):
+    """Beats from the start of the events to the end of the last note"""
+
+    if len(events) == 0:
+        return 0.0
+
+    return float((events['onset'] + events['duration']).max())
+
+
+def reverse_pitches(events):
+    """The same rhythm, with the pitches played backwards"""
+
+    reversed_events = events.copy()
+    reversed_events['pitch'] = events['pitch'][::-1]
+
+    return reversed_events
@@ -0,0 +1,388 @@
+"""Pitch detection -- score sung notes by ear, instead of asking
+
+Audio comes in blocks (from a microphone, or a WAV file for testing).  A PitchDetector
+keeps the latest frame in a ring buffer and, every hop, runs YIN over it to estimate
+the pitch.  A PitchScorer listens while a note is being sung and scores it 1-4
+against the target, the same scale the student would have typed.
+
+    python -m src.pitchdetector sung.wav [target midi note]
+"""
+
+import math
+import sys
+import wave
+from typing import NamedTuple
+
+A4_FREQUENCY = 440.0
+A4_MIDI = 69
+
+# Cents off the target (at most) for a score of 4, 3, and 2.  Anything worse is a 1.
+SCORE_CENTS_LIMITS = [(4, 25), (3, 50), (2, 100)]
+
+# Fewer voiced frames than this and nothing was really sung.
+MIN_VOICED_FRAMES = 5
+
+# RMS level (full scale is 1) under which the newest hop is silence, about -50dB
+SILENCE_LEVEL = 0.003
+
+# Samples per read from a source
+BLOCK_SIZE = 512
+
+
+def frequency_to_midi(frequency):
+    """Fractional midi note for a frequency"""
+
+    return A4_MIDI + 12 * math.log2(frequency / A4_FREQUENCY)
+
+
+def midi_to_frequency(midi_note):
+    """Frequency of a (fractional) midi note"""
+
+    return A4_FREQUENCY * 2 ** ((midi_note - A4_MIDI) / 12)
+
+
+class PitchEstimate(NamedTuple):
+    """The pitch of one frame"""
+
+    time: float         # Seconds into the stream of the frame's last sample
+    frequency: float
+    midi: int           # Nearest midi note
+    cents: float        # Off the nearest note, -50 to 50
+    confidence: float   # 1 - YIN's normalized difference at the chosen period, 0 to 1
+
+
+class PitchDetector:
+    """Streaming YIN pitch detection
+
+    Feed it blocks of any size.  An estimate is made every hop_size samples, over the
+    last frame_size samples, so an estimate is never more than get_latency() behind.
+    """
+
+    def __init__(self, sample_rate=44100, frame_size=2048, hop_size=512,
+                 min_frequency=70.0, max_frequency=1000.0, threshold=0.15):
+
+        # Only needed when listening, not for starting up.
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        self.np = np
+
+        if hop_size > frame_size:
+            raise ValueError("hop_size can't be bigger than frame_size")
+
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self.threshold = threshold
+
+        # Periods (in samples) we look for.  YIN compares half the frame with itself.
+        self.window_size = frame_size // 2
+        self.min_period = max(2, int(sample_rate / max_frequency))
+        self.max_period = min(self.window_size - 1, int(math.ceil(sample_rate / min_frequency)))
+        if self.min_period >= self.max_period:
+            raise ValueError("Frame too short for the frequency range")
+
+        # FFT size for the correlation, without wrap around
+        self.fft_size = 1 << (frame_size + self.window_size - 1).bit_length()
+
+        # Ring buffer, written twice over so the latest frame is always one contiguous slice.
+        self.ring = np.zeros(2 * frame_size)
+        self.position = 0               # Next write, and so the start of the latest frame
+        self.sample_count = 0           # Total samples seen
+        self.samples_to_hop = hop_size
+
+    def get_latency(self):
+        """Worst case seconds from a sample arriving to an estimate that includes it"""
+
+        return (self.frame_size + self.hop_size) / self.sample_rate
+
+    def write(self, samples):
+        """Add samples (no more than a frame) to the ring buffer"""
+
+        indices = (self.position + self.np.arange(len(samples))) % self.frame_size
+        self.ring[indices] = samples
+        self.ring[indices + self.frame_size] = samples
+        self.position = (self.position + len(samples)) % self.frame_size
+        self.sample_count += len(samples)
+
+    def get_frame(self):
+        """The latest frame, oldest sample first"""
+
+        return self.ring[self.position:self.position + self.frame_size]
+
+    def process_block(self, block):
+        """Add a block of samples.  Return the estimates for every hop it completes."""
+
+        block = self.np.asarray(block, dtype=float)
+
+        estimates = []
+        while len(block) > 0:
+            count = min(len(block), self.samples_to_hop)
+            self.write(block[:count])
+            block = block[count:]
+
+            self.samples_to_hop -= count
+            if self.samples_to_hop > 0:
+                continue
+
+            # Time for an estimate, once there's a whole frame
+            self.samples_to_hop = self.hop_size
+            if self.sample_count >= self.frame_size:
+                estimate = self.estimate(self.get_frame())
+                if estimate is not None:
+                    estimates.append(estimate)
+
+        return estimates
+
+    def estimate(self, frame):
+        """YIN estimate of a frame's pitch, or None if it isn't voiced"""
+
+        np = self.np
+        window_size = self.window_size
+        max_period = self.max_period
+
+        # Too quiet to be singing, or the note has stopped (the newest hop is silent).
+        #  - otherwise a frame spans the gap between two notes, and they run together
+        energies = np.concatenate(([0.0], np.cumsum(frame * frame)))
+        hop_energy = energies[-1] - energies[-1 - self.hop_size]
+        if energies[window_size] < 1e-6 * window_size or \
+                hop_energy < SILENCE_LEVEL ** 2 * self.hop_size:
+            return None
+
+        # Difference function, d(t) = sum (x[j] - x[j + t])^2 over the window,
+        # from the energies and an FFT cross correlation.
+        spectrum = np.fft.rfft(frame, self.fft_size)
+        window_spectrum = np.fft.rfft(frame[:window_size], self.fft_size)
+        correlation = np.fft.irfft(spectrum * np.conj(window_spectrum),
+                                   self.fft_size)[:max_period + 1]
+        shifted_energies = energies[window_size:window_size + max_period + 1] - \
+            energies[:max_period + 1]
+        difference = energies[window_size] + shifted_energies - 2 * correlation
+        difference[0] = 0.0
+
+        # Cumulative mean normalized difference
+        normalized = np.ones(max_period + 1)
+        running_sum = np.cumsum(difference[1:])
+        running_sum[running_sum == 0] = 1e-12
+        normalized[1:] = difference[1:] * np.arange(1, max_period + 1) / running_sum
+
+        # The first dip under the threshold, followed down to its minimum
+        candidates = np.nonzero(normalized[self.min_period:max_period] < self.threshold)[0]
+        if len(candidates) == 0:
+            return None
+        period = candidates[0] + self.min_period
+        while period + 1 < max_period and normalized[period + 1] < normalized[period]:
+            period += 1
+
+        # Parabolic interpolation for a fractional period
+        before, at, after = normalized[period - 1:period + 2]
+        curvature = before - 2 * at + after
+        offset = 0.5 * (before - after) / curvature if curvature > 0 else 0.0
+
+        frequency = self.sample_rate / (period + offset)
+        midi = frequency_to_midi(frequency)
+        nearest = round(midi)
+
+        return PitchEstimate(self.sample_count / self.sample_rate, frequency, nearest,
+                             100 * (midi - nearest), float(max(0.0, 1 - at)))
+
+
+def score_sung_note(estimates, target_note):
+    """Score (1-4) the estimates of a sung note against the target, None if nothing was sung
+
+    Octaves don't count against the singer, the target may well be out of their range.
+    """
+
+    if len(estimates) < MIN_VOICED_FRAMES:
+        return None
+
+    # The median rides out the slide in and out of the note.
+    pitches = sorted(estimate.midi + estimate.cents / 100 for estimate in estimates)
+    sung_pitch = pitches[len(pitches) // 2]
+    cents_off = abs((sung_pitch - target_note + 6) % 12 - 6) * 100
+
+    for score, cents_limit in SCORE_CENTS_LIMITS:
+        if cents_off <= cents_limit:
+            return score
+
+    return 1
+
+
+def decode_pcm(data, sample_width, channels):
+    """PCM WAV frames as mono samples from -1 to 1"""
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(float) - 128) / 128
+    elif sample_width in (2, 4):
+        dtype = np.dtype(f'<i{sample_width}')
+        samples = np.frombuffer(data, dtype=dtype).astype(float) / 2 ** (8 * sample_width - 1)
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width} bytes")
+
+    # Mix down to mono
+    return samples.reshape(-1, channels).mean(axis=1)
+
+
+def read_wav(filename):
+    """Read a whole PCM WAV file.  Return (mono samples from -1 to 1, sample rate)"""
+
+    with wave.open(filename, 'rb') as wav_file:
+        data = wav_file.readframes(wav_file.getnframes())
+        return decode_pcm(data, wav_file.getsampwidth(), wav_file.getnchannels()), \
+            wav_file.getframerate()
+
+
+def iter_wav_blocks(filename, block_size=BLOCK_SIZE):
+    """Stream a PCM WAV file.  Yield the sample rate, then blocks of mono samples.
+
+    Only a block is ever in memory, so hours long recordings are fine.
+    """
+
+    with wave.open(filename, 'rb') as wav_file:
+        yield wav_file.getframerate()
+
+        while True:
+            data = wav_file.readframes(block_size)
+            if len(data) == 0:
+                return
+            yield decode_pcm(data, wav_file.getsampwidth(), wav_file.getnchannels())
+
+
+def write_wav(filename, samples, sample_rate):
+    """Write mono samples (-1 to 1) as a 16 bit PCM WAV file"""
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    pcm = np.clip(np.round(np.asarray(samples) * 32767), -32768, 32767).astype('<i2')
+    with wave.open(filename, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+
+
+class WavSource:
+    """Audio from a WAV file, a block at a time -- a stand in for the microphone"""
+
+    def __init__(self, filename):
+
+        self.samples, self.sample_rate = read_wav(filename)
+        self.position = 0
+
+    def read(self, count):
+        """The next count samples.  Silence once the file runs out."""
+
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        block = self.samples[self.position:self.position + count]
+        self.position += count
+
+        return np.pad(block, (0, count - len(block)))
+
+
+class MicrophoneSource:
+    """Audio from the default input device (needs the optional sounddevice module)"""
+
+    def __init__(self, sample_rate=44100):
+
+        import sounddevice  # pylint: disable=import-outside-toplevel,import-error
+
+        self.sample_rate = sample_rate
+        self.stream = sounddevice.InputStream(samplerate=sample_rate, channels=1,
+                                              dtype='float32', blocksize=BLOCK_SIZE)
+        self.stream.start()
+
+    def read(self, count):
+        """The next count samples (blocks until they've been recorded)"""
+
+        block, _ = self.stream.read(count)
+        return block[:, 0]
+
+    def close(self):
+        """Stop recording"""
+
+        self.stream.stop()
+        self.stream.close()
+
+
+class PitchScorer:
+    """Listen to a sung note and score it"""
+
+    def __init__(self, source, tempo=120):
+
+        # Where the audio comes from:  anything with a sample_rate and read(count).
+        self.source = source
+
+        # Pauses are in beats, at the audio backend's tempo.
+        self.tempo = tempo
+
+    def listen(self, target_note, beats):
+        """Listen for beats and score the note sung.  None if nothing was sung."""
+
+        detector = PitchDetector(self.source.sample_rate)
+        remaining = int(beats * 60 / self.tempo * self.source.sample_rate)
+
+        estimates = []
+        while remaining > 0:
+            count = min(BLOCK_SIZE, remaining)
+            estimates.extend(detector.process_block(self.source.read(count)))
+            remaining -= count
+
+        return score_sung_note(estimates, target_note)
+
+
+def detect_file(filename, **detector_options):
+    """Pitch estimates for a whole WAV file, streamed through the detector"""
+
+    blocks = iter_wav_blocks(filename)
+    detector = PitchDetector(next(blocks), **detector_options)
+
+    estimates = []
+    for block in blocks:
+        estimates.extend(detector.process_block(block))
+
+    return estimates
+
+
+def segment_notes(estimates, max_gap, min_frames=MIN_VOICED_FRAMES):
+    """Split estimates into notes:  runs on the same midi note, with no gap over max_gap seconds
+
+    Return [(onset time, midi note)].  Runs shorter than min_frames are slides and glitches.
+    """
+
+    notes = []
+
+    # Helper Inner Functions
+    def end_run(run):
+        if len(run) >= min_frames:
+            notes.append((run[0].time, run[0].midi))
+
+    run = []
+    for estimate in estimates:
+        if len(run) > 0 and (estimate.midi != run[-1].midi or
+                             estimate.time - run[-1].time > max_gap):
+            end_run(run)
+            run = []
+        run.append(estimate)
+    end_run(run)
+
+    return notes
+
+
+def main():
+    """Print the pitches in a WAV file, and score it if given a target note"""
+
+    estimates = detect_file(sys.argv[1])
+    for estimate in estimates:
+        print(f"{estimate.time:8.3f}s {estimate.frequency:8.2f}Hz "
+              f"{estimate.midi:4d} {estimate.cents:+6.1f}c {estimate.confidence:.2f}")
+
+    if len(sys.argv) > 2:
+        print(f"Score: {score_sung_note(estimates, int(sys.argv[2]))}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
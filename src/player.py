@@ -3,11 +3,11 @@
 import time
 
 from enum import Enum
-from scamp import Session
-from scamp import wait
 
+from src.audiobackend import ScampAudioBackend
 from src.keypresshelper import key_press_message, any_key_press
 from src.exercisepackage import ExercisePackage, ExerciseType
+from src.noteevents import reverse_pitches
 from src.scoreboard import Scoreboard
 
 
@@ -15,23 +15,33 @@ class PlayerConst(float, Enum):
     """Namespace for constants"""
 
     NO_CLIP_PAUSE = 2
+    DRONE_VOLUME = 0.4      # Under the trial notes, not over them
 
 
 class Player:
     """The thing that plays the notes"""
 
-    def __init__(self):
+    def __init__(self, audio=None, pitch_scorer=None):
 
-        # Create and configure the session and part.
-        self.session = Session(tempo=120)
-        self.part = self.session.new_part("Clarinet")
+        # Where the notes go.  A scamp session, unless we're told otherwise.
+        if audio is None:
+            audio = ScampAudioBackend()
+        self.audio = audio
+
+        # Scores sung intervals by ear (a PitchScorer).  None means the student scores them.
+        self.pitch_scorer = pitch_scorer
 
         # Playback settings
         self.volume = 1
         self.duration = 1
 
+        # What the drone is sustaining (nothing, when it's silent)
+        self.drone_notes = ()
+
     def __del__(self):
-        self.session.kill()     # Cleanup the session
+        # Cleanup the session (if it ever got started)
+        if hasattr(self, 'audio'):
+            self.audio.close()
 
     def do_key_pause(self, message, options):
         """Whenever we need to pause and wait for keyboard input"""
@@ -40,17 +50,48 @@ class Player:
         pressed_key = key_press_message(message, options)
 
         # Wait so the first note isn't clipped
-        wait(PlayerConst.NO_CLIP_PAUSE)
+        self.audio.wait(PlayerConst.NO_CLIP_PAUSE)
 
         return pressed_key
 
-    def play(self, package: ExercisePackage, scoreboard: Scoreboard, duration):
-        """Play the notes defined in the trial_sets list"""
+    def set_drone(self, notes):
+        """Sustain notes under everything played from now on.  No notes for silence."""
+
+        notes = tuple(notes)
+        if notes == self.drone_notes:
+            return      # Already sounding, don't retrigger it
+
+        if len(self.drone_notes) > 0:
+            self.audio.stop_drone()
+        if len(notes) > 0:
+            self.audio.start_drone(notes, PlayerConst.DRONE_VOLUME)
+        self.drone_notes = notes
+
+    def play(self, package: ExercisePackage, scoreboard: Scoreboard, duration,
+             on_score=None):
+        """Play the notes defined in the trial_sets list
+
+        on_score, if given, is called with (trial label, score) as each trial set is scored.
+        """
+
+        try:
+            self.play_trial_sets(package, scoreboard, duration, on_score)
+        finally:
+            # However we left, the drone stops with the exercise.
+            self.set_drone(())
+
+    def play_trial_sets(self, package: ExercisePackage, scoreboard: Scoreboard, duration,
+                        on_score=None):
+        """Play the trial sets, one after another"""
 
         # Helper Inner Functions
         def play_full_trial(trial):
+            if package.get_exercise_type() == ExerciseType.RHYTHM:
+                # Note events:  the backend times every note from the start of the trial
+                self.audio.play_events(trial)
+                return
             for note in trial:
-                self.part.play_note(note, self.volume, self.duration)
+                self.audio.play_note(note, self.volume, self.duration)
 
         def play_interval_trial(trial):
 
@@ -60,24 +101,29 @@ class Player:
             note1 = trial[0]
             note2 = trial[1]
 
-            # Play the first note and wait
-            self.part.play_note(note1, self.volume, self.duration)
-            wait(package.get_interval_pause())
+            # Play the first note and wait (listening, if we can)
+            self.audio.play_note(note1, self.volume, self.duration)
+            if self.pitch_scorer is None:
+                self.audio.wait(package.get_interval_pause())
+            else:
+                sung_score = self.pitch_scorer.listen(note2, package.get_interval_pause())
+                if sung_score is not None:
+                    sung_scores.append(sung_score)
 
             if package.get_mid_trial_prompt_enabled():
                 any_key_press("Press space when ready...")
-                wait(PlayerConst.NO_CLIP_PAUSE)
+                self.audio.wait(PlayerConst.NO_CLIP_PAUSE)
 
             # Play the answer and briefly wait.
-            self.part.play_note(note2, self.volume, self.duration)
+            self.audio.play_note(note2, self.volume, self.duration)
             if package.get_trial_repeat_enabled():
-                wait(package.get_trial_repeat_pause())
+                self.audio.wait(package.get_trial_repeat_pause())
 
             # And repeat
-            self.part.play_note(note1, self.volume, self.duration)
-            self.part.play_note(note2, self.volume, self.duration)
+            self.audio.play_note(note1, self.volume, self.duration)
+            self.audio.play_note(note2, self.volume, self.duration)
             # Pause before the next trial
-            wait(package.get_post_trial_pause())
+            self.audio.wait(package.get_post_trial_pause())
 
         start_time = time.time()
         test_name = package.get_test_name()
@@ -103,6 +149,12 @@ class Player:
                 f"Trial #{human_index} of {len(package)} [{remain_time_string}]")
             print(trial_definition)
 
+            # Sound the key under the trial set, heard while getting ready.
+            self.set_drone(package.get_drone_notes(trial_set_index))
+
+            # Scores for the notes sung in this trial set
+            sung_scores = []
+
             # Let the user get ready.
             if self.do_key_pause("Press SPACE to start or 'x' to exit...", ["space", "x"]) == "x":
                 return
@@ -118,7 +170,7 @@ class Player:
                     play_interval_trial(trial)
                     continue
 
-                elif package.get_exercise_type() == ExerciseType.SERIES:
+                elif package.get_exercise_type() in (ExerciseType.SERIES, ExerciseType.RHYTHM):
 
                     # Play through all the notes in the trial.
                     play_full_trial(trial)
@@ -134,7 +186,10 @@ class Player:
                                 play_full_trial(trial)
                                 continue
                             elif response == "v":
-                                reverse_trial = reversed(trial)
+                                if package.get_exercise_type() == ExerciseType.RHYTHM:
+                                    reverse_trial = reverse_pitches(trial)  # Same rhythm
+                                else:
+                                    reverse_trial = reversed(trial)
                                 play_full_trial(reverse_trial)
                                 continue
                             elif response == "x":
@@ -144,18 +199,24 @@ class Player:
 
                     # If the option to repeat trials is selected, repeat it.
                     if package.get_trial_repeat_enabled():
-                        wait(package.get_trial_repeat_pause())
+                        self.audio.wait(package.get_trial_repeat_pause())
                         play_full_trial(trial)
 
                     # Pause before the next trial
-                    wait(package.get_post_trial_pause())
+                    self.audio.wait(package.get_post_trial_pause())
 
                 else:
                     # An undefined type of exercise was requested
                     raise IndexError
 
-            # Score it here
+            # Score it here.  By ear if anything was heard, otherwise ask.
             if package.get_scoring_enabled():
-                score = self.do_key_pause(
-                    "Score (1-4):", ["1", "2", "3", "4"])
+                if len(sung_scores) > 0:
+                    score = round(sum(sung_scores) / len(sung_scores))
+                    print(f"Score: {score}")
+                else:
+                    score = self.do_key_pause(
+                        "Score (1-4):", ["1", "2", "3", "4"])
                 scoreboard.append_score(test_name, trial_label, int(score))
+                if on_score is not None:
+                    on_score(trial_label, int(score))
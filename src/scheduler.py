@@ -0,0 +1,125 @@
+"""Spaced repetition scheduling of exercises"""
+
+import heapq
+import itertools
+import time
+
+from src.scoreboard import Scoreboard
+
+
+class PracticeScheduler:
+    """Priority queue of (exercise, element) pairs, ordered by due time, then difficulty.
+
+    Every pair has a repeat interval that grows when it's scored well and resets when
+    it's scored poorly.  Stale heap entries are skipped on pop rather than removed, so
+    pop and reschedule are both O(log n).
+    """
+
+    FIRST_INTERVAL = 60         # 1 minute, in seconds
+    INTERVAL_GROWTH = 2.0
+    MAX_INTERVAL = 86400        # 1 day, in seconds
+
+    # Element used for exercises that don't score individual elements.
+    EXERCISE_ELEMENT = ''
+
+    def __init__(self) -> None:
+
+        # Heap entries are (due time, difficulty, sequence, exercise name, element).
+        #  - Difficulty is the raw score, so lower (harder) goes first on a tie.
+        self.heap = []
+        self.sequence = itertools.count()
+
+        # Live state for each pair:  [sequence of its live heap entry, interval, difficulty]
+        self.pairs = {}
+
+    def __len__(self):
+        """Number of scheduled pairs"""
+
+        return len(self.pairs)
+
+    def push(self, exercise_name, element, due_time, difficulty, interval):
+        """(Re)schedule a pair.  Any older heap entry for it becomes stale."""
+
+        sequence = next(self.sequence)
+        self.pairs[(exercise_name, element)] = [sequence, interval, difficulty]
+        heapq.heappush(self.heap, (due_time, difficulty, sequence, exercise_name, element))
+
+    def add_exercises(self, exercise_names, scoreboard: Scoreboard, now=None):
+        """Schedule every scored element of the named exercises, all due now"""
+
+        if now is None:
+            now = time.time()
+
+        # One pass over the scoreboard for all the exercises.
+        exercise_names = set(exercise_names)
+        scored_names = set()
+        entries = []
+        for score_key in scoreboard.persistant_scores:
+            exercise_name, element = score_key.split(Scoreboard.SCORE_DELIMITER, 1)
+            if exercise_name in exercise_names:
+                scored_names.add(exercise_name)
+                entries.append((exercise_name, element,
+                                scoreboard.get_raw_element_score(score_key)))
+
+        # Exercises without scores are scheduled as a whole.
+        for exercise_name in exercise_names - scored_names:
+            entries.append((exercise_name, PracticeScheduler.EXERCISE_ELEMENT, 1))
+
+        for exercise_name, element, difficulty in entries:
+            sequence = next(self.sequence)
+            self.pairs[(exercise_name, element)] = [
+                sequence, PracticeScheduler.FIRST_INTERVAL, difficulty]
+            self.heap.append((now, difficulty, sequence, exercise_name, element))
+
+        heapq.heapify(self.heap)
+
+    def pop_next(self, allowed_exercises=None):
+        """Remove and return the next (exercise name, element) due.
+
+        If allowed_exercises is given, pairs of other exercises are passed over (and
+        stay scheduled).  Returns None if there's nothing to pop.
+        """
+
+        passed_over = []
+        next_pair = None
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            _, _, sequence, exercise_name, element = entry
+
+            pair = self.pairs.get((exercise_name, element))
+            if pair is None or pair[0] != sequence:
+                continue    # Stale
+
+            if allowed_exercises is not None and exercise_name not in allowed_exercises:
+                passed_over.append(entry)
+                continue
+
+            next_pair = (exercise_name, element)
+            break
+
+        for entry in passed_over:
+            heapq.heappush(self.heap, entry)
+
+        return next_pair
+
+    def reschedule(self, exercise_name, element, score=None, now=None):
+        """Put a popped pair back, due after its updated interval.
+
+        score is the pair's raw score after practicing it, or None if it isn't scored.
+        """
+
+        if now is None:
+            now = time.time()
+
+        _, interval, difficulty = self.pairs[(exercise_name, element)]
+
+        if score is None or score >= Scoreboard.SCORE_PROMOTE:
+            interval = min(interval * PracticeScheduler.INTERVAL_GROWTH,
+                           PracticeScheduler.MAX_INTERVAL)
+        elif score <= Scoreboard.SCORE_DEMOTE:
+            interval = PracticeScheduler.FIRST_INTERVAL
+
+        if score is not None:
+            difficulty = score
+
+        self.push(exercise_name, element, now + interval, difficulty, interval)
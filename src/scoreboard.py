@@ -1,7 +1,9 @@
 """Class for tracking performance"""
 
 import json
+import os
 
+from src.backgroundwriter import BackgroundWriter
 from src.scorehistory import ScoreHistory
 
 
@@ -12,12 +14,27 @@ class Scoreboard:
     SCORE_DELIMITER = ':'
     SCORE_PROMOTE = 3.8
     SCORE_DEMOTE = 2.0
+    SCORES_FILENAME = 'scores.json'
 
-    def __init__(self) -> None:
+    def __init__(self, writer: BackgroundWriter = None, directory='.',
+                 score_promote=SCORE_PROMOTE, score_demote=SCORE_DEMOTE) -> None:
 
         # Dictionary for score results
         self.persistant_scores = {}
 
+        # Raw score thresholds for promotion/demotion candidates
+        self.score_promote = score_promote
+        self.score_demote = score_demote
+
+        # Where file writes happen.  None means write immediately, on this thread.
+        self.writer = writer
+
+        # Where the score files live
+        self.scores_filename = os.path.join(directory, Scoreboard.SCORES_FILENAME)
+
+        # Long lived, so history writes can be batched across exercises.
+        self.history = ScoreHistory(writer, directory)
+
     def get_test_prefix(self, name, element):
         """Standardize dictionary key naming"""
 
@@ -79,6 +96,16 @@ class Scoreboard:
 
         return 1
 
+    def get_candidate_status(self, score):
+        """1 for a promotion candidate, -1 for a demotion candidate, otherwise 0"""
+
+        if score >= self.score_promote:
+            return 1
+        if score <= self.score_demote:
+            return -1
+
+        return 0
+
     def output_scores(self, test_name, element_list):
         """Show the scores for the provided test name"""
 
@@ -98,9 +125,8 @@ class Scoreboard:
         print("Updated Scores")
         print("--------------")
 
-        promote_str = "Promotion Candidate"
-        demote_str = "Demotion Candidate"
-        nada_str = ''
+        # Indexed by candidate status
+        pdn_strings = {1: "Promotion Candidate", -1: "Demotion Candidate", 0: ''}
         for key, score in sorted_dictionary.items():
 
             # Build the "dot" string
@@ -111,17 +137,12 @@ class Scoreboard:
                 dot_count -= 1
 
             # Choose the promote/demote/nada string
-            pdn_str = nada_str
-            if score >= Scoreboard.SCORE_PROMOTE:
-                pdn_str = promote_str
-            elif score <= Scoreboard.SCORE_DEMOTE:
-                pdn_str = demote_str
+            pdn_str = pdn_strings[self.get_candidate_status(score)]
 
             print(f"{key}  {dot_string}  {score:.3f} {pdn_str}")
 
         # Capture for posterity
-        sh = ScoreHistory()
-        sh.append_to_history(sorted_dictionary)
+        self.history.append_to_history(sorted_dictionary)
 
     def open(self):
         """Read the scores from a saved file"""
@@ -130,7 +151,7 @@ class Scoreboard:
         self.persistant_scores.clear()
 
         try:
-            with open('scores.json', 'r', encoding="utf-8") as score_file:
+            with open(self.scores_filename, 'r', encoding="utf-8") as score_file:
                 self.persistant_scores = json.load(score_file)
         except FileNotFoundError:
             return
@@ -138,8 +159,24 @@ class Scoreboard:
     def save(self):
         """Write the persistant scores to a file"""
 
-        with open('scores.json', 'w', encoding="utf-8") as score_file:
-            score_file.write(json.dumps(self.persistant_scores))
+        # Snapshot now, the scores keep changing while the write is queued.
+        score_json = json.dumps(self.persistant_scores)
+
+        if self.writer is None:
+            self.write_scores(score_json)
+        else:
+            self.writer.submit(self.write_scores, score_json)
+
+    def write_scores(self, score_json):
+        """Write the serialized scores to the file"""
+
+        with open(self.scores_filename, 'w', encoding="utf-8") as score_file:
+            score_file.write(score_json)
+
+    def close(self):
+        """Write out anything still buffered"""
+
+        self.history.flush()
 
     def __str__(self):
         """An output to screen method"""
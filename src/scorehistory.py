@@ -1,8 +1,10 @@
 """Class for tracking score and displaying score history"""
 
 import csv
+import logging
+import os
+import struct
 import time
-import pandas as pd
 
 
 class ScoreHistory:
@@ -10,8 +12,43 @@ class ScoreHistory:
 
     HISTORY_FILENAME = 'scorehistory.csv'
 
-    def __init__(self):
-        pass
+    # Fixed width binary copy of the history.  Every record is the same size, so the
+    # file can be memory mapped and sliced by record index without parsing anything.
+    BINARY_HISTORY_FILENAME = 'scorehistory.bin'
+    KEY_WIDTH = 64
+    RECORD_STRUCT = struct.Struct(f'<{KEY_WIDTH}sdd')
+
+    # Records are buffered and written out once either of these is reached.
+    FLUSH_RECORD_COUNT = 500
+    FLUSH_INTERVAL = 300    # 5 minutes, in seconds
+
+    def __init__(self, writer=None, directory='.'):
+
+        # The history files live in directory
+        self.history_filename = os.path.join(directory, ScoreHistory.HISTORY_FILENAME)
+        self.binary_history_filename = os.path.join(
+            directory, ScoreHistory.BINARY_HISTORY_FILENAME)
+
+        # Where file writes happen (a BackgroundWriter).  None means write immediately.
+        self.writer = writer
+
+        # Records waiting to be written
+        self.buffer = []
+        self.last_flush_time = time.time()
+
+        # Has the first write of the session checked for a csv history to convert?
+        self.binary_checked = False
+
+    def get_record_dtype(self):
+        """The numpy dtype matching RECORD_STRUCT"""
+
+        # numpy (and pandas) are only needed for the analytics side of the history, so
+        # they're imported on first use rather than slowing down application startup.
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        return np.dtype([('key', f'S{ScoreHistory.KEY_WIDTH}'),
+                         ('score', '<f8'),
+                         ('timestamp', '<f8')])
 
     def append_to_history(self, scores: dict):
         """Take the passed dictionary and append to the scores"""
@@ -19,21 +56,149 @@ class ScoreHistory:
         # Get the current time
         timestamp = time.time()
 
-        # Build the list to write
-        csv_list = []
+        # Check the keys now, on the caller's thread.  Once a batch is being written it's
+        # too late:  the csv would get rows the binary history can't hold.
+        for key in scores:
+            self.validate_key(key)
+
+        # Add to the buffer
         for key, score in scores.items():
             score_record = [key, score, timestamp]
-            csv_list.append(score_record)
+            self.buffer.append(score_record)
+
+        # Time to write it out?
+        if len(self.buffer) >= ScoreHistory.FLUSH_RECORD_COUNT or \
+                timestamp - self.last_flush_time >= ScoreHistory.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered records to the history files"""
+
+        self.last_flush_time = time.time()
+        if len(self.buffer) == 0:
+            return
+
+        # Hand the current buffer off and start a new one.
+        records = self.buffer
+        self.buffer = []
+
+        if self.writer is None:
+            self.write_records(records)
+        else:
+            self.writer.submit(self.write_records, records)
+
+    def write_records(self, records):
+        """Append records to the history files"""
+
+        # The first write of a session, is there a csv history from before there was a
+        # binary one?  Once there is, the two are always appended together, so that's
+        # a one time conversion, and no need to read the csv again.
+        backfill = False
+        if not self.binary_checked:
+            self.binary_checked = True
+            backfill = os.path.exists(self.history_filename) and \
+                not os.path.exists(self.binary_history_filename)
 
         # Open the score history file.
-        with open(ScoreHistory.HISTORY_FILENAME, 'a', newline='', encoding="utf-8") as csvfile:
+        with open(self.history_filename, 'a', newline='', encoding="utf-8") as csvfile:
             csv_writer = csv.writer(csvfile)
-            csv_writer.writerows(csv_list)
-            csvfile.close()
+            csv_writer.writerows(records)
+
+        # And the binary copy.  Rebuilt whole if it's behind, these records included.
+        if backfill:
+            self.convert_to_binary()
+        else:
+            self.append_to_binary_history(records)
+
+        logging.info("History saved: %d records", len(records))
+
+    def validate_key(self, key):
+        """Raise ValueError if the key won't fit in a history record.  Returns it encoded."""
+
+        encoded_key = key.encode("utf-8")
+        if len(encoded_key) > ScoreHistory.KEY_WIDTH:
+            raise ValueError(f"Score key too long for history record: {key}")
+
+        return encoded_key
 
-        print('History saved.')
+    def pack_record(self, key, score, timestamp):
+        """Encode a single history record in the fixed width format"""
 
-    def get_dataframe(self):
+        return ScoreHistory.RECORD_STRUCT.pack(self.validate_key(key), float(score),
+                                               float(timestamp))
+
+    def append_to_binary_history(self, records):
+        """Append [key, score, timestamp] records to the binary history"""
+
+        packed_records = b''.join(self.pack_record(key, score, timestamp)
+                                  for key, score, timestamp in records)
+
+        with open(self.binary_history_filename, 'ab') as binfile:
+            binfile.write(packed_records)
+
+    def convert_to_binary(self):
+        """Rebuild the binary history from the csv history"""
+
+        # Stream it across so we never hold the whole history in memory.
+        with open(self.history_filename, 'r', newline='', encoding="utf-8") as csvfile, \
+                open(self.binary_history_filename, 'wb') as binfile:
+            for key, score, timestamp in csv.reader(csvfile):
+                binfile.write(self.pack_record(key, score, timestamp))
+
+    def get_record_count(self):
+        """How many records are in the binary history"""
+
+        try:
+            file_size = os.path.getsize(self.binary_history_filename)
+        except FileNotFoundError:
+            return 0
+
+        return file_size // ScoreHistory.RECORD_STRUCT.size
+
+    def get_records(self, start=None, stop=None):
+        """Memory mapped view of the binary history records [start:stop]"""
+
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        # Only whole records are mapped, in case a write was interrupted.
+        record_count = self.get_record_count()
+        if record_count == 0:
+            return np.empty(0, dtype=self.get_record_dtype())
+
+        records = np.memmap(self.binary_history_filename, mode='r',
+                            dtype=self.get_record_dtype(), shape=(record_count,))
+
+        # Slicing a memmap is a view, so only the touched pages are read.
+        return records[start:stop]
+
+    def get_time_range(self, start_time, end_time):
+        """Memory mapped view of the records with start_time <= timestamp < end_time"""
+
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        records = self.get_records()
+
+        # Records are appended in time order, so a binary search finds the range.
+        timestamps = records['timestamp']
+        start = np.searchsorted(timestamps, start_time, side='left')
+        stop = np.searchsorted(timestamps, end_time, side='left')
+
+        return records[start:stop]
+
+    def get_dataframe(self, start=None, stop=None):
         """Get the df for visualization purposes"""
 
-        return pd.read_csv(ScoreHistory.HISTORY_FILENAME, header=None)
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        # Without a binary history, fall back to parsing the csv.
+        if not os.path.exists(self.binary_history_filename):
+            return pd.read_csv(self.history_filename, header=None)[start:stop]
+
+        # Same layout as the csv:  key, score, timestamp
+        records = self.get_records(start, stop)
+        return pd.DataFrame({
+            0: np.char.decode(records['key'], "utf-8"),
+            1: records['score'],
+            2: records['timestamp']
+        })
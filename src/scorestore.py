@@ -0,0 +1,98 @@
+"""Per-student score storage"""
+
+from collections import OrderedDict
+import os
+import re
+
+from src.backgroundwriter import BackgroundWriter
+from src.scoreboard import Scoreboard
+
+
+class ScoreStore:
+    """Scoreboards keyed by student id, each in its own directory, loaded on demand"""
+
+    ROOT_DIRECTORY = 'students'
+
+    # The student whose scores live in the working directory (the single user layout).
+    DEFAULT_STUDENT = 'default'
+
+    # How many student scoreboards to keep in memory.
+    CACHE_SIZE = 8
+
+    STUDENT_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+    def __init__(self, writer: BackgroundWriter = None, root_directory=ROOT_DIRECTORY,
+                 cache_size=CACHE_SIZE) -> None:
+
+        self.writer = writer
+        self.root_directory = root_directory
+        self.cache_size = cache_size
+
+        # Most recently used student is last.
+        self.scoreboards = OrderedDict()
+
+        # Directories of evicted students whose saves may still be queued on the writer
+        self.evicted_directories = set()
+
+    def get_directory(self, student_id):
+        """Where this student's score files live"""
+
+        # Student ids become directory names, so keep them boring.
+        if not ScoreStore.STUDENT_ID_PATTERN.match(student_id):
+            raise ValueError(f"Invalid student id: {student_id}")
+
+        if student_id == ScoreStore.DEFAULT_STUDENT:
+            return '.'
+
+        return os.path.join(self.root_directory, student_id)
+
+    def get_scoreboard(self, student_id) -> Scoreboard:
+        """Get the student's scoreboard, loading it if it isn't in memory"""
+
+        if student_id in self.scoreboards:
+            self.scoreboards.move_to_end(student_id)
+            return self.scoreboards[student_id]
+
+        directory = self.get_directory(student_id)
+        os.makedirs(directory, exist_ok=True)
+
+        # Back so soon?  Let the eviction's save land first, or we'd read old scores
+        # (and later write them over the new ones).
+        if directory in self.evicted_directories:
+            if self.writer is not None:
+                self.writer.drain()
+            self.evicted_directories.clear()
+
+        scoreboard = Scoreboard(self.writer, directory)
+        scoreboard.open()
+        self.scoreboards[student_id] = scoreboard
+
+        # Over the limit?  Write out and drop the least recently used student.
+        if len(self.scoreboards) > self.cache_size:
+            evicted_id, evicted_scoreboard = self.scoreboards.popitem(last=False)
+            evicted_scoreboard.save()
+            evicted_scoreboard.close()
+            self.evicted_directories.add(self.get_directory(evicted_id))
+
+        return scoreboard
+
+    def list_students(self):
+        """All the students with stored scores"""
+
+        students = [ScoreStore.DEFAULT_STUDENT]
+        try:
+            students += sorted(entry.name for entry in os.scandir(self.root_directory)
+                               if entry.is_dir())
+        except FileNotFoundError:
+            pass
+
+        return students
+
+    def close(self):
+        """Write out every student in memory"""
+
+        for scoreboard in self.scoreboards.values():
+            scoreboard.save()
+            scoreboard.close()
+
+        self.scoreboards.clear()
@@ -0,0 +1,124 @@
+"""Fit exercises into a practice session's time budget"""
+
+import json
+import math
+import os
+
+from src.backgroundwriter import BackgroundWriter
+
+
+class DurationEstimator:
+    """Running estimates of how long a single trial set of each exercise takes"""
+
+    DURATIONS_FILENAME = 'durations.json'
+
+    # Weight of the newest timing in the running average.
+    SMOOTHING = 0.3
+
+    def __init__(self, writer: BackgroundWriter = None, directory='.') -> None:
+
+        # Seconds, keyed by exercise name
+        self.estimates = {}
+
+        # Where file writes happen.  None means write immediately, on this thread.
+        self.writer = writer
+
+        # Where the estimates live (with the student's scores)
+        self.durations_filename = os.path.join(directory, DurationEstimator.DURATIONS_FILENAME)
+
+    def get_estimate(self, exercise_name, prior):
+        """Estimated seconds for a trial set, or prior if we've never timed it"""
+
+        return self.estimates.get(exercise_name, prior)
+
+    def record(self, exercise_name, seconds):
+        """Fold a measured trial set duration into the estimate"""
+
+        if exercise_name in self.estimates:
+            self.estimates[exercise_name] += DurationEstimator.SMOOTHING * \
+                (seconds - self.estimates[exercise_name])
+        else:
+            self.estimates[exercise_name] = seconds
+
+    def open(self):
+        """Read the estimates from a saved file"""
+
+        self.estimates.clear()
+
+        # The last session's save may still be queued.
+        if self.writer is not None:
+            self.writer.drain()
+
+        try:
+            with open(self.durations_filename, 'r', encoding="utf-8") as durations_file:
+                self.estimates = json.load(durations_file)
+        except FileNotFoundError:
+            return
+
+    def save(self):
+        """Write the estimates to a file"""
+
+        # Snapshot now, the estimates keep changing while the write is queued.
+        durations_json = json.dumps(self.estimates)
+
+        if self.writer is None:
+            self.write_durations(durations_json)
+        else:
+            self.writer.submit(self.write_durations, durations_json)
+
+    def write_durations(self, durations_json):
+        """Write the serialized estimates to the file"""
+
+        with open(self.durations_filename, 'w', encoding="utf-8") as durations_file:
+            durations_file.write(durations_json)
+
+
+# Knapsack time resolution, in seconds
+PLAN_RESOLUTION = 5
+
+
+def plan_session(budget, estimates: dict, max_count=None):
+    """Choose how many times to run each exercise so the total fills the budget.
+
+    estimates maps exercise name to estimated seconds.  Returns a dictionary of
+    exercise name to count, whose estimated total is as close to budget as possible
+    without going over.  Empty if nothing fits.
+    """
+
+    if budget <= 0 or len(estimates) == 0:
+        return {}
+
+    # Work in whole time slots.  Round durations up, so the plan can't overrun.
+    capacity = int(budget // PLAN_RESOLUTION)
+    exercise_slots = {}
+    for exercise_name, seconds in estimates.items():
+        exercise_slots[exercise_name] = max(1, math.ceil(seconds / PLAN_RESOLUTION))
+
+    # Cap repeats so the plan mixes exercises instead of filling up on one.
+    if max_count is None:
+        max_count = math.ceil(capacity / sum(exercise_slots.values())) + 1
+
+    items = []
+    for exercise_name, slots in exercise_slots.items():
+        if slots <= capacity:
+            items += [(exercise_name, slots)] * max_count
+
+    # 0/1 knapsack where value is time.  chosen[slots] is the item list that fills it.
+    chosen = [None] * (capacity + 1)
+    chosen[0] = []
+    for item_index, (_, slots) in enumerate(items):
+        for filled in range(capacity, slots - 1, -1):
+            if chosen[filled] is None and chosen[filled - slots] is not None:
+                chosen[filled] = chosen[filled - slots] + [item_index]
+
+    # Fullest schedule we can make
+    filled = capacity
+    while chosen[filled] is None:
+        filled -= 1
+
+    plan = {}
+    for item_index in chosen[filled]:
+        exercise_name = items[item_index][0]
+        plan[exercise_name] = plan.get(exercise_name, 0) + 1
+
+    return plan
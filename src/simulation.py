@@ -0,0 +1,281 @@
+"""Simulated students -- exercise the adaptive scoring without anyone singing a note
+
+Every scored exercise is built exactly as the application builds it, but each trial set
+is scored by a StudentModel instead of a person.  Students run in a process pool, each
+with its own random streams, and the score trajectories come back as columns.
+
+    python -m src.simulation                                # 1000 students, 20 sessions
+    python -m src.simulation --students 100000 --output trajectories.npz
+    python -m src.simulation --promote 3.5 --demote 2.2     # try other thresholds
+"""
+
+import argparse
+import concurrent.futures
+import os
+import random
+import sys
+import time
+from typing import NamedTuple
+
+from src.exercise import EXERCISE_CLASSES
+from src.exercisespec import load_exercise_specs
+from src.scoreboard import Scoreboard
+
+DEFINITIONS_FILENAME = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'exercises.json')
+
+SEED = 1234
+STUDENT_COUNT = 1000
+SESSION_COUNT = 20      # Per student, every scored exercise once per session
+
+# Students per pool job.  Big enough that pickling the results isn't the bottleneck.
+JOB_SIZE = 50
+
+# One row per scored trial set.  Names are stored once, rows hold their index.
+COLUMN_DTYPES = {
+    'student': 'u4',
+    'session': 'u2',
+    'step': 'u4',           # Scored trial sets so far, for this student
+    'exercise': 'u1',       # Index into the exercise names
+    'element': 'u1',        # Index into the element (interval) names
+    'score': 'u1',          # What the student scored it, 1-4
+    'probability': 'f4',    # Chance the element was practiced, when it was chosen
+    'raw_score': 'f4',      # Scoreboard raw score, after this score
+    'adjusted_score': 'f4',  # Scoreboard adjusted score, after this score
+    'status': 'i1'          # Promotion (1) or demotion (-1) candidate, after this score
+}
+
+
+class StudentModel(NamedTuple):
+    """How a simulated student scores an interval.  Everything is in semitones."""
+
+    # Size of interval the student sings for a middling score, before any practice
+    ability: float = 4.0
+
+    # Ability gained, for an interval, every time it's practiced
+    learning_rate: float = 0.05
+
+    # Descending intervals are this much harder
+    descending_penalty: float = 1.0
+
+    # Trial set to trial set variation (standard deviation)
+    noise: float = 1.5
+
+    # Semitones of ability between one score and the next
+    score_step: float = 2.0
+
+    def get_difficulty(self, semitones):
+        """How hard an interval is"""
+
+        return abs(semitones) + (self.descending_penalty if semitones < 0 else 0)
+
+    def score(self, semitones, practice_count, noise):
+        """Score (1-4) for a trial set, given a standard normal noise draw"""
+
+        margin = self.ability + self.learning_rate * practice_count - \
+            self.get_difficulty(semitones) + self.noise * noise
+
+        return min(4, max(1, round(2.5 + margin / self.score_step)))
+
+
+class SimulationJob(NamedTuple):
+    """A batch of students for one pool worker"""
+
+    specs: tuple
+    model: StudentModel
+    first_student: int
+    student_count: int
+    session_count: int
+    seed: int
+    score_promote: float
+    score_demote: float
+
+
+def get_scored_specs(specs):
+    """Only the exercises that keep score have anything to simulate"""
+
+    return tuple(spec for spec in specs if spec.scoring_enabled)
+
+
+def get_element_names(specs):
+    """Every element the exercises can score, in a fixed order"""
+
+    return list(dict.fromkeys(interval for spec in specs
+                              for interval in spec.candidate_intervals))
+
+
+def seed_student(seed, student):
+    """Random streams for one student.  Return the model's numpy Generator.
+
+    Streams come from the student's number, not the job, so results don't change
+    with the job size or the number of workers.
+    """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    # Independent children for the exercises (the random module) and the student model
+    exercise_sequence, student_sequence = np.random.SeedSequence(
+        seed, spawn_key=(student,)).spawn(2)
+    random.seed(int(exercise_sequence.generate_state(1, np.uint64)[0]))
+
+    return np.random.default_rng(student_sequence)
+
+
+def simulate_students(job: SimulationJob):
+    """Run a batch of students through their sessions.  Return {column: array}"""
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    element_codes = {name: code for code, name in enumerate(get_element_names(job.specs))}
+    columns = {name: [] for name in COLUMN_DTYPES}
+
+    for student in range(job.first_student, job.first_student + job.student_count):
+        rng = seed_student(job.seed, student)
+
+        # A fresh student:  nothing scored, nothing practiced.  Nothing is saved either.
+        scoreboard = Scoreboard(score_promote=job.score_promote,
+                                score_demote=job.score_demote)
+        exercises = [EXERCISE_CLASSES[spec.kind](None, scoreboard, spec) for spec in job.specs]
+        practice_counts = {}
+
+        step = 0
+        for session in range(job.session_count):
+            for exercise_code, exercise in enumerate(exercises):
+
+                # Built just like the application, so the interval weights are live.
+                package = exercise.build_package()
+                noises = rng.standard_normal(len(package))
+
+                for (_, _, interval), noise in zip(package, noises):
+                    key = scoreboard.get_test_prefix(exercise.name, interval)
+                    probability = exercise.interval_sampler.get_probability(interval)
+
+                    # Score it like the Player would
+                    semitones = exercise.m_u.get_semitone_count_for_interval(interval)
+                    score = job.model.score(semitones, practice_counts.get(key, 0), noise)
+                    scoreboard.append_score(exercise.name, interval, score)
+                    practice_counts[key] = practice_counts.get(key, 0) + 1
+
+                    raw_score = scoreboard.get_raw_element_score(key)
+                    row = (student, session, step, exercise_code, element_codes[interval],
+                           score, probability, raw_score,
+                           scoreboard.get_adjusted_element_score(key),
+                           scoreboard.get_candidate_status(raw_score))
+                    for column, value in zip(columns.values(), row):
+                        column.append(value)
+                    step += 1
+
+    return {name: np.array(values, dtype=COLUMN_DTYPES[name])
+            for name, values in columns.items()}
+
+
+def run_simulation(specs, model=StudentModel(), student_count=STUDENT_COUNT,
+                   session_count=SESSION_COUNT, seed=SEED,
+                   score_promote=Scoreboard.SCORE_PROMOTE, score_demote=Scoreboard.SCORE_DEMOTE,
+                   workers=None, job_size=JOB_SIZE):
+    """Simulate the students.  Return {column: array}, plus the exercise and element names
+
+    workers=0 runs everything in this process (handy for testing and profiling).
+    """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    specs = get_scored_specs(specs)
+    jobs = [SimulationJob(specs, model, first_student,
+                          min(job_size, student_count - first_student), session_count,
+                          seed, score_promote, score_demote)
+            for first_student in range(0, student_count, job_size)]
+
+    if workers == 0:
+        results = [simulate_students(job) for job in jobs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulate_students, jobs))
+
+    # Stitch the batches together, in student order
+    columns = {name: np.concatenate([result[name] for result in results])
+               if len(results) > 0 else np.empty(0, dtype=dtype)
+               for name, dtype in COLUMN_DTYPES.items()}
+    columns['exercise_names'] = np.array([spec.name for spec in specs])
+    columns['element_names'] = np.array(get_element_names(specs))
+
+    return columns
+
+
+def get_dataframe(columns):
+    """The trajectories as a DataFrame, with the names filled back in"""
+
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    frame = pd.DataFrame({name: columns[name] for name in COLUMN_DTYPES})
+    frame['exercise'] = pd.Categorical.from_codes(frame['exercise'],
+                                                  columns['exercise_names'])
+    frame['element'] = pd.Categorical.from_codes(frame['element'], columns['element_names'])
+
+    return frame
+
+
+def output_summary(columns):
+    """Per element, how the students ended up after their last session"""
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if len(columns['session']) == 0:
+        return
+
+    last_session = columns['session'] == columns['session'].max()
+    print(f"{'Element':10} {'Practiced':>10} {'Last score':>11} {'Promote':>8} {'Demote':>8}")
+    for code, name in enumerate(columns['element_names']):
+        practiced = columns['element'] == code
+        final = practiced & last_session
+        if not np.any(final):
+            continue
+        status = columns['status'][final]
+        print(f"{name:10} {np.count_nonzero(practiced):10d} "
+              f"{columns['raw_score'][final].mean():11.3f} "
+              f"{np.mean(status == 1):8.1%} {np.mean(status == -1):8.1%}")
+
+
+def main():
+    """Simulate, summarize, and optionally save the trajectories"""
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    defaults = StudentModel()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--definitions', default=DEFINITIONS_FILENAME)
+    parser.add_argument('--students', type=int, default=STUDENT_COUNT)
+    parser.add_argument('--sessions', type=int, default=SESSION_COUNT)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="pool size (default: every cpu, 0: no pool)")
+    parser.add_argument('--promote', type=float, default=Scoreboard.SCORE_PROMOTE)
+    parser.add_argument('--demote', type=float, default=Scoreboard.SCORE_DEMOTE)
+    for field in StudentModel._fields:
+        parser.add_argument('--' + field.replace('_', '-'), type=float,
+                            default=getattr(defaults, field))
+    parser.add_argument('--output', help="save the columns to this .npz file")
+    args = parser.parse_args()
+
+    model = StudentModel(*(getattr(args, field) for field in StudentModel._fields))
+
+    start = time.perf_counter()
+    columns = run_simulation(load_exercise_specs(args.definitions), model, args.students,
+                             args.sessions, args.seed, args.promote, args.demote,
+                             args.workers)
+    elapsed = time.perf_counter() - start
+
+    row_count = len(columns['score'])
+    print(f"{args.students} students x {args.sessions} sessions: {row_count} scored trial "
+          f"sets in {elapsed:.2f}s ({row_count / elapsed:.0f}/s)")
+    output_summary(columns)
+
+    if args.output:
+        np.savez(args.output, **columns)
+        print(f"Saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
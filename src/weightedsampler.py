@@ -0,0 +1,128 @@
+"""Weighted random selection"""
+
+import random
+
+
+class WeightedSampler:
+    """Draw items with probability proportional to their weight.
+
+    Weights are kept in a Fenwick (binary indexed) tree of running sums, so drawing,
+    drawing while excluding one item, and changing a single weight are all O(log n).
+    """
+
+    def __init__(self, weights: dict = None) -> None:
+
+        self.items = []         # Item for each position
+        self.positions = {}     # Position for each item
+        self.weights = []       # Weight for each position
+
+        # Fenwick tree, 1 based.  tree[i] holds the sum of weights (i - lowbit(i), i].
+        self.tree = [0.0]
+
+        if weights is not None:
+            for item, weight in weights.items():
+                self.set_weight(item, weight)
+
+    def __len__(self):
+        """Number of items"""
+
+        return len(self.items)
+
+    def __contains__(self, item):
+
+        return item in self.positions
+
+    def prefix_sum(self, count):
+        """Sum of the weights of the first count items"""
+
+        total = 0.0
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+
+        return total
+
+    def set_weight(self, item, weight):
+        """Add an item, or change the weight of an existing one"""
+
+        if weight < 0:
+            raise ValueError(f"Negative weight for {item}: {weight}")
+
+        if item in self.positions:
+
+            # Push the change up the tree
+            position = self.positions[item]
+            delta = weight - self.weights[position]
+            self.weights[position] = weight
+            index = position + 1
+            while index < len(self.tree):
+                self.tree[index] += delta
+                index += index & -index
+
+        else:
+
+            # New node covers itself plus the tail of the existing running sums
+            position = len(self.items)
+            index = position + 1
+            node_sum = weight + self.prefix_sum(position) - \
+                self.prefix_sum(index - (index & -index))
+
+            self.items.append(item)
+            self.positions[item] = position
+            self.weights.append(weight)
+            self.tree.append(node_sum)
+
+    def get_weight(self, item):
+        """Current weight of an item"""
+
+        return self.weights[self.positions[item]]
+
+    def get_total_weight(self):
+        """Sum of all the weights"""
+
+        return self.prefix_sum(len(self.items))
+
+    def get_probability(self, item):
+        """Chance of drawing this item"""
+
+        return self.get_weight(item) / self.get_total_weight()
+
+    def find(self, target):
+        """Position of the item whose running sum range contains target"""
+
+        position = 0
+        step = 1
+        while step * 2 < len(self.tree):
+            step *= 2
+
+        # Walk down the tree, skipping whole ranges that sum to <= target
+        while step > 0:
+            next_position = position + step
+            if next_position < len(self.tree) and self.tree[next_position] <= target:
+                position = next_position
+                target -= self.tree[next_position]
+            step //= 2
+
+        # Floating point slop could land us one past the end.
+        return min(position, len(self.items) - 1)
+
+    def sample(self, exclude=None, rng=random):
+        """Draw an item.  If exclude is given, draw from everything except it."""
+
+        total = self.get_total_weight()
+
+        # Draw over the total without the excluded item, then step over its range.
+        excluded_start = excluded_weight = 0.0
+        if exclude in self.positions:
+            excluded_start = self.prefix_sum(self.positions[exclude])
+            excluded_weight = self.get_weight(exclude)
+            total -= excluded_weight
+
+        if total <= 0:
+            raise ValueError("Nothing to sample from.")
+
+        target = rng.random() * total
+        if excluded_weight > 0 and target >= excluded_start:
+            target += excluded_weight
+
+        return self.items[self.find(target)]
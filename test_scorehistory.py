@@ -13,3 +13,4 @@ element_list = [
 ]
 test_name = 'Singing the Hard Intervals'
 sb.output_scores(test_name, element_list)
+sb.close()
@@ -0,0 +1,113 @@
+"""Unit Tests for batch grading"""
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.autograde import Take, get_expected_notes, grade_takes, match_notes, \
+    read_manifest, record_grades
+from src.exercise import build_seeded_package
+from src.exercisespec import load_exercise_specs
+from src.pitchdetector import write_wav
+from src.scoreboard import Scoreboard
+from src.scorehistory import ScoreHistory
+from src.scorestore import ScoreStore
+from tests.test_pitchdetector import sing
+
+SAMPLE_RATE = 22050
+DEFINITIONS_FILENAME = 'data/exercises.json'
+
+
+class TestAutograde(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup -- the specs, and somewhere for takes"""
+
+        self.specs = {spec.name: spec for spec in load_exercise_specs(DEFINITIONS_FILENAME)}
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+
+    def tearDown(self):
+        """Teardown"""
+
+        self.temp_dir.cleanup()
+
+    def record(self, filename, exercise, seed, trials_sets_count, missed_from=None):
+        """Record a take:  every expected note, with a gap between, until they're missed"""
+
+        package = build_seeded_package(self.specs[exercise], seed, trials_sets_count)
+        gap = np.zeros(int(0.05 * SAMPLE_RATE))
+
+        samples = []
+        for index, (_, note) in enumerate(get_expected_notes(package)):
+            if missed_from is not None and index >= missed_from:
+                samples.extend([np.zeros(int(0.25 * SAMPLE_RATE)), gap])
+            else:
+                samples.extend([sing(note, 0.25, SAMPLE_RATE), gap])
+        write_wav(os.path.join(self.directory, filename), np.concatenate(samples), SAMPLE_RATE)
+
+        return package
+
+    def test_match_notes(self):
+        """Test method"""
+
+        # A missed note, an extra note, and one an octave up
+        self.assertEqual(match_notes([60, 62, 64, 65], [60, 64, 70, 77]), [0, 2, 3])
+        self.assertEqual(match_notes([60, 62], []), [])
+
+    def test_grading(self):
+        """Test method"""
+
+        intervals = "Singing the Easy Intervals"
+        one_string = "One String Exercise"
+        sing_package = self.record('sing.wav', intervals, 7, 6, missed_from=6)
+        self.record('string.wav', one_string, 8, 1)
+
+        with open(os.path.join(self.directory, 'takes.json'), 'w', encoding='utf-8') as file:
+            json.dump([
+                {"file": "sing.wav", "student": "alice", "exercise": intervals, "seed": 7,
+                 "trial_sets": 6},
+                {"file": "string.wav", "student": "bob", "exercise": one_string, "seed": 8,
+                 "trial_sets": 1}
+            ], file)
+
+        takes = read_manifest(self.directory)
+        self.assertEqual(takes[0], Take(os.path.join(self.directory, 'sing.wav'), 'alice',
+                                        intervals, 7, 6))
+        graded_sing, graded_string = grade_takes(takes, self.specs.values(), workers=2)
+
+        # Sung for the first 3 trial sets (2 trials each), then nothing
+        self.assertEqual(graded_sing.scores,
+                         [(label, 4) for label in sing_package.trial_set_label[:3]] +
+                         [(label, 1) for label in sing_package.trial_set_label[3:]])
+        self.assertEqual(graded_sing.expected_count, 12)
+        self.assertEqual(graded_sing.matched_count, 6)
+
+        # 50 notes on one string, all there
+        self.assertEqual(len(graded_string.scores), 1)
+        self.assertEqual(graded_string.scores[0][1], 4)
+        self.assertTrue(graded_string.scores[0][0].startswith("String "))
+        self.assertEqual(graded_string.matched_count, 50)
+
+        # Into the store, scores and history
+        root = os.path.join(self.directory, 'students')
+        store = ScoreStore(root_directory=root)
+        record_grades([graded_sing, graded_string], store)
+        store.close()
+
+        scoreboard = Scoreboard(directory=os.path.join(root, 'alice'))
+        scoreboard.open()
+        first_key = scoreboard.get_test_prefix(intervals, sing_package.trial_set_label[0])
+        self.assertIn(4, scoreboard.persistant_scores[first_key])
+
+        history = ScoreHistory(directory=os.path.join(root, 'bob'))
+        self.assertEqual(history.get_record_count(), 1)
+
+    def test_unknown_exercise(self):
+        """Test method"""
+
+        with self.assertRaises(ValueError):
+            grade_takes([Take('nope.wav', 'alice', 'Kazoo Solos', 1)], self.specs.values(), 0)
@@ -0,0 +1,59 @@
+"""Unit Tests for BackgroundWriter class"""
+import threading
+import unittest
+
+from src.backgroundwriter import BackgroundWriter
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup"""
+
+        self.writer = BackgroundWriter()
+
+    def tearDown(self):
+        """Teardown"""
+
+        self.writer.close()
+
+    def test_writes_in_order(self):
+        """Test method"""
+
+        results = []
+        for idx in range(100):
+            self.writer.submit(results.append, idx)
+
+        self.writer.drain()
+        self.assertEqual(results, list(range(100)))
+
+    def test_failed_write(self):
+        """A failing write doesn't stop the ones after it"""
+
+        def bad_write():
+            raise OSError
+
+        results = []
+        with self.assertLogs(level='ERROR'):
+            self.writer.submit(bad_write)
+            self.writer.submit(results.append, 1)
+            self.writer.drain()
+
+        self.assertEqual(results, [1])
+
+    def test_close(self):
+        """Test method"""
+
+        release = threading.Event()
+        results = []
+        self.writer.submit(release.wait)
+        self.writer.submit(results.append, 1)
+
+        release.set()
+        self.writer.close()
+        self.assertEqual(results, [1])
+        self.assertFalse(self.writer.thread.is_alive())
+
+        with self.assertRaises(RuntimeError):
+            self.writer.submit(results.append, 2)
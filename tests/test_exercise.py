@@ -1,8 +1,23 @@
 """Unit Tests for Exercise classes"""
+import contextlib
+import io
+import itertools
+import os
+import random
+import tempfile
 import unittest
 
-from src.exercise import OneString, ChordTones
+from src.audiobackend import NullAudioBackend
+from src.exercise import MelodicDictation, OneString, ChordTones, SingTheIntervals, \
+    TransitionGraph
+from src.exercisespec import compile_definitions
+from src.inputbackend import ScriptedInputBackend
+from src.keypresshelper import set_input_backend
 from src.player import Player
+from src.scoreboard import Scoreboard
+
+DEFINITIONS_FILENAME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'data', 'exercises.json')
 
 # Some Utility Functions
 
@@ -26,12 +41,17 @@ class TestExercise(unittest.TestCase):
     def setUpClass(cls):
         """Setup for all the tests"""
         cls.player = Player()
+        with open('data/exercises.json', encoding='utf-8') as definitions_file:
+            cls.specs = {spec.name: spec for spec in compile_definitions(definitions_file.read())}
 
     def setUp(self):
         """Setup"""
 
-        self.one_string = OneString(TestExercise.player)
-        self.chord_tones = ChordTones(TestExercise.player)
+        scoreboard = Scoreboard()
+        self.one_string = OneString(TestExercise.player, scoreboard,
+                                    TestExercise.specs["One String Exercise"])
+        self.chord_tones = ChordTones(TestExercise.player, scoreboard,
+                                      TestExercise.specs["Chord Tones Exercise"])
 
     def test_build_trial_set(self):
         """Build Trial Set under many circumstances"""
@@ -70,3 +90,161 @@ class TestExercise(unittest.TestCase):
 
         # We're on one string, so this should always be 22.
         self.assertEqual(high_note-low_note, 22)
+
+
+class TestMelodies(unittest.TestCase):
+    """Testing Class -- long trials, from the transition graph"""
+
+    def setUp(self):
+        """Setup"""
+
+        random.seed(2024)
+        with open('data/exercises.json', encoding='utf-8') as definitions_file:
+            self.specs = {spec.name: spec
+                          for spec in compile_definitions(definitions_file.read())}
+
+    def test_transition_graph(self):
+        """Test method"""
+
+        graph = TransitionGraph([64, 60, 62, 67, 60, 72], 3, 7)
+
+        self.assertEqual(graph.notes, [60, 62, 64, 67, 72])
+        self.assertEqual(graph.successors, [(0, 2), (0, 3), (1, 4), (2, 4), (4, 5)])
+        self.assertEqual(graph.range_starts, [0, 0, 0, 0, 3])
+        self.assertEqual(graph.range_ends, [4, 4, 4, 5, 5])
+        self.assertEqual((graph.get_first_index(-20), graph.get_first_index(200)), (0, 5))
+
+    def test_long_melodies(self):
+        """Every melody keeps to max_interval and trial_range, all the way through"""
+
+        spec = self.specs["Melodic Dictation (32 Notes)"]._replace(trials_count=200)
+        melodic = MelodicDictation(None, Scoreboard(), spec)
+        legal_notes_lists = [list(range(40, 90, 2)), list(range(41, 90, 3))]
+
+        trial_set = melodic.build_trial_set(legal_notes_lists)
+
+        self.assertEqual(len(trial_set), 200)
+        self.assertTrue(validate_trial_sets(legal_notes_lists, trial_set))
+        for trial in trial_set:
+            self.assertEqual(len(trial), 32)
+            self.assertLessEqual(max(trial) - min(trial), spec.trial_range)
+            for note, next_note in zip(trial, trial[1:]):
+                self.assertLessEqual(abs(next_note - note), spec.max_interval)
+
+        # Every legal note within reach gets used, eventually
+        self.assertEqual({note for trial in trial_set[::2] for note in trial},
+                         set(legal_notes_lists[0]))
+
+    def test_remember_note(self):
+        """Each trial starts within reach of the last, unless it can't"""
+
+        spec = self.specs["Full Neck Sub-Octave Intervals"]._replace(max_interval=2)
+        melodic = MelodicDictation(None, Scoreboard(), spec)
+
+        trial_set = melodic.build_trial_set([list(range(40, 80))])
+        for trial, next_trial in zip(trial_set, trial_set[1:]):
+            self.assertLessEqual(abs(next_trial[0] - trial[-1]), 2)
+
+        # Out of reach of every note in the next list (the rejection loop never finished)
+        trial_set = melodic.build_trial_set([[40], [70, 72]])
+        self.assertEqual(trial_set[0], [40])
+        self.assertIn(trial_set[1], [[70], [72]])
+
+
+class TestAdaptiveWeights(unittest.TestCase):
+    """Testing Class -- interval weights follow the scores as they come in"""
+
+    def setUp(self):
+        """Setup -- scores are saved in a scratch directory"""
+
+        random.seed(7)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with open(DEFINITIONS_FILENAME, encoding='utf-8') as definitions_file:
+            self.spec = {spec.name: spec for spec in compile_definitions(
+                definitions_file.read())}["Singing the Easy Intervals"]
+
+    def tearDown(self):
+        """Teardown"""
+
+        self.temp_dir.cleanup()
+
+    def test_weights_mid_package(self):
+        """Test method"""
+
+        spec = self.spec
+
+        # 4 scores each, one more and they count
+        scoreboard = Scoreboard(directory=self.temp_dir.name)
+        for interval in spec.candidate_intervals:
+            for _ in range(4):
+                scoreboard.append_score(spec.name, interval, 4)
+
+        sing = SingTheIntervals(Player(NullAudioBackend()), scoreboard, spec)
+        package = sing.build_package(3)
+        first_interval = package.trial_set_label[0]
+        self.assertEqual(sing.interval_sampler.get_weight(first_interval), 1)
+
+        # Start everything, score everything a 4, and keep an eye on the weights
+        def keys():
+            while True:
+                for key in ["space", "4"]:
+                    weights.append(sing.interval_sampler.get_weight(first_interval))
+                    yield key
+
+        weights = []
+        set_input_backend(ScriptedInputBackend(keys()))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scores = sing.play_package(package, 600)
+        finally:
+            set_input_backend(None)
+
+        self.assertEqual([label for label, _ in scores], package.trial_set_label)
+
+        # Re-weighted once the first trial set was scored, while the rest were playing
+        self.assertEqual(weights[0], 1)
+        self.assertIn(1 / 32, weights[:-1])
+
+    def test_draws_mid_package(self):
+        """Intervals already scored well are drawn less for the rest of the package"""
+
+        spec = self.spec
+
+        # 4 scores each, so every interval is as likely as the next until it's scored again
+        scoreboard = Scoreboard(directory=self.temp_dir.name)
+        for interval in spec.candidate_intervals:
+            for _ in range(4):
+                scoreboard.append_score(spec.name, interval, 4)
+
+        sing = SingTheIntervals(Player(NullAudioBackend()), scoreboard, spec)
+        package = sing.build_package(6)
+        built_labels = list(package.trial_set_label)
+
+        # Score everything a 4
+        set_input_backend(ScriptedInputBackend(itertools.cycle(["space", "4"])))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scores = sing.play_package(package, 600)
+        finally:
+            set_input_backend(None)
+
+        # What was played is what's in the package now, not what was first drawn
+        played_labels = [label for label, _ in scores]
+        self.assertEqual(played_labels, package.trial_set_label)
+        self.assertEqual(played_labels[0], built_labels[0])
+        self.assertNotEqual(played_labels, built_labels)
+
+        # Once scored, an interval is 32 times less likely, so nothing comes back
+        self.assertEqual(len(set(played_labels)), len(played_labels))
+
+    def test_element(self):
+        """The first trial set practices the element it's given, the rest are drawn"""
+
+        sing = SingTheIntervals(None, Scoreboard(directory=self.temp_dir.name), self.spec)
+        package = sing.build_package(3, 'P4')
+        self.assertEqual(package.trial_set_label[0], 'P4')
+        self.assertNotEqual(package.trial_set_label[1], 'P4')
+
+        # Something it doesn't practice is no help
+        package = sing.build_package(1, 'M7')
+        self.assertIn(package.trial_set_label[0], self.spec.candidate_intervals)
@@ -0,0 +1,60 @@
+"""Unit Tests for ExerciseRegistry class"""
+import unittest
+
+from src.exerciseregistry import ExerciseDescriptor, ExerciseRegistry
+from src.scoreboard import Scoreboard
+
+
+class CountingExercise:
+    """Stand in exercise that counts how often it's built"""
+
+    built = 0
+
+    def __init__(self, player, scoreboard) -> None:
+        CountingExercise.built += 1
+        self.player = player
+        self.sb = scoreboard
+
+    def set_scoreboard(self, scoreboard):
+        """Test method"""
+        self.sb = scoreboard
+
+
+class TestExerciseRegistry(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup"""
+
+        CountingExercise.built = 0
+        self.sb = Scoreboard()
+        self.registry = ExerciseRegistry(None, self.sb)
+
+    def test_lazy_build(self):
+        """Test method"""
+
+        for _ in range(500):
+            self.registry.register(ExerciseDescriptor("Counting", True, CountingExercise))
+        self.registry.register(ExerciseDescriptor("Not Mixed", False, CountingExercise))
+
+        self.assertEqual(len(self.registry), 501)
+        self.assertEqual(CountingExercise.built, 0)
+        self.assertEqual(str(self.registry.get_descriptor(500)), "Not Mixed")
+        self.assertEqual(len(self.registry.get_mixable_indexes()), 500)
+
+        exercise = self.registry.get(3)
+        self.assertIs(self.registry.get(3), exercise)
+        self.assertEqual(CountingExercise.built, 1)
+        self.assertIs(exercise.sb, self.sb)
+
+    def test_set_scoreboard(self):
+        """Test method"""
+
+        self.registry.register(ExerciseDescriptor("Counting", True, CountingExercise))
+        self.registry.register(ExerciseDescriptor("Counting", True, CountingExercise))
+        built = self.registry.get(0)
+
+        other_sb = Scoreboard()
+        self.registry.set_scoreboard(other_sb)
+        self.assertIs(built.sb, other_sb)
+        self.assertIs(self.registry.get(1).sb, other_sb)
@@ -0,0 +1,120 @@
+"""Unit Tests for exercise specs"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.exercise import OneOctave
+from src.exerciseregistry import ExerciseDescriptor, ExerciseRegistry
+from src.exercisespec import CACHE_DIRECTORY, compile_definitions, load_exercise_specs
+from src.midiutilities import MidiUtil, MAX_MIDI_VALUE
+from src.scoreboard import Scoreboard
+
+DEFINITIONS_FILENAME = 'data/exercises.json'
+
+
+class TestExerciseSpec(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup -- a scratch copy of the definitions file"""
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, 'exercises.json')
+        shutil.copy(DEFINITIONS_FILENAME, self.filename)
+
+        with open(self.filename, encoding='utf-8') as definitions_file:
+            self.definitions = json.load(definitions_file)
+
+    def tearDown(self):
+        """Teardown"""
+
+        self.temp_dir.cleanup()
+
+    def test_validation(self):
+        """Test method"""
+
+        definition = self.definitions[0]
+
+        bad_definitions = [
+            {key: value for key, value in definition.items() if key != 'trial_size'},
+            dict(definition, trial_size=True),
+            dict(definition, trial_size=0),
+            dict(definition, kind='Kazoo'),
+            dict(definition, key_centers=['H']),
+            dict(definition, intervalics=['Ionian', 'Lydian Flat 11']),
+            dict(definition, post_trial_pause='FOREVER'),
+            dict(definition, drone='BAGPIPES'),
+            dict(definition, rhythm_cells=['quarter', 'hemiola']),
+            dict(definition, exercise_type='RHYTHM'),
+            dict(definition, kind='RhythmicDictation'),
+            dict(definition, kind='MelodicDictation', trial_size=64),
+            dict(definition, name='Exercise ' * 8),
+            dict(definition, colour='red'),
+            dict(definition, kind='SingTheIntervals'),
+            dict(definition, kind='SingTheIntervals', candidate_intervals=['m3'])
+        ]
+        for bad_definition in bad_definitions:
+            with self.assertRaises(ValueError):
+                compile_definitions(json.dumps([bad_definition]))
+
+        # Names have to be unique
+        with self.assertRaises(ValueError):
+            compile_definitions(json.dumps([definition, definition]))
+
+    def test_legal_notes(self):
+        """Test method"""
+
+        m_u = MidiUtil()
+        spec = compile_definitions(json.dumps(self.definitions[1:2]))[0]
+
+        # The precomputed tables are the same as building the lists at runtime
+        for key_center in spec.key_centers:
+            for intervalic in spec.intervalics:
+                self.assertEqual(list(spec.get_legal_notes(key_center, intervalic)),
+                                 m_u.build_note_list(0, MAX_MIDI_VALUE, [intervalic],
+                                                     key_center)[0])
+
+        # And so are the slices an exercise takes from them
+        exercise = OneOctave(None, Scoreboard(), spec)
+        for low_note in range(40, 60):
+            for intervalic in spec.intervalics:
+                self.assertEqual(
+                    exercise.get_legal_notes(low_note, low_note + 27, [intervalic], 'F'),
+                    m_u.build_note_list(low_note, low_note + 27, [intervalic], 'F'))
+
+    def test_cache(self):
+        """Test method"""
+
+        specs = load_exercise_specs(self.filename)
+        self.assertEqual(len(specs), len(self.definitions))
+        cache_files = os.listdir(os.path.join(self.temp_dir.name, CACHE_DIRECTORY))
+        self.assertEqual(len(cache_files), 1)
+
+        # Loaded from the cache the second time
+        self.assertEqual(load_exercise_specs(self.filename), specs)
+
+        # An edit means a recompile
+        self.definitions[0]['trials_count'] += 1
+        with open(self.filename, 'w', encoding='utf-8') as definitions_file:
+            json.dump(self.definitions, definitions_file)
+        self.assertEqual(load_exercise_specs(self.filename)[0].trials_count,
+                         specs[0].trials_count + 1)
+        cache_files = os.listdir(os.path.join(self.temp_dir.name, CACHE_DIRECTORY))
+        self.assertEqual(len(cache_files), 2)
+
+    def test_registry(self):
+        """Test method"""
+
+        registry = ExerciseRegistry(None, Scoreboard())
+        for spec in load_exercise_specs(self.filename):
+            registry.register(ExerciseDescriptor.from_spec(spec))
+
+        self.assertEqual(str(registry.get_descriptor(1)), self.definitions[1]['name'])
+        exercise = registry.get(1)
+        self.assertIsInstance(exercise, OneOctave)
+        self.assertEqual(exercise.trials_count, self.definitions[1]['trials_count'])
+
+        package = exercise.build_package(2)
+        self.assertEqual(len(package), 2)
@@ -0,0 +1,89 @@
+"""Unit Tests for the feasibility analyzer"""
+import itertools
+import json
+import os
+import tempfile
+import unittest
+
+from src.exercisespec import compile_definitions
+from src.feasibility import analyze_spec, count_trials, export_counts
+
+
+def brute_force_count(legal_notes, trial_size, max_interval, trial_range):
+    """Count legal trials the slow way"""
+
+    count = 0
+    for trial in itertools.product(legal_notes, repeat=trial_size):
+        if max(trial) - min(trial) > trial_range:
+            continue
+        if any(abs(note - last_note) > max_interval for last_note, note in zip(trial, trial[1:])):
+            continue
+        count += 1
+
+    return count
+
+
+class TestFeasibility(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup"""
+
+        with open('data/exercises.json', encoding='utf-8') as definitions_file:
+            self.specs = compile_definitions(definitions_file.read())
+
+    def test_count_trials(self):
+        """Test method"""
+
+        legal_notes = [40, 42, 43, 45, 47, 48, 50, 52, 55, 59, 60, 64]
+        for trial_size, max_interval, trial_range in [(1, 12, 12), (3, 2, 7), (4, 5, 9),
+                                                      (5, 11, 19), (3, 0, 0)]:
+            self.assertEqual(count_trials(legal_notes, trial_size, max_interval, trial_range),
+                             brute_force_count(legal_notes, trial_size, max_interval,
+                                               trial_range))
+
+        self.assertEqual(count_trials([], 3, 12, 12), 0)
+
+    def test_analyze_spec(self):
+        """Test method"""
+
+        for spec in self.specs:
+            counts = analyze_spec(spec)
+            self.assertGreater(len(counts), 0)
+            self.assertFalse(any(count.empty for count in counts), spec.name)
+
+        # One note trials on one string: one trial per legal note
+        one_string = analyze_spec(self.specs[0])
+        self.assertEqual(one_string[0].trial_counts, (14,))
+
+        # Pentatonic steps are all wider than 1 semitone, so a trial can only repeat a note
+        spec = compile_definitions(json.dumps([{
+            'kind': 'OneOctave', 'name': 'Sparse', 'mixable': False,
+            'exercise_duration': 60, 'trials_sets_count': 1, 'trials_count': 5,
+            'trial_size': 3, 'max_interval': 1, 'trial_range': 1,
+            'key_centers': ['C'], 'intervalics': ['Major Pentatonic'],
+            'trial_varied_intervalics': False, 'exercise_type': 'SERIES',
+            'post_trial_pause': 'SHORT', 'interval_pause': 'NOT_APPLICABLE',
+            'trial_repeat_pause': 'NOT_APPLICABLE', 'mid_trial_prompt_enabled': False
+        }]))[0]
+        counts = analyze_spec(spec)
+        self.assertTrue(all(count.trial_counts == (6,) for count in counts))
+
+        # Interval sets never repeat the interval before, so there have to be 2 to draw from
+        sing = [spec for spec in self.specs if spec.kind == 'SingTheIntervals'][0]
+        for candidate_intervals in [(), ('m3',)]:
+            counts = analyze_spec(sing._replace(candidate_intervals=candidate_intervals))
+            self.assertTrue(all(count.empty for count in counts))
+
+    def test_export(self):
+        """Test method"""
+
+        counts = analyze_spec(self.specs[-1])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'counts.json')
+            export_counts(counts, filename)
+            with open(filename, encoding='utf-8') as counts_file:
+                exported = json.load(counts_file)
+
+        self.assertEqual(len(exported), len(counts))
+        self.assertEqual(exported[0]['trial_counts'], list(counts[0].trial_counts))
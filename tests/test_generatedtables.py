@@ -0,0 +1,22 @@
+"""Unit Tests for the generated lookup tables"""
+import unittest
+
+from src import generatedtables
+from src.generatetables import GENERATED_FILENAME, build_tables, render_tables
+
+
+class TestGeneratedTables(unittest.TestCase):
+    """Testing class"""
+
+    def test_tables_match_builders(self):
+        """Test method"""
+
+        tables = build_tables()
+        for name, table in tables.items():
+            self.assertEqual(getattr(generatedtables, name), table, name)
+
+    def test_up_to_date(self):
+        """The checked in module is exactly what the build step writes"""
+
+        with open(GENERATED_FILENAME, encoding='utf-8') as generated_file:
+            self.assertEqual(generated_file.read(), render_tables(build_tables()))
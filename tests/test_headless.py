@@ -0,0 +1,195 @@
+"""End-to-end -- whole sessions with null audio and scripted input"""
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+from benchmarks.session import run_session
+from main import EXERCISES_FILENAME
+from src.application import Application
+from src.audiobackend import NullAudioBackend
+from src.exerciseregistry import ExerciseDescriptor, ExerciseRegistry
+from src.exercisespec import load_exercise_specs
+from src.inputbackend import ScriptedInputBackend
+from src.keypresshelper import set_input_backend
+from src.player import Player
+from src.scorestore import ScoreStore
+
+
+class TestHeadless(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup -- work in a scratch directory"""
+
+        random.seed(1234)
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Teardown"""
+
+        self.temp_dir.cleanup()
+
+    def test_exercises(self):
+        """One String (10 sets of 50 single notes), then Singing the Easy Intervals"""
+
+        audio, scoreboard = run_session(["0", "10", "x"], self.temp_dir.name)
+
+        # 500 notes, then 50 sets of 2 trials of 4 notes
+        self.assertEqual(len(audio.notes), 500 + 400)
+
+        # Every interval trial set was scored a 3
+        scores = [score for key, score_list in scoreboard.persistant_scores.items()
+                  for score in score_list if key.startswith("Singing the Easy Intervals")]
+        self.assertEqual(scores, [3] * 50)
+
+    def test_drone(self):
+        """Single Position (Simple) sounds each trial set's key, and stops when it's done"""
+
+        audio, _ = run_session(["4", "x"], self.temp_dir.name)
+
+        self.assertGreater(len(audio.notes), 0)
+        self.assertGreater(len(audio.drones), 0)
+        self.assertEqual(audio.drones[0][2], 0)     # Sounding before the first note
+        self.assertEqual(audio.drone_notes, ())
+
+    def test_rhythm(self):
+        """Rhythmic Dictation plays note events, every trial twice"""
+
+        audio, _ = run_session(["14", "x"], self.temp_dir.name)
+
+        # 10 sets of 5 trials of 6 notes, each repeated
+        self.assertEqual(len(audio.notes), 10 * 5 * 6 * 2)
+        self.assertEqual({type(note) for note, _, _ in audio.notes}, {int})
+        self.assertLess(max(volume for _, volume, _ in audio.notes), 1)
+
+    def test_mixer_prefetch(self):
+        """The mixer never builds an exercise while it's playing (building changes it)"""
+
+        # The only exercise in the mix, so it comes up every time
+        spec = {spec.name: spec for spec in load_exercise_specs(EXERCISES_FILENAME)}[
+            "Singing the Easy Intervals"]
+        store = ScoreStore(root_directory=os.path.join(self.temp_dir.name, 'students'))
+        registry = ExerciseRegistry(Player(NullAudioBackend()), store.get_scoreboard('mixer'))
+        app = Application(registry, store, 'mixer')
+        app.register_exercise(ExerciseDescriptor.from_spec(spec._replace(mixable=True)))
+
+        exercise = registry.get(0)
+        build_package = exercise.build_package
+        play_package = exercise.play_package
+        playing = threading.Event()
+        built_while_playing = []
+
+        # Helper Inner Functions
+        def checked_build_package(trials_sets_count=None, element=None):
+            built_while_playing.append(playing.is_set())
+            return build_package(trials_sets_count, element)
+
+        def checked_play_package(package, duration):
+            playing.set()
+            try:
+                return play_package(package, duration)
+            finally:
+                playing.clear()
+
+        exercise.build_package = checked_build_package
+        exercise.play_package = checked_play_package
+
+        # The mixer runs until the key script does.
+        set_input_backend(ScriptedInputBackend(itertools.islice(
+            itertools.cycle(["space", "3"]), 60)))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(EOFError):
+                app.run_mixer()
+        finally:
+            set_input_backend(None)
+            store.close()
+
+        self.assertGreater(len(built_while_playing), 2)
+        self.assertNotIn(True, built_while_playing)
+
+    def test_mixer_elements(self):
+        """The mixer practices whichever element is due, hardest first"""
+
+        spec = {spec.name: spec for spec in load_exercise_specs(EXERCISES_FILENAME)}[
+            "Singing the Easy Intervals"]
+        store = ScoreStore(root_directory=os.path.join(self.temp_dir.name, 'students'))
+        scoreboard = store.get_scoreboard('mixer')
+        for interval, score in [('m3', 1), ('M3', 2), ('P4', 4)]:
+            scoreboard.append_score(spec.name, interval, score)
+
+        registry = ExerciseRegistry(Player(NullAudioBackend()), scoreboard)
+        app = Application(registry, store, 'mixer')
+        app.register_exercise(ExerciseDescriptor.from_spec(spec._replace(mixable=True)))
+
+        # Start, score a 4 and carry on, for three trial sets
+        set_input_backend(ScriptedInputBackend(["space", "4", "space"] * 3))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(EOFError):
+                app.run_mixer()
+        finally:
+            set_input_backend(None)
+            store.close()
+
+        # One trial set for each element, in order of difficulty
+        self.assertEqual(scoreboard.persistant_scores[f"{spec.name}:m3"], [1, 4])
+        self.assertEqual(scoreboard.persistant_scores[f"{spec.name}:M3"], [2, 4])
+        self.assertEqual(scoreboard.persistant_scores[f"{spec.name}:P4"], [4, 4])
+
+    def test_mixer_plan(self):
+        """The mixer plays each exercise as many times as the plan says, no more"""
+
+        specs = {spec.name: spec for spec in load_exercise_specs(EXERCISES_FILENAME)}
+        store = ScoreStore(root_directory=os.path.join(self.temp_dir.name, 'students'))
+        registry = ExerciseRegistry(Player(NullAudioBackend()), store.get_scoreboard('mixer'))
+        app = Application(registry, store, 'mixer')
+        for name in ["One String Exercise", "Chord Tones Exercise"]:
+            app.register_exercise(ExerciseDescriptor.from_spec(specs[name]._replace(
+                mixable=True)))
+
+        # Two 600s sets of One String fill the 1200s session exactly
+        with open(os.path.join(store.get_directory('mixer'), 'durations.json'), 'w',
+                  encoding='utf-8') as durations_file:
+            json.dump({"One String Exercise": 600, "Chord Tones Exercise": 250},
+                      durations_file)
+
+        # Nothing's really played, so only the played list says how far we've got.
+        played = []
+
+        # Helper Inner Functions
+        def make_play_package(exercise):
+            def play_package(package, duration):
+                if len(played) == 3:
+                    raise EOFError      # The session would be over by now
+                played.append(exercise.name)
+                return []
+            return play_package
+
+        for index in range(len(registry)):
+            exercise = registry.get(index)
+            exercise.play_package = make_play_package(exercise)
+
+        with self.assertRaises(EOFError):
+            app.run_mixer()
+        store.close()
+
+        # Even though Chord Tones is due by then
+        self.assertEqual(played[:2], ["One String Exercise", "One String Exercise"])
+
+    def test_exit_early(self):
+        """Test method"""
+
+        audio, scoreboard = run_session(["0", "x"], self.temp_dir.name, keys=["x"])
+        self.assertEqual(audio.notes, [])
+        self.assertEqual(scoreboard.persistant_scores, {})
+
+    def test_script_runs_out(self):
+        """Test method"""
+
+        with self.assertRaises(EOFError):
+            run_session(["0"], self.temp_dir.name, keys=["space"])
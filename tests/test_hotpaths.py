@@ -0,0 +1,26 @@
+"""Hot path benchmark suite -- it runs, and covers what it should"""
+import json
+import unittest
+
+from benchmarks.hotpaths import DEFINITIONS_FILENAME, run_benchmarks
+
+
+class TestHotpaths(unittest.TestCase):
+    """Testing class"""
+
+    def test_run_benchmarks(self):
+        """Test method"""
+
+        results = run_benchmarks(max_rows=1000, repeat=1, scale=0.01, max_melodies=1000)
+
+        with open(DEFINITIONS_FILENAME, encoding='utf-8') as definitions_file:
+            names = [definition['name'] for definition in json.load(definitions_file)]
+        for name in names:
+            self.assertIn(f'Exercise.build_trial_set[{name}]', results)
+
+        self.assertIn('ScoreHistory.get_dataframe[1000]', results)
+        self.assertNotIn('ScoreHistory.get_dataframe[10000]', results)
+        self.assertIn('MelodicDictation.build_trial_set[1000 x 32 notes]', results)
+        self.assertNotIn('MelodicDictation.build_trial_set[10000 x 32 notes]', results)
+        for result in results.values():
+            self.assertGreater(result['seconds'], 0)
@@ -0,0 +1,65 @@
+"""Unit Tests for the input backends"""
+import os
+import threading
+import unittest
+
+from src.inputbackend import ScriptedInputBackend, TerminalInputBackend, \
+    decode_terminal_keys
+
+
+class TestInputBackend(unittest.TestCase):
+    """Testing class"""
+
+    def test_decode_terminal_keys(self):
+        """Test method"""
+
+        self.assertEqual(decode_terminal_keys(b' x3\r'), ['space', 'x', '3', 'enter'])
+        self.assertEqual(decode_terminal_keys(b'\x1b[A\x1b[Dv\x1b'), ['up', 'left', 'v', 'esc'])
+        self.assertEqual(decode_terminal_keys(b'\x1b[15~r'), ['\x1b[15~', 'r'])
+
+    @unittest.skipUnless(hasattr(os, 'openpty'), "needs a pseudo terminal")
+    def test_terminal(self):
+        """Key presses typed into a pseudo terminal"""
+
+        import termios  # pylint: disable=import-outside-toplevel
+
+        master, slave = os.openpty()
+        backend = TerminalInputBackend(slave)
+        try:
+            cooked = termios.tcgetattr(slave)
+
+            # Type once read_key is waiting.  Keys that aren't options are skipped.
+            timer = threading.Timer(0.05, os.write, (master, b'q \x1b[Ar'))
+            timer.start()
+            self.assertEqual(backend.read_key(['r', 'x']), 'r')
+            timer.join()
+
+            # Back to line at a time, echo and all
+            self.assertEqual(termios.tcgetattr(slave), cooked)
+        finally:
+            backend.close()
+            os.close(slave)
+            os.close(master)
+
+    def test_not_a_terminal(self):
+        """Test method"""
+
+        read_fd, write_fd = os.pipe()
+        try:
+            with self.assertRaises(OSError):
+                TerminalInputBackend(read_fd)
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_scripted(self):
+        """Test method"""
+
+        backend = ScriptedInputBackend(['q', 'space', '3'], ['0'])
+        self.assertEqual(backend.read_key(['space', 'x']), 'space')
+        self.assertEqual(backend.read_key(['1', '2', '3', '4']), '3')
+        with self.assertRaises(EOFError):
+            backend.read_key(['space'])
+        self.assertEqual(backend.read_line(''), '0')
+        with self.assertRaises(EOFError):
+            backend.read_line('')
@@ -0,0 +1,163 @@
+"""Unit Tests for MIDI export"""
+import os
+import tempfile
+import unittest
+
+from src.exercise import build_seeded_package
+from src.exercisespec import load_exercise_specs
+from src.midiexport import DRONE_CHANNEL, TICKS_PER_BEAT, MidiAudioBackend, MidiFileWriter, \
+    decode_variable_length, encode_variable_length, export_package, export_seeds, \
+    read_midi_file
+from src.noteevents import new_note_events
+from src.player import PlayerConst
+
+DEFINITIONS_FILENAME = 'data/exercises.json'
+
+
+class TestMidiExport(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup -- the specs, and somewhere for files"""
+
+        self.specs = {spec.name: spec for spec in load_exercise_specs(DEFINITIONS_FILENAME)}
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+
+    def tearDown(self):
+        """Teardown"""
+
+        self.temp_dir.cleanup()
+
+    def test_variable_length(self):
+        """Test method"""
+
+        for value, encoded in [(0, b'\x00'), (0x7F, b'\x7f'), (0x80, b'\x81\x00'),
+                               (0x3FFF, b'\xff\x7f'), (0x0FFFFFFF, b'\xff\xff\xff\x7f')]:
+            self.assertEqual(encode_variable_length(value), encoded)
+            self.assertEqual(decode_variable_length(encoded, 0), (value, len(encoded)))
+
+    def test_writer(self):
+        """Test method"""
+
+        filename = os.path.join(self.directory, 'notes.mid')
+        with MidiFileWriter(filename) as writer:
+            writer.write_note(0, 60, 100, 1)
+            writer.write_note(1.5, 64, 100, 0.5)
+            with self.assertRaises(ValueError):
+                writer.write_note(1, 67, 100, 1)
+
+        # The patched length is checked on the way in.
+        ticks_per_beat, events = read_midi_file(filename)
+        self.assertEqual(ticks_per_beat, TICKS_PER_BEAT)
+        self.assertEqual([(tick, event[0]) for tick, event in events[1:]],
+                         [(0, 0x90), (480, 0x80), (720, 0x90), (960, 0x80), (960, 0xFF)])
+
+    def test_interval_session(self):
+        """Notes, pauses and repeats, as the Player plays them"""
+
+        spec = self.specs["Singing the Easy Intervals"]
+        package = build_seeded_package(spec, 42, 3)
+        trial_sets = [list(trial_set) for trial_set in package.trial_sets]
+
+        filename = os.path.join(self.directory, 'session.mid')
+        export_package(package, filename)
+        _, events = read_midi_file(filename)
+
+        note_ons = [(tick, event[1]) for tick, event in events if event[0] == 0x90]
+        expected_notes = [note for trial_set in trial_sets for note1, note2 in trial_set
+                          for note in (note1, note2, note1, note2)]
+        self.assertEqual([note for _, note in note_ons], expected_notes)
+
+        # note1 (1 beat), the interval pause, then note2
+        first_tick = PlayerConst.NO_CLIP_PAUSE * TICKS_PER_BEAT
+        self.assertEqual(note_ons[0][0], first_tick)
+        self.assertEqual(note_ons[1][0],
+                         first_tick + (1 + package.get_interval_pause()) * TICKS_PER_BEAT)
+
+    def test_drone(self):
+        """The drone rings on its own channel, through the pauses, and is released"""
+
+        spec = self.specs["Single Position Exercise (On-Level)"]
+        package = build_seeded_package(spec, 3, 2)
+
+        filename = os.path.join(self.directory, 'drone.mid')
+        export_package(package, filename)
+        _, events = read_midi_file(filename)
+
+        drone_ons = [(tick, event[1]) for tick, event in events
+                     if event[0] == 0x90 | DRONE_CHANNEL]
+        drone_offs = [(tick, event[1]) for tick, event in events
+                      if event[0] == 0x80 | DRONE_CHANNEL]
+        first_trial_note = next(tick for tick, event in events if event[0] == 0x90)
+
+        # Before the first trial note, and every note it started is released
+        self.assertEqual([note for tick, note in drone_ons if tick == 0],
+                         list(package.get_drone_notes(0)))
+        self.assertLess(drone_ons[0][0], first_trial_note)
+        self.assertEqual(sorted(note for _, note in drone_ons),
+                         sorted(note for _, note in drone_offs))
+
+    def test_note_events(self):
+        """Events at their onsets, overlaps merged, and an off before a repeated on"""
+
+        events = new_note_events(3)
+        events['onset'] = [0, 1 / 3, 2 / 3]
+        events['duration'] = [1 / 3, 1, 1 / 3]      # The second overlaps the third
+        events['velocity'] = [100, 80, 0]
+        events['pitch'] = [60, 60, 64]
+
+        filename = os.path.join(self.directory, 'events.mid')
+        with MidiFileWriter(filename) as writer:
+            audio = MidiAudioBackend(writer)
+            audio.wait(1)
+            audio.play_events(events)
+            audio.play_note(67, 1, 1)
+
+        _, events = read_midi_file(filename)
+        self.assertEqual([(tick, event[0], event[1]) for tick, event in events[1:-1]],
+                         [(480, 0x90, 60), (640, 0x80, 60), (640, 0x90, 60), (800, 0x90, 64),
+                          (960, 0x80, 64), (1120, 0x80, 60), (1120, 0x90, 67),
+                          (1600, 0x80, 67)])
+        self.assertEqual(events[4][1][2], 1)    # Velocity 0 would be a note off
+
+    def test_rhythmic_session(self):
+        """Test method"""
+
+        package = build_seeded_package(self.specs["Rhythmic Dictation"], 5, 1)
+        trials = list(package.trial_sets[0])
+
+        filename = os.path.join(self.directory, 'rhythm.mid')
+        export_package(package, filename)
+        _, events = read_midi_file(filename)
+
+        # Each trial played, then repeated, at the events' own onsets
+        note_ons = [(tick, event[1]) for tick, event in events if event[0] == 0x90]
+        self.assertEqual([note for _, note in note_ons],
+                         [note for trial in trials for _ in range(2)
+                          for note in trial['pitch'].tolist()])
+        first_tick = note_ons[0][0]
+        self.assertEqual([tick - first_tick for tick, _ in note_ons[:len(trials[0])]],
+                         [round(onset * TICKS_PER_BEAT) for onset in trials[0]['onset']])
+
+    def test_batch(self):
+        """Test method"""
+
+        spec = self.specs["One String Exercise"]
+        pooled = export_seeds(spec, range(3), os.path.join(self.directory, 'pooled'), 2)
+        inline = export_seeds(spec, range(3), os.path.join(self.directory, 'inline'), 0)
+
+        self.assertEqual([os.path.basename(filename) for filename in pooled],
+                         ['one-string-exercise-0000.mid', 'one-string-exercise-0001.mid',
+                          'one-string-exercise-0002.mid'])
+        contents = []
+        for pooled_filename, inline_filename in zip(pooled, inline):
+            with open(pooled_filename, 'rb') as pooled_file, \
+                    open(inline_filename, 'rb') as inline_file:
+                contents.append(pooled_file.read())
+                self.assertEqual(contents[-1], inline_file.read())
+
+        # Different seeds, different sessions:  10 trial sets of 50 notes each
+        self.assertEqual(len(set(contents)), 3)
+        _, events = read_midi_file(pooled[0])
+        self.assertEqual(sum(1 for _, event in events if event[0] == 0x90), 500)
@@ -1,7 +1,7 @@
 """Unit tests for MidiUtil class"""
 import unittest
 
-from src.midiutilities import MidiUtil
+from src.midiutilities import MidiUtil, mask_to_pitch_classes, pattern_to_mask, transpose_mask
 
 
 class TestMidiUtil(unittest.TestCase):
@@ -126,3 +126,34 @@ class TestMidiUtil(unittest.TestCase):
         self.assertEqual(self.mu.list_of_midi_notes(
             'C', 20, 63), [24, 36, 48, 60])
         self.assertEqual(self.mu.list_of_midi_notes('E', 52, 65), [64])
+
+    def test_pitch_class_masks(self):
+        """Test Method"""
+
+        self.assertEqual(pattern_to_mask(self.mu.interval_pattern['Major']), 0b000010010001)
+        self.assertEqual(pattern_to_mask(self.mu.interval_pattern['V7']), 0b100010100100)
+        self.assertEqual(pattern_to_mask(self.mu.interval_pattern['Chromatic']), 0xFFF)
+        self.assertEqual(transpose_mask(0b100000000001, 1), 0b000000000011)
+        self.assertEqual(transpose_mask(0b000000000011, -1), 0b100000000001)
+        self.assertEqual(mask_to_pitch_classes(self.mu.get_pitch_class_mask('Minor', 'A')),
+                         [0, 4, 9])
+
+        self.assertTrue(self.mu.is_in_pattern(66, 'Ionian', 'G'))
+        self.assertFalse(self.mu.is_in_pattern(65, 'Ionian', 'G'))
+
+        # Masks give the same notes as walking the patterns
+        for pattern in self.mu.interval_pattern:
+            for key in self.mu.note_names:
+                self.assertEqual(
+                    self.mu.notes_in_mask(0, 127, self.mu.get_pitch_class_mask(pattern, key)),
+                    self.mu.build_note_list(0, 127, [pattern], key)[0])
+
+    def test_chords_for_mode(self):
+        """Test Method"""
+
+        self.assertEqual(self.mu.chords_for_mode('Ionian'), ['Major', 'Major Seventh'])
+        self.assertEqual(self.mu.chords_for_mode('Dorian', 'D'), ['Minor', 'Minor Seventh'])
+        self.assertEqual(self.mu.chords_for_mode('Mixolydian', 'G'),
+                         ['Major', 'Dominant Seventh'])
+        self.assertEqual(self.mu.chords_for_mode('Super Locrian'), ['Half Diminished'])
+        self.assertEqual(self.mu.chords_for_mode('Chromatic'), self.mu.chord_types)
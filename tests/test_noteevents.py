@@ -0,0 +1,52 @@
+"""Unit Tests for note events"""
+import random
+import unittest
+
+from src.noteevents import ACCENT_VELOCITY, BEAT_VELOCITY, OFFBEAT_VELOCITY, RHYTHM_CELLS, \
+    build_note_events, build_rhythm, get_events_end, new_note_events, reverse_pitches
+
+
+class TestNoteEvents(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup"""
+
+        random.seed(99)
+
+    def test_build_rhythm(self):
+        """Test method"""
+
+        # Cut short part way through a cell
+        self.assertEqual(build_rhythm(['eighths'], 3), ([0, 0.5, 1], [0.5, 0.5, 0.5]))
+        self.assertEqual(build_rhythm(['offbeat'], 2), ([0.5, 1.5], [0.5, 0.5]))
+
+        # Whatever the cells, onsets only ever move forward and notes don't overlap
+        onsets, durations = build_rhythm(list(RHYTHM_CELLS), 1000)
+        self.assertEqual(len(onsets), 1000)
+        for onset, duration, next_onset in zip(onsets, durations, onsets[1:]):
+            self.assertLessEqual(onset + duration, next_onset + 1e-9)
+
+    def test_build_note_events(self):
+        """Test method"""
+
+        events = build_note_events([60, 62, 64, 65], ['dotted'])
+
+        self.assertEqual(events.dtype.itemsize, 10)
+        self.assertEqual(events['pitch'].tolist(), [60, 62, 64, 65])
+        self.assertEqual(events['onset'].tolist(), [0, 0.75, 1, 1.75])
+        self.assertEqual(events['velocity'].tolist(),
+                         [ACCENT_VELOCITY, OFFBEAT_VELOCITY, BEAT_VELOCITY, OFFBEAT_VELOCITY])
+        self.assertEqual(get_events_end(events), 2)
+
+        # Same rhythm, backwards, and the original's untouched
+        reversed_events = reverse_pitches(events)
+        self.assertEqual(reversed_events['pitch'].tolist(), [65, 64, 62, 60])
+        self.assertEqual(reversed_events['onset'].tolist(), events['onset'].tolist())
+        self.assertEqual(events['pitch'].tolist(), [60, 62, 64, 65])
+
+    def test_empty(self):
+        """Test method"""
+
+        self.assertEqual(get_events_end(new_note_events(0)), 0)
+        self.assertEqual(len(build_note_events([], ['quarter'])), 0)
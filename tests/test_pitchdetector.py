@@ -0,0 +1,130 @@
+"""Unit Tests for pitch detection"""
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from src.audiobackend import NullAudioBackend
+from src.exercise import SingTheIntervals
+from src.exercisespec import load_exercise_specs
+from src.inputbackend import ScriptedInputBackend
+from src.keypresshelper import set_input_backend
+from src.pitchdetector import PitchDetector, PitchScorer, WavSource, detect_file, \
+    midi_to_frequency, score_sung_note, write_wav
+from src.player import Player
+from src.scoreboard import Scoreboard
+
+SAMPLE_RATE = 44100
+DEFINITIONS_FILENAME = 'data/exercises.json'
+
+
+def sing(midi_note, seconds, sample_rate=SAMPLE_RATE):
+    """A voice-ish tone:  a fundamental, some harmonics, a little noise"""
+
+    rng = np.random.default_rng(1234)
+    times = np.arange(int(seconds * sample_rate)) / sample_rate
+    frequency = midi_to_frequency(midi_note)
+    return 0.5 * np.sin(2 * np.pi * frequency * times) + \
+        0.2 * np.sin(4 * np.pi * frequency * times) + \
+        0.1 * np.sin(6 * np.pi * frequency * times) + 0.01 * rng.standard_normal(len(times))
+
+
+class TestPitchDetector(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup -- somewhere for WAV files"""
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Teardown"""
+
+        self.temp_dir.cleanup()
+
+    def test_detection(self):
+        """Test method"""
+
+        # Low E on a guitar to the top of a soprano, in tune and 30 cents sharp
+        for midi_note in [40, 45, 57, 64.3, 69, 81]:
+            detector = PitchDetector(SAMPLE_RATE)
+            estimates = detector.process_block(sing(midi_note, 0.5))
+            self.assertGreater(len(estimates), 30)
+            for estimate in estimates:
+                self.assertEqual(estimate.midi, round(midi_note))
+                self.assertAlmostEqual(estimate.cents, 100 * (midi_note - round(midi_note)),
+                                       delta=3)
+
+        # Silence is not a pitch
+        self.assertEqual(PitchDetector(SAMPLE_RATE).process_block(np.zeros(SAMPLE_RATE)), [])
+
+    def test_streaming(self):
+        """Block size doesn't change the estimates"""
+
+        samples = sing(52, 0.3)
+        whole = PitchDetector(SAMPLE_RATE).process_block(samples)
+
+        detector = PitchDetector(SAMPLE_RATE)
+        streamed = []
+        for start in range(0, len(samples), 333):
+            streamed.extend(detector.process_block(samples[start:start + 333]))
+
+        self.assertEqual(len(streamed), len(whole))
+        for estimate, expected in zip(streamed, whole):
+            self.assertAlmostEqual(estimate.frequency, expected.frequency, places=6)
+            self.assertEqual(estimate.time, expected.time)
+
+        # Latency is bounded by the frame and hop
+        self.assertLess(streamed[0].time, detector.get_latency())
+
+    def test_real_time(self):
+        """A second of audio takes well under a second, on one core"""
+
+        samples = sing(60, 1.0)
+        detector = PitchDetector(SAMPLE_RATE)
+
+        start = time.perf_counter()
+        for block_start in range(0, len(samples), 512):
+            detector.process_block(samples[block_start:block_start + 512])
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_scoring(self):
+        """Test method"""
+
+        filename = os.path.join(self.temp_dir.name, 'sung.wav')
+        write_wav(filename, sing(57.2, 0.5), SAMPLE_RATE)
+        estimates = detect_file(filename)
+
+        self.assertEqual(score_sung_note(estimates, 57), 4)
+        self.assertEqual(score_sung_note(estimates, 69), 4)     # An octave off is fine
+        self.assertEqual(score_sung_note(estimates, 58), 2)
+        self.assertEqual(score_sung_note(estimates, 60), 1)
+        self.assertIsNone(score_sung_note(estimates[:2], 57))
+
+    def test_player(self):
+        """Sung intervals are scored by ear, not by key press"""
+
+        spec = next(spec for spec in load_exercise_specs(DEFINITIONS_FILENAME)
+                    if spec.kind == 'SingTheIntervals')
+        scoreboard = Scoreboard()
+        package = SingTheIntervals(None, scoreboard, spec).build_package(1)
+
+        # Sing every answer, each for the length of the interval pause
+        trial_set, interval = package.trial_sets[0], package.trial_set_label[0]
+        seconds = package.get_interval_pause() * 60 / 120
+        filename = os.path.join(self.temp_dir.name, 'session.wav')
+        write_wav(filename, np.concatenate([sing(trial[1], seconds) for trial in trial_set]),
+                  SAMPLE_RATE)
+
+        # Only a key to start, none to score
+        set_input_backend(ScriptedInputBackend(["space"]))
+        try:
+            player = Player(NullAudioBackend(), PitchScorer(WavSource(filename)))
+            player.play(package, scoreboard, 60)
+        finally:
+            set_input_backend(None)
+
+        self.assertEqual(scoreboard.persistant_scores,
+                         {scoreboard.get_test_prefix(spec.name, interval): [4]})
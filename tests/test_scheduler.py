@@ -0,0 +1,84 @@
+"""Unit Tests for PracticeScheduler class"""
+import unittest
+
+from src.scheduler import PracticeScheduler
+from src.scoreboard import Scoreboard
+
+
+class TestPracticeScheduler(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup"""
+
+        self.sb = Scoreboard()
+        for score in [4, 4, 4]:
+            self.sb.append_score('Sing', 'm3', score)
+        for score in [1, 2, 1]:
+            self.sb.append_score('Sing', 'M7', score)
+        self.sb.append_score('Other', 'P5', 2)
+
+        self.scheduler = PracticeScheduler()
+        self.scheduler.add_exercises(['Sing', 'Play'], self.sb, now=0)
+
+    def test_order(self):
+        """Hardest (and unscored) first when everything is due"""
+
+        self.assertEqual(len(self.scheduler), 3)
+        self.assertEqual(self.scheduler.pop_next(), ('Play', ''))
+        self.assertEqual(self.scheduler.pop_next(), ('Sing', 'M7'))
+        self.assertEqual(self.scheduler.pop_next(), ('Sing', 'm3'))
+        self.assertIsNone(self.scheduler.pop_next())
+
+    def test_reschedule(self):
+        """Test method"""
+
+        # Well scored items are pushed out further than poorly scored ones
+        self.assertEqual(self.scheduler.pop_next(), ('Play', ''))
+        self.scheduler.reschedule('Play', '', None, now=10)
+        self.assertEqual(self.scheduler.pop_next(), ('Sing', 'M7'))
+        self.scheduler.reschedule('Sing', 'M7', 1.5, now=10)
+        self.assertEqual(self.scheduler.pop_next(), ('Sing', 'm3'))
+        self.scheduler.reschedule('Sing', 'm3', 4.0, now=10)
+
+        self.assertEqual(self.scheduler.pop_next(), ('Sing', 'M7'))
+        self.assertEqual(self.scheduler.pairs[('Sing', 'm3')][1],
+                         PracticeScheduler.FIRST_INTERVAL * PracticeScheduler.INTERVAL_GROWTH)
+
+    def test_allowed(self):
+        """Test method"""
+
+        self.assertEqual(self.scheduler.pop_next({'Play'}), ('Play', ''))
+        self.assertEqual(self.scheduler.pop_next({'Play'}), None)
+        self.assertEqual(self.scheduler.pop_next(), ('Sing', 'M7'))
+
+    def test_many_elements(self):
+        """Test method"""
+
+        scheduler = PracticeScheduler()
+        for idx in range(20000):
+            scheduler.push('Big', str(idx), idx % 100, idx % 7, PracticeScheduler.FIRST_INTERVAL)
+
+        last = (-1, -1)
+        for _ in range(20000):
+            _, element = scheduler.pop_next()
+            idx = int(element)
+            self.assertLessEqual(last, (idx % 100, idx % 7))
+            last = (idx % 100, idx % 7)
+
+    def test_many_scored_elements(self):
+        """Every scored element of a student with tens of thousands of them"""
+
+        scoreboard = Scoreboard()
+        for idx in range(20000):
+            scoreboard.append_score('Big', str(idx), idx % 4 + 1)
+
+        scheduler = PracticeScheduler()
+        scheduler.add_exercises(['Big'], scoreboard, now=0)
+        self.assertEqual(len(scheduler), 20000)
+
+        # Hardest first, and each pair comes back after it's rescheduled
+        exercise_name, element = scheduler.pop_next()
+        self.assertEqual(int(element) % 4 + 1, 1)
+        scheduler.reschedule(exercise_name, element, 1, now=0)
+        self.assertEqual(len(scheduler), 20000)
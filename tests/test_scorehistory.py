@@ -0,0 +1,122 @@
+"""Unit Tests for ScoreHistory class"""
+import os
+import tempfile
+import unittest
+
+from src.scorehistory import ScoreHistory
+
+
+class ConversionCountingHistory(ScoreHistory):
+    """A ScoreHistory that counts how often the csv is converted"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.conversions = 0
+
+    def convert_to_binary(self):
+        self.conversions += 1
+        super().convert_to_binary()
+
+
+class TestScoreHistory(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup -- work in a scratch directory"""
+
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+        self.sh = ScoreHistory()
+
+    def tearDown(self):
+        """Teardown"""
+
+        os.chdir(self.old_cwd)
+        self.temp_dir.cleanup()
+
+    def test_binary_history(self):
+        """Test method"""
+
+        self.assertEqual(self.sh.get_record_count(), 0)
+        self.assertEqual(len(self.sh.get_records()), 0)
+
+        self.sh.append_to_binary_history([['Test:m3', 2.5, 100.0],
+                                          ['Test:-m3', 3.0, 100.0],
+                                          ['Test:m3', 3.5, 200.0]])
+
+        self.assertEqual(self.sh.get_record_count(), 3)
+
+        records = self.sh.get_records(1, 3)
+        self.assertEqual(list(records['key']), [b'Test:-m3', b'Test:m3'])
+        self.assertEqual(list(records['score']), [3.0, 3.5])
+
+        records = self.sh.get_time_range(150, 300)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['timestamp'], 200.0)
+
+        with self.assertRaises(ValueError):
+            self.sh.pack_record('x' * 65, 1, 0)
+
+    def test_buffered_history(self):
+        """Test method"""
+
+        self.sh.append_to_history({'Test:m3': 2.5})
+        self.assertFalse(os.path.exists(ScoreHistory.HISTORY_FILENAME))
+        self.assertEqual(len(self.sh.buffer), 1)
+
+        # Hitting the record count flushes
+        scores = {f'Test:{idx}': 1.0 for idx in range(ScoreHistory.FLUSH_RECORD_COUNT)}
+        self.sh.append_to_history(scores)
+        self.assertEqual(len(self.sh.buffer), 0)
+        self.assertEqual(self.sh.get_record_count(), ScoreHistory.FLUSH_RECORD_COUNT + 1)
+
+        # So does running out of time
+        self.sh.append_to_history({'Test:m3': 2.5})
+        self.assertEqual(len(self.sh.buffer), 1)
+        self.sh.last_flush_time -= ScoreHistory.FLUSH_INTERVAL
+        self.sh.append_to_history({'Test:m3': 2.5})
+        self.assertEqual(len(self.sh.buffer), 0)
+
+    def test_convert_to_binary(self):
+        """Test method"""
+
+        self.sh.append_to_history({'Test:m3': 2.5, 'Test:M3': 1.5})
+        self.sh.flush()
+        os.remove(ScoreHistory.BINARY_HISTORY_FILENAME)
+
+        self.sh.convert_to_binary()
+
+        df = self.sh.get_dataframe()
+        self.assertEqual(list(df[0]), ['Test:m3', 'Test:M3'])
+        self.assertEqual(list(df[1]), [2.5, 1.5])
+
+    def test_backfill(self):
+        """A csv history from before the binary one isn't lost on the first write"""
+
+        with open(ScoreHistory.HISTORY_FILENAME, 'w', encoding='utf-8') as csvfile:
+            csvfile.write("Test:m3,2.5,100.0\nTest:M3,1.5,100.0\n")
+
+        history = ConversionCountingHistory()
+        history.append_to_history({'Test:m3': 3.5})
+        history.flush()
+        self.assertEqual(list(history.get_dataframe()[1]), [2.5, 1.5, 3.5])
+        self.assertEqual(history.conversions, 1)
+
+        # From then on, just appended.  Next session too, the csv isn't read again.
+        history.append_to_history({'Test:M3': 2.0})
+        history.flush()
+        history = ConversionCountingHistory()
+        history.append_to_history({'Test:M3': 3.0})
+        history.flush()
+        self.assertEqual(history.conversions, 0)
+        self.assertEqual(list(history.get_dataframe()[1]), [2.5, 1.5, 3.5, 2.0, 3.0])
+
+    def test_long_key(self):
+        """Test method"""
+
+        # Turned away up front, before either file gets any of it
+        with self.assertRaises(ValueError):
+            self.sh.append_to_history({'Test:m3': 2.5, 'Test:' + 'x' * 64: 1.0})
+        self.assertEqual(self.sh.buffer, [])
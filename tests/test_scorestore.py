@@ -0,0 +1,75 @@
+"""Unit Tests for ScoreStore class"""
+import os
+import json
+import tempfile
+import time
+import unittest
+
+from src.backgroundwriter import BackgroundWriter
+from src.scorestore import ScoreStore
+
+
+class TestScoreStore(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup -- work in a scratch directory"""
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, 'students')
+        self.store = ScoreStore(root_directory=self.root, cache_size=2)
+
+    def tearDown(self):
+        """Teardown"""
+
+        self.temp_dir.cleanup()
+
+    def test_partitions(self):
+        """Test method"""
+
+        alice = self.store.get_scoreboard('alice')
+        alice.append_score('Test', 'm3', 4)
+        self.assertIs(self.store.get_scoreboard('alice'), alice)
+
+        bob = self.store.get_scoreboard('bob')
+        self.assertEqual(bob.persistant_scores, {})
+
+        # carol pushes alice (least recently used) out, saving her scores
+        self.store.get_scoreboard('carol')
+        self.assertNotIn('alice', self.store.scoreboards)
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'alice', 'scores.json')))
+
+        alice = self.store.get_scoreboard('alice')
+        self.assertEqual(alice.persistant_scores, {'Test:m3': [4]})
+        self.assertEqual(len(self.store.scoreboards), 2)
+
+        self.assertEqual(self.store.list_students(), ['default', 'alice', 'bob', 'carol'])
+
+    def test_reload_while_saving(self):
+        """An evicted student, back before their save has been written"""
+
+        writer = BackgroundWriter()
+        store = ScoreStore(writer, root_directory=self.root, cache_size=1)
+
+        alice = store.get_scoreboard('alice')
+        for score in range(1, 6):
+            alice.append_score('Test', 'm3', score % 4 + 1)
+
+        # A slow disk:  alice's save waits behind this.
+        writer.submit(time.sleep, 0.2)
+        store.get_scoreboard('bob')
+        alice = store.get_scoreboard('alice')
+        self.assertEqual(alice.persistant_scores, {'Test:m3': [2, 3, 4, 1, 2]})
+
+        store.close()
+        writer.close()
+        with open(os.path.join(self.root, 'alice', 'scores.json'), encoding='utf-8') as file:
+            self.assertEqual(json.load(file), {'Test:m3': [2, 3, 4, 1, 2]})
+
+    def test_invalid_student(self):
+        """Test method"""
+
+        with self.assertRaises(ValueError):
+            self.store.get_scoreboard('../alice')
+        with self.assertRaises(ValueError):
+            self.store.get_scoreboard('')
@@ -0,0 +1,76 @@
+"""Unit Tests for session planning"""
+import os
+import tempfile
+import unittest
+
+from src.backgroundwriter import BackgroundWriter
+from src.sessionplanner import DurationEstimator, plan_session
+
+
+def plan_total(plan, estimates):
+    """Estimated seconds for a plan"""
+
+    return sum(estimates[name] * count for name, count in plan.items())
+
+
+class TestSessionPlanner(unittest.TestCase):
+    """Testing class"""
+
+    def test_plan_session(self):
+        """Test method"""
+
+        estimates = {'a': 100, 'b': 65, 'c': 40}
+
+        plan = plan_session(300, estimates)
+        self.assertEqual(plan_total(plan, estimates), 300)
+
+        plan = plan_session(1200, estimates)
+        self.assertEqual(plan_total(plan, estimates), 1200)
+        self.assertEqual(len(plan), 3)
+
+        # Can't go over
+        plan = plan_session(99, estimates)
+        self.assertEqual(plan_total(plan, estimates), 80)
+
+        self.assertEqual(plan_session(30, estimates), {})
+        self.assertEqual(plan_session(-1, estimates), {})
+
+    def test_max_count(self):
+        """Test method"""
+
+        plan = plan_session(1000, {'a': 100}, max_count=3)
+        self.assertEqual(plan, {'a': 3})
+
+        # Short exercises still get mixed
+        plan = plan_session(1000, {'a': 0.1, 'b': 0.1, 'c': 0.1})
+        self.assertEqual(len(plan), 3)
+
+    def test_estimator(self):
+        """Test method"""
+
+        estimator = DurationEstimator()
+        self.assertEqual(estimator.get_estimate('a', 30), 30)
+
+        estimator.record('a', 100)
+        self.assertEqual(estimator.get_estimate('a', 30), 100)
+
+        estimator.record('a', 200)
+        self.assertAlmostEqual(estimator.get_estimate('a', 30),
+                               100 + DurationEstimator.SMOOTHING * 100)
+
+    def test_estimator_files(self):
+        """Estimates are kept in the directory they're given, written off the UI thread"""
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = BackgroundWriter()
+            estimator = DurationEstimator(writer, temp_dir)
+            estimator.record('a', 100)
+            estimator.save()
+
+            # Reading them back waits for the queued save
+            reopened = DurationEstimator(writer, temp_dir)
+            reopened.open()
+            writer.close()
+
+            self.assertEqual(reopened.get_estimate('a', 30), 100)
+            self.assertEqual(os.listdir(temp_dir), [DurationEstimator.DURATIONS_FILENAME])
@@ -0,0 +1,72 @@
+"""Unit Tests for the simulated students"""
+import unittest
+
+import numpy as np
+
+from src.exercisespec import load_exercise_specs
+from src.scoreboard import Scoreboard
+from src.simulation import COLUMN_DTYPES, DEFINITIONS_FILENAME, StudentModel, \
+    get_dataframe, run_simulation
+
+
+class TestSimulation(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup"""
+
+        self.specs = load_exercise_specs(DEFINITIONS_FILENAME)
+
+    def test_model(self):
+        """Test method"""
+
+        model = StudentModel()
+
+        # Bigger intervals are harder, descending ones harder still, practice helps.
+        self.assertGreater(model.score(2, 0, 0), model.score(10, 0, 0))
+        self.assertGreaterEqual(model.score(4, 0, 0), model.score(-4, 0, 0))
+        self.assertGreater(model.score(10, 200, 0), model.score(10, 0, 0))
+
+        # Always a legal score
+        for noise in [-100, -1, 0, 1, 100]:
+            self.assertIn(model.score(5, 0, noise), [1, 2, 3, 4])
+
+    def test_simulation(self):
+        """Test method"""
+
+        columns = run_simulation(self.specs, student_count=3, session_count=2, workers=0,
+                                 job_size=2)
+
+        # Every scored trial set of every scored exercise, for every student and session
+        scored_specs = [spec for spec in self.specs if spec.scoring_enabled]
+        rows = 3 * 2 * sum(spec.trials_sets_count for spec in scored_specs)
+        for name, dtype in COLUMN_DTYPES.items():
+            self.assertEqual(columns[name].dtype, np.dtype(dtype))
+            self.assertEqual(len(columns[name]), rows)
+
+        self.assertEqual(list(columns['exercise_names']), [spec.name for spec in scored_specs])
+        self.assertTrue(np.all((columns['score'] >= 1) & (columns['score'] <= 4)))
+        self.assertTrue(np.all(np.diff(columns['student']) >= 0))
+
+        # Candidate status agrees with the scoreboard thresholds
+        promoted = columns['raw_score'] >= Scoreboard.SCORE_PROMOTE
+        self.assertTrue(np.all((columns['status'] == 1) == promoted))
+
+        frame = get_dataframe(columns)
+        self.assertEqual(set(frame['element']),
+                         {interval for spec in scored_specs
+                          for interval in spec.candidate_intervals})
+
+    def test_reproducible(self):
+        """Same seed, same students, however the work is split up"""
+
+        inline = run_simulation(self.specs, student_count=4, session_count=1, workers=0,
+                                job_size=4)
+        pooled = run_simulation(self.specs, student_count=4, session_count=1, workers=2,
+                                job_size=1)
+        for name in COLUMN_DTYPES:
+            np.testing.assert_array_equal(inline[name], pooled[name])
+
+        reseeded = run_simulation(self.specs, student_count=4, session_count=1, seed=99,
+                                  workers=0)
+        self.assertFalse(np.array_equal(inline['score'], reseeded['score']))
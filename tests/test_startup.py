@@ -0,0 +1,53 @@
+"""Startup guards -- keep heavy dependencies off the path to the menu"""
+import unittest
+
+from benchmarks.startup import IMPORT_BUDGET, compare_to_baseline, measure_import, \
+    measure_time_to_menu, parse_importtime
+
+
+class TestStartup(unittest.TestCase):
+    """Testing class"""
+
+    def test_no_analytics_imports(self):
+        """The practice path should never pay for pandas/numpy"""
+
+        _, loaded = measure_import("src.scoreboard")
+        self.assertEqual(loaded, [])
+
+        _, loaded = measure_import("main")
+        self.assertEqual(loaded, [])
+
+    def test_time_to_menu_headless(self):
+        """The menu comes up, well within the import budget"""
+
+        self.assertLess(measure_time_to_menu(null_audio=True), IMPORT_BUDGET)
+
+    def test_time_to_menu(self):
+        """With main.py's scamp session, where there's a sound font to start it with"""
+
+        try:
+            seconds = measure_time_to_menu()
+        except RuntimeError as error:
+            if "FluidSynth" not in str(error):
+                raise
+            self.skipTest(str(error))
+        self.assertGreater(seconds, 0)
+
+    def test_parse_importtime(self):
+        """Test method"""
+
+        imports = parse_importtime(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       250 |        250 |   _io\n"
+            "import time:      1500 |       1750 | src.scoreboard\n"
+            "Some other line\n")
+        self.assertEqual(imports, {'_io': (0.00025, 0.00025), 'src.scoreboard': (0.0015, 0.00175)})
+
+    def test_compare_to_baseline(self):
+        """Test method"""
+
+        baseline = {'import_main': 1.0, 'time_to_menu': None}
+        self.assertEqual(compare_to_baseline({'import_main': 1.2, 'time_to_menu': 3.0},
+                                             baseline), [])
+        self.assertEqual(compare_to_baseline({'import_main': 1.5, 'time_to_menu': None},
+                                             baseline), ['import_main'])
@@ -0,0 +1,67 @@
+"""Unit Tests for WeightedSampler class"""
+import random
+import unittest
+
+from src.weightedsampler import WeightedSampler
+
+
+class TestWeightedSampler(unittest.TestCase):
+    """Testing class"""
+
+    def setUp(self):
+        """Setup"""
+
+        self.ws = WeightedSampler({'a': 1, 'b': 2, 'c': 0, 'd': 5, 'e': 2})
+        self.rng = random.Random(42)
+
+    def test_weights(self):
+        """Test method"""
+
+        self.assertEqual(len(self.ws), 5)
+        self.assertEqual(self.ws.get_total_weight(), 10)
+        self.assertAlmostEqual(self.ws.get_probability('d'), 0.5)
+
+        self.ws.set_weight('d', 1)
+        self.ws.set_weight('f', 4)
+        self.assertEqual(self.ws.get_total_weight(), 10)
+        self.assertEqual(self.ws.prefix_sum(4), 4)
+        self.assertAlmostEqual(self.ws.get_probability('f'), 0.4)
+
+        with self.assertRaises(ValueError):
+            self.ws.set_weight('a', -1)
+
+    def test_find(self):
+        """Test method"""
+
+        # Running sums:  a [0, 1), b [1, 3), c empty, d [3, 8), e [8, 10)
+        self.assertEqual(self.ws.find(0), 0)
+        self.assertEqual(self.ws.find(0.99), 0)
+        self.assertEqual(self.ws.find(1), 1)
+        self.assertEqual(self.ws.find(3), 3)
+        self.assertEqual(self.ws.find(7.99), 3)
+        self.assertEqual(self.ws.find(9.99), 4)
+
+    def test_sample(self):
+        """Test method"""
+
+        counts = {'a': 0, 'b': 0, 'c': 0, 'd': 0, 'e': 0}
+        for _ in range(10000):
+            counts[self.ws.sample(rng=self.rng)] += 1
+
+        self.assertEqual(counts['c'], 0)
+        self.assertAlmostEqual(counts['d'] / 10000, 0.5, delta=0.02)
+        self.assertAlmostEqual(counts['a'] / 10000, 0.1, delta=0.02)
+
+    def test_sample_exclude(self):
+        """Test method"""
+
+        counts = {'a': 0, 'b': 0, 'c': 0, 'd': 0, 'e': 0}
+        for _ in range(10000):
+            counts[self.ws.sample(exclude='d', rng=self.rng)] += 1
+
+        self.assertEqual(counts['d'], 0)
+        self.assertAlmostEqual(counts['b'] / 10000, 0.4, delta=0.02)
+
+        single = WeightedSampler({'a': 1})
+        with self.assertRaises(ValueError):
+            single.sample(exclude='a')